@@ -3,14 +3,26 @@ ASGI config for bikeshop project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Modo ASGI: as views async (busca e carrinho do PDV, dashboard) atendem
+muitos caixas simultâneos com poucos processos:
+
+    uvicorn bikeshop.asgi:application --workers 2
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bikeshop.settings')
 
 application = get_asgi_application()
+
+if settings.DEBUG:
+    # Em desenvolvimento o uvicorn não serve /static/ (o runserver serve)
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+
+    application = ASGIStaticFilesHandler(application)
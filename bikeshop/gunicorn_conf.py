@@ -0,0 +1,179 @@
+"""
+Perfil de produção do gunicorn.
+
+    gunicorn -c python:bikeshop.gunicorn_conf
+
+Classe de worker (WEB_WORKER_CLASS):
+
+    - uvicorn_worker.UvicornWorker (padrão): serve bikeshop.asgi. O stream
+      SSE de /estoque/eventos/ é async e não prende thread; as views
+      síncronas rodam numa thread por requisição. Use com DB_POOL=True:
+      só o pool limita as conexões de cada processo (DB_POOL_MAX_SIZE);
+    - gthread: serve bikeshop.wsgi com WEB_THREADS threads (padrão 4) por
+      worker. Cada navegador na tela de estoque ocupa uma thread com o
+      stream SSE (até STOCK_EVENTS_MAX_SECONDS); com tantas telas abertas
+      quanto threads, o servidor para de responder.
+
+Workers: CPUs + 1 (o GIL limita cada processo a uma CPU; o extra cobre o
+worker que está sendo reciclado), limitado para que workers x conexões
+por worker caiba em WEB_DB_CONNECTIONS (`worker_plan`). A CPU disponível
+respeita a cota do container (cgroup v2). WEB_WORKERS / WEB_THREADS fixam
+os valores. As queries do servidor web são limitadas a
+WEB_STATEMENT_TIMEOUT_MS (padrão 30 s; 0 desativa). Com mais de um worker, o cache precisa ser compartilhado
+(CACHE_BACKEND=file); com 'locmem' o servidor não sobe.
+
+O app é carregado no master antes do fork (preload): os workers nascem
+com o Django pronto e compartilham a memória do código. Cada worker é
+reciclado após WEB_MAX_REQUESTS requisições (com jitter, para não
+reiniciarem todos juntos), contendo vazamentos de memória lentos.
+
+Testes de carga locais (`manage.py bench_http`, 16 conexões alternando
+/healthz e o autocomplete de produtos). Condições: SQLite com 300 mil
+clientes, 1 CPU dividida com o gerador de carga, sem PostgreSQL e sem
+pool; não representam a produção, servem para comparar as combinações
+entre si. Repetições variam cerca de 15%.
+
+    gthread, 20 s            req/s   p50 ms   p95 ms
+    3 x 1                      224     50.4    181.1
+    3 x 4                      220     63.7    149.1
+    6 x 4                      193     76.2    168.0
+    2 x 4                      242     60.9    120.6
+    1 x 8                      244     59.6    108.1
+
+    2 workers, 15 s, N streams SSE abertos   req/s    p50 ms    p95 ms
+    gthread 2 x 4, N=0                     243-255     57-60       122
+    gthread 2 x 4, N=8                     0,6-0,7     30000     30000
+    uvicorn, N=0                           119-127   123-135   178-186
+    uvicorn, N=8                           129-137   111-122   178-191
+
+(gthread com N=8: as 8 threads ficaram com os streams e 16 das ~20
+requisições terminaram em timeout.)
+
+Com 1 CPU, processos além de CPUs + 1 só disputaram a CPU e pioraram o
+p95. O gthread teve o dobro da vazão nas views síncronas, mas oito telas
+de estoque abertas bastaram para derrubá-lo; por isso o padrão é o worker
+ASGI. Meça com PostgreSQL e DB_POOL na máquina de produção antes de
+ajustar WEB_WORKERS, WEB_THREADS ou trocar a classe.
+"""
+
+import math
+import os
+
+# Não importe nada como `config`: o gunicorn lê esse nome como opção
+from decouple import config as env
+
+
+def available_cpus() -> int:
+    """CPUs utilizáveis: cota do cgroup v2, afinidade do processo ou os.cpu_count()."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as stream:
+            quota, period = stream.read().split()
+        if quota != 'max':
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_plan(
+    cpus: int,
+    db_connections: int,
+    pool_size: int | None = None,
+    workers: int = 0,
+    threads: int = 0,
+    asynchronous: bool = False,
+) -> tuple[int, int]:
+    """
+    Calcula (workers, threads por worker).
+
+    Args:
+        cpus: CPUs disponíveis
+        db_connections: Conexões com o banco reservadas para o servidor web
+        pool_size: DB_POOL_MAX_SIZE quando o pool do psycopg está ativo
+        workers: Valor fixo (0 = automático)
+        threads: Valor fixo (0 = automático; só usado pelo gthread)
+        asynchronous: Worker ASGI: as views síncronas rodam numa thread por
+            requisição e só o pool limita as conexões de cada processo
+    """
+    threads = threads or 4
+    if workers:
+        return workers, threads
+    if asynchronous:
+        per_worker = pool_size or threads
+    else:
+        per_worker = min(threads, pool_size) if pool_size else threads
+    budget = max(1, db_connections // per_worker)
+    return max(1, min(cpus + 1, budget)), threads
+
+
+def check_shared_cache(workers: int, cache_backend: str) -> None:
+    """
+    Recusa subir vários workers com cache por processo.
+
+    Os carimbos de core.cache_keys (model_stamp/touch_model) vivem no
+    cache: com 'locmem', a alteração feita num worker não invalida os
+    fragmentos e ETags dos outros, que seguem servindo dados antigos.
+    """
+    if workers > 1 and cache_backend == 'locmem':
+        raise RuntimeError(
+            f"CACHE_BACKEND=locmem com {workers} workers: as invalidações de cache "
+            "não chegam aos outros processos. Use CACHE_BACKEND=file ou WEB_WORKERS=1."
+        )
+
+
+ASGI_WORKER = 'uvicorn_worker.UvicornWorker'
+
+worker_class = env('WEB_WORKER_CLASS', default=ASGI_WORKER)
+asynchronous = worker_class != 'gthread'
+# O app vem daqui (não da linha de comando): depende da classe de worker
+wsgi_app = 'bikeshop.asgi:application' if asynchronous else 'bikeshop.wsgi:application'
+pooled = env('DB_POOL', default=False, cast=bool)
+
+workers, threads = worker_plan(
+    cpus=available_cpus(),
+    db_connections=env('WEB_DB_CONNECTIONS', default=40, cast=int),
+    pool_size=env('DB_POOL_MAX_SIZE', default=10, cast=int) if pooled else None,
+    workers=env('WEB_WORKERS', default=0, cast=int),
+    threads=env('WEB_THREADS', default=0, cast=int),
+    asynchronous=asynchronous,
+)
+bind = env('WEB_BIND', default='0.0.0.0:8000')
+# Limite das queries só do servidor web (ver DB_STATEMENT_TIMEOUT_MS nas
+# settings): aplicado ao ambiente antes do preload do app
+raw_env = [f"DB_STATEMENT_TIMEOUT_MS={env('WEB_STATEMENT_TIMEOUT_MS', default=30000, cast=int)}"]
+preload_app = True
+
+max_requests = env('WEB_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = env('WEB_MAX_REQUESTS_JITTER', default=100, cast=int)
+timeout = env('WEB_TIMEOUT', default=30, cast=int)
+graceful_timeout = env('WEB_GRACEFUL_TIMEOUT', default=30, cast=int)
+keepalive = env('WEB_KEEPALIVE', default=5, cast=int)
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    check_shared_cache(server.cfg.workers, env('CACHE_BACKEND', default='locmem'))
+
+
+def post_fork(server, worker):
+    # Conexões abertas no master durante o preload não podem ser
+    # compartilhadas entre processos
+    from django.db import connections
+
+    connections.close_all()
+
+
+def when_ready(server):
+    if not asynchronous:
+        server.log.info('Servidor pronto: %s workers gthread x %s threads', workers, threads)
+        return
+    server.log.info('Servidor pronto: %s workers ASGI (%s)', workers, worker_class)
+    if not pooled:
+        server.log.warning(
+            'Worker ASGI sem DB_POOL: cada requisição simultânea abre sua própria '
+            'conexão e WEB_DB_CONNECTIONS não é respeitado.'
+        )
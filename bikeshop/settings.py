@@ -52,6 +52,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
+    'core.db_router.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -64,7 +66,7 @@ ROOT_URLCONF = 'bikeshop.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -82,18 +84,79 @@ WSGI_APPLICATION = 'bikeshop.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
-
-DATABASES = {
-    'default': {
+#
+# Conexões: por padrão são persistentes (DB_CONN_MAX_AGE segundos) com
+# health check antes de reutilizar, evitando o handshake a cada requisição.
+# Com DB_POOL=True usa o pool do psycopg 3 (recomendado sob ASGI, onde as
+# conexões persistentes ficam presas às threads); o pool exige
+# CONN_MAX_AGE=0. DB_STATEMENT_TIMEOUT_MS entra nas opções de conexão
+# (`-c statement_timeout`) de todas as conexões do processo (0 desativa).
+# O gunicorn_conf o define a partir de WEB_STATEMENT_TIMEOUT_MS só para o
+# servidor web; migrate, run_worker e demais comandos rodam sem limite. Com
+# DB_REPLICA_HOST definido, o alias 'replica' aponta para a réplica de
+# leitura, em transações somente leitura.
+# `manage.py bench_connections` mede o custo de conexão por requisição.
+
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=10, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=int)
+DB_STATEMENT_TIMEOUT_MS = config('DB_STATEMENT_TIMEOUT_MS', default=0, cast=int)
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+
+
+def _database(host, port, read_only=False):
+    options = {}
+    session = []
+    if read_only:
+        session.append('-c default_transaction_read_only=on')
+    if DB_STATEMENT_TIMEOUT_MS:
+        session.append(f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}')
+    if session:
+        options['options'] = ' '.join(session)
+    if DB_POOL:
+        options['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+    return {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': config('DB_NAME', default='bikeshop'),
         'USER': config('DB_USER', default='bikeshopuser'),
         'PASSWORD': config('DB_PASSWORD', default='password123'),
-        'HOST': config('DB_HOST', default='db'),
-        'PORT': config('DB_PORT', default='5432'),
+        'HOST': host,
+        'PORT': port,
+        'CONN_MAX_AGE': 0 if DB_POOL else DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': options,
     }
+
+
+DATABASES = {
+    'default': _database(config('DB_HOST', default='db'), config('DB_PORT', default='5432')),
 }
 
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **_database(DB_REPLICA_HOST, config('DB_REPLICA_PORT', default='5432'), read_only=True),
+        # Nos testes a réplica é o próprio banco principal
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Leituras marcadas (relatórios, dashboard, histórico) vão para a réplica;
+# após uma escrita o navegador fica REPLICA_PIN_SECONDS no primário.
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+
+# Chaves primárias (core.ids): linhas novas recebem UUIDv7, ordenado por
+# tempo, que mantém os inserts no fim do índice da PK. 4 volta ao aleatório.
+# `manage.py bench_ids` compara os dois geradores.
+
+MODEL_ID_VERSION = config('MODEL_ID_VERSION', default=7, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -129,5 +192,160 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
+#
+# Em produção o próprio worker serve /static/ (WhiteNoise), a partir de
+# STATIC_ROOT (`manage.py collectstatic`, feito no build da imagem). Com
+# STATIC_MANIFEST=True os arquivos ganham hash no nome, são pré-
+# compactados (gzip/brotli) e vão com cache de um ano (immutable); sem
+# manifesto (desenvolvimento, testes) não é preciso rodar collectstatic e
+# o runserver continua servindo os estáticos.
+
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = config('STATIC_ROOT', default=str(BASE_DIR / 'staticfiles'))
+STATIC_MANIFEST = config('STATIC_MANIFEST', default=False, cast=bool)
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage'
+            if STATIC_MANIFEST else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
+if STATIC_MANIFEST:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+    )
+
+
+# Reposição de estoque (stock.services.ReplenishmentService)
+# Giro diário = maior média entre a janela longa e a curta; ponto de pedido
+# cobre o prazo de entrega + dias de segurança; a compra sugerida cobre o
+# período de revisão. Sem histórico de vendas vale o ponto de pedido mínimo.
+
+REPLENISHMENT_LOOKBACK_DAYS = config('REPLENISHMENT_LOOKBACK_DAYS', default=90, cast=int)
+REPLENISHMENT_SHORT_WINDOW_DAYS = config('REPLENISHMENT_SHORT_WINDOW_DAYS', default=28, cast=int)
+REPLENISHMENT_LEAD_TIME_DAYS = config('REPLENISHMENT_LEAD_TIME_DAYS', default=7, cast=int)
+REPLENISHMENT_SAFETY_DAYS = config('REPLENISHMENT_SAFETY_DAYS', default=7, cast=int)
+REPLENISHMENT_REVIEW_DAYS = config('REPLENISHMENT_REVIEW_DAYS', default=30, cast=int)
+REPLENISHMENT_MIN_REORDER_POINT = config('REPLENISHMENT_MIN_REORDER_POINT', default=10, cast=int)
+
+
+# Cache (padrão + fragmentos de template, ver core.cache_keys)
+# 'locmem' é por processo: com vários workers (gunicorn/run_worker) use
+# 'file' para que invalidações e relatórios pré-calculados sejam vistos
+# por todos. O gunicorn_conf recusa subir mais de um worker com 'locmem'. FRAGMENT_CACHE_VERSION invalida todos os fragmentos de uma vez.
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+CACHE_LOCATION = config('CACHE_LOCATION', default=str(BASE_DIR / '.cache'))
+
+_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+
+
+def _cache(name, max_entries):
+    backend = _CACHE_BACKENDS[CACHE_BACKEND]
+    location = f'{CACHE_LOCATION}/{name}' if CACHE_BACKEND == 'file' else name
+    return {'BACKEND': backend, 'LOCATION': location, 'OPTIONS': {'MAX_ENTRIES': max_entries}}
+
+
+CACHES = {
+    'default': _cache('default', 1000),
+    'fragments': _cache('fragments', config('FRAGMENT_CACHE_MAX_ENTRIES', default=5000, cast=int)),
+}
+
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=86400, cast=int)
+FRAGMENT_CACHE_VERSION = config('FRAGMENT_CACHE_VERSION', default='1')
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=300, cast=int)
+
+
+# Relatórios de fechamento (stock.services.ReportService)
+# Resultados são gravados por mês (stock.ReportSnapshot) pela tarefa
+# stock.build_reports / `manage.py build_reports`; as views só leem. O mês
+# corrente é recalculado após REPORT_CACHE_TIMEOUT segundos; meses fechados
+# não expiram.
+
+REPORT_CACHE_TIMEOUT = config('REPORT_CACHE_TIMEOUT', default=300, cast=int)
+
+
+# Eventos de estoque em tempo real (stock.events, SSE em /estoque/eventos/)
+# 'auto' usa LISTEN/NOTIFY no PostgreSQL e entrega em memória nos demais
+# bancos (apenas para navegadores conectados ao mesmo processo).
+# Sob WSGI cada stream ocupa uma thread: ele é encerrado após
+# STOCK_EVENTS_MAX_SECONDS (0 = sem limite) e o navegador reconecta.
+# Sob ASGI o stream é async e não tem limite.
+
+STOCK_EVENTS_BACKEND = config('STOCK_EVENTS_BACKEND', default='auto')
+STOCK_EVENTS_KEEPALIVE_SECONDS = config('STOCK_EVENTS_KEEPALIVE_SECONDS', default=15, cast=int)
+STOCK_EVENTS_MAX_SECONDS = config('STOCK_EVENTS_MAX_SECONDS', default=300, cast=int)
+
+
+# Razão de movimentações (stock.services.MovementPartitionService)
+# No PostgreSQL a tabela é particionada por mês; o histórico recente lê só
+# os últimos STOCK_MOVEMENT_HOT_MONTHS meses. Rodar mensalmente (cron):
+# `manage.py movement_partitions` (cria as próximas partições) e
+# `manage.py archive_movements` (arquiva meses com mais de N anos em
+# CSV gzip, na tabela StockMovementArchive ou em STOCK_MOVEMENT_ARCHIVE_DIR).
+# Na tabela, o mês compactado é lido inteiro para a memória ao gravar:
+# acima de STOCK_MOVEMENT_ARCHIVE_MAX_BYTES o arquivamento é recusado e
+# deve usar o destino em arquivo, que grava em disco sem esse limite.
+
+STOCK_MOVEMENT_HOT_MONTHS = config('STOCK_MOVEMENT_HOT_MONTHS', default=3, cast=int)
+STOCK_MOVEMENT_ARCHIVE_YEARS = config('STOCK_MOVEMENT_ARCHIVE_YEARS', default=2, cast=int)
+STOCK_MOVEMENT_ARCHIVE_DIR = config('STOCK_MOVEMENT_ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+STOCK_MOVEMENT_ARCHIVE_MAX_BYTES = config(
+    'STOCK_MOVEMENT_ARCHIVE_MAX_BYTES', default=64 * 1024 * 1024, cast=int
+)
+
+
+# Instrumentação de requisições (core.middleware.RequestMetricsMiddleware)
+# Server-Timing + log estruturado por requisição. O limite de requisição
+# lenta é opcional (0 desativa) e, quando ativo, registra queries repetidas.
+# Desligada por padrão fora do DEBUG: envolve toda query num wrapper e o
+# header Server-Timing expõe tempos internos a qualquer cliente.
+
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=DEBUG, cast=bool)
+SLOW_REQUEST_THRESHOLD_MS = config('SLOW_REQUEST_THRESHOLD_MS', default=0, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'bikeshop.requests': {
+            'handlers': ['console'],
+            'level': config('REQUEST_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+        'bikeshop.events': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'bikeshop.jobs': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+
+# Tarefas em segundo plano (core.services.JobService / manage.py run_worker)
+# Falhas voltam para a fila com espera exponencial a partir do backoff base;
+# tarefas RUNNING sem progresso além do limite são consideradas órfãs.
+
+JOB_WORKER_PROCESSES = config('JOB_WORKER_PROCESSES', default=2, cast=int)
+JOB_MAX_ATTEMPTS = config('JOB_MAX_ATTEMPTS', default=3, cast=int)
+JOB_RETRY_BACKOFF_SECONDS = config('JOB_RETRY_BACKOFF_SECONDS', default=30, cast=int)
+JOB_STALE_TIMEOUT_SECONDS = config('JOB_STALE_TIMEOUT_SECONDS', default=600, cast=int)
@@ -3,11 +3,14 @@ URL configuration for bikeshop project.
 """
 from django.contrib import admin
 from django.urls import path, include
-from core.views import dashboard
+from core.views import autocomplete, dashboard, healthz, job_status
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', dashboard, name='dashboard'),
+    path('healthz', healthz, name='healthz'),
+    path('tarefas/<uuid:pk>/', job_status, name='job_status'),
+    path('busca/<slug:source>/', autocomplete, name='autocomplete'),
     path('produtos/', include('catalog.urls')),
     path('pdv/', include('sales.urls')),
     path('estoque/', include('stock.urls')),
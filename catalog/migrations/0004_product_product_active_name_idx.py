@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_product'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['active', 'name'], name='product_active_name_idx'),
+        ),
+    ]
@@ -80,6 +80,10 @@ class Product(ModelBase):
         verbose_name = "Produto"
         verbose_name_plural = "Produtos"
         ordering = ['name']
+        indexes = [
+            # Busca/autocomplete: ativos em ordem de nome (LIMIT sem ordenar tudo)
+            models.Index(fields=['active', 'name'], name='product_active_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sku} - {self.name}"
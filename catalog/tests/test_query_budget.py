@@ -0,0 +1,28 @@
+"""
+Orçamento de queries das telas do catálogo.
+"""
+
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+
+from core.models import Client
+from sales.services import SalesService
+from stock.services import StockService
+
+
+@pytest.mark.django_db
+class TestCatalogQueryBudget:
+    def test_product_detail(self, client, product, warehouse, warehouse_secondary, django_assert_num_queries):
+        StockService.add_stock(product, warehouse, 50)
+        StockService.add_stock(product, warehouse_secondary, 5)
+        buyer = Client.objects.create(name="Cliente Detalhe")
+        for _ in range(3):
+            SalesService.create_sale(buyer, warehouse, [
+                {'product': product, 'quantity': 1, 'unit_price': Decimal('80.00')}
+            ])
+
+        # produto (com categoria/marca), saldos por depósito, histórico de
+        # vendas e resumo agregado de vendas (a versão do ETag vem do cache)
+        with django_assert_num_queries(4):
+            client.get(reverse('catalog:product_detail', args=[product.id]))
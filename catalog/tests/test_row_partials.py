@@ -0,0 +1,136 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from catalog.models import Brand, Category, Product
+
+
+HTMX = {'HTTP_HX_REQUEST': 'true'}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _product_data(product, **changes):
+    data = {
+        'name': product.name,
+        'sku': product.sku,
+        'price': product.price,
+        'cost': product.cost,
+        'category': product.category_id,
+        'active': True,
+    }
+    data.update(changes)
+    return data
+
+
+@pytest.mark.django_db
+class TestProductRowResponses:
+    def test_edit_returns_only_the_changed_row(self, client, product, product_secondary):
+        url = reverse('catalog:product_edit', args=[product.pk])
+
+        response = client.post(url, _product_data(product, name='Pneu Editado'), **HTMX)
+
+        content = response.content.decode()
+        assert response.status_code == 200
+        assert f'<tr id="product-{product.pk}" hx-swap-oob="true">' in content
+        assert 'Pneu Editado' in content
+        assert product_secondary.name not in content
+        assert '<table' not in content
+
+    def test_create_prepends_row(self, client, product):
+        data = _product_data(product, sku='NOVO-001', name='Produto Novo')
+
+        response = client.post(reverse('catalog:product_create'), data, **HTMX)
+
+        content = response.content.decode()
+        created = Product.objects.get(sku='NOVO-001')
+        assert 'hx-swap-oob="afterbegin:#product-rows"' in content
+        assert f'id="product-{created.pk}"' in content
+
+    def test_delete_marks_row_inactive(self, client, product):
+        response = client.post(reverse('catalog:product_delete', args=[product.pk]), **HTMX)
+
+        content = response.content.decode()
+        assert f'<tr id="product-{product.pk}" hx-swap-oob="true">' in content
+        assert 'inativo' in content
+        assert reverse('catalog:product_delete', args=[product.pk]) not in content
+        product.refresh_from_db()
+        assert product.active is False
+
+        # A linha continua na listagem após recarregar, coerente com o swap
+        listing = client.get(reverse('catalog:product_list')).content.decode()
+        assert f'id="product-{product.pk}"' in listing
+        assert 'inativo' in listing
+
+    def test_form_posts_with_htmx(self, client, product):
+        url = reverse('catalog:product_edit', args=[product.pk])
+
+        assert f'hx-post="{url}"' in client.get(url).content.decode()
+
+    def test_submit_from_form_page_redirects_to_list(self, client, product):
+        url = reverse('catalog:product_edit', args=[product.pk])
+
+        response = client.post(
+            url, _product_data(product), HTTP_HX_CURRENT_URL=f'http://testserver{url}', **HTMX
+        )
+
+        assert response['HX-Redirect'] == reverse('catalog:product_list')
+        assert f'id="product-{product.pk}"' in response.content.decode()
+
+    def test_invalid_htmx_submit_shows_errors(self, client, product):
+        url = reverse('catalog:product_edit', args=[product.pk])
+
+        response = client.post(url, _product_data(product, name=''), **HTMX)
+
+        assert response['HX-Retarget'] == '.form-card'
+        assert response['HX-Reswap'] == 'outerHTML'
+        assert 'field-error' in response.content.decode()
+
+    def test_category_and_brand_rows(self, client, category):
+        brand = Brand.objects.create(name='Shimano')
+
+        response = client.post(
+            reverse('catalog:category_edit', args=[category.pk]),
+            {'name': 'Peças Novas', 'type': Category.Type.PRODUCT}, **HTMX,
+        )
+        assert f'<tr id="category-{category.pk}" hx-swap-oob="true">' in response.content.decode()
+
+        response = client.post(reverse('catalog:brand_delete', args=[brand.pk]), **HTMX)
+        assert f'id="brand-{brand.pk}" hx-swap-oob="delete"' in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestRowFragmentCache:
+    def test_row_is_cached_until_updated_at_changes(self, client, product):
+        url = reverse('catalog:product_list')
+        assert product.name in client.get(url).content.decode()
+
+        # Alteração sem tocar em updated_at: a linha em cache é reaproveitada
+        Product.objects.filter(pk=product.pk).update(name='Nome Sem Timestamp')
+        assert 'Nome Sem Timestamp' not in client.get(url).content.decode()
+
+        product.refresh_from_db()
+        product.name = 'Nome Novo'
+        product.save()
+        assert 'Nome Novo' in client.get(url).content.decode()
+
+    def test_category_rename_invalidates_product_rows(self, client, product, category):
+        url = reverse('catalog:product_list')
+        client.get(url)
+
+        category.name = 'Categoria Renomeada'
+        category.save()
+
+        assert 'Categoria Renomeada' in client.get(url).content.decode()
+
+    def test_category_list_counts_in_one_query(self, client, category, product, product_secondary, django_assert_num_queries):
+        Category.objects.create(name='Outra')
+        # só a listagem anotada (a versão do ETag vem do cache)
+        with django_assert_num_queries(1):
+            response = client.get(reverse('catalog:category_list'))
+        assert '<td>2</td>' in response.content.decode()
@@ -1,8 +1,84 @@
+from urllib.parse import urlsplit
+
 from django.shortcuts import render, get_object_or_404, redirect
+from django.db.models import Count
 from django.http import HttpResponse
+from django.urls import reverse
+
+from core.conditional import conditional_get, day_version, model_version
+from core.db_router import replica_view
 from .models import Product, Category
 
 
+def _row_response(request, row_template, rows_id, list_url, context, created=False):
+    """
+    Resposta HTMX de uma mutação: apenas a linha afetada, como swap
+    out-of-band (substitui a linha existente ou entra no topo da tabela).
+
+    Se o formulário foi enviado da própria página (não há tabela para
+    receber a linha), o navegador é levado de volta à listagem.
+    """
+    response = render(request, 'core/partials/oob_row.html', {
+        **context,
+        'row_template': row_template,
+        'rows_id': rows_id,
+        'created': created,
+    })
+    if urlsplit(request.headers.get('HX-Current-URL', '')).path == request.path:
+        response['HX-Redirect'] = reverse(list_url)
+    return response
+
+
+def _form_page(request, template, context):
+    """
+    Página do formulário. Num envio HTMX inválido, o cartão do formulário
+    é substituído para exibir os erros (o hx-swap="none" do form não
+    troca nada).
+    """
+    response = render(request, template, context)
+    if request.method == 'POST' and request.headers.get('HX-Request'):
+        response['HX-Retarget'] = '.form-card'
+        response['HX-Reselect'] = '.form-card'
+        response['HX-Reswap'] = 'outerHTML'
+    return response
+
+
+def _row_deleted(prefix, pk):
+    """Resposta HTMX de exclusão: remove a linha da tabela (out-of-band)."""
+    return HttpResponse(f'<tr id="{prefix}-{pk}" hx-swap-oob="delete"></tr>')
+
+
+def _product_row(request, product, created=False):
+    product = Product.objects.select_related('category').get(pk=product.pk)
+    return _row_response(
+        request, 'catalog/partials/product_row.html', 'product-rows', 'catalog:product_list',
+        {'product': product}, created=created,
+    )
+
+
+def _category_row(request, category, created=False):
+    category = Category.objects.annotate(product_count=Count('products')).get(pk=category.pk)
+    return _row_response(
+        request, 'catalog/partials/category_row.html', 'category-rows', 'catalog:category_list',
+        {'category': category}, created=created,
+    )
+
+
+def _brand_row(request, brand, created=False):
+    from .models import Brand
+
+    brand = Brand.objects.annotate(product_count=Count('products')).get(pk=brand.pk)
+    return _row_response(
+        request, 'catalog/partials/brand_row.html', 'brand-rows', 'catalog:brand_list',
+        {'brand': brand}, created=created,
+    )
+
+
+def _product_list_versions(request):
+    return [model_version(Product, Category)]
+
+
+@conditional_get(_product_list_versions)
 def product_list(request):
     """Lista todos os produtos."""
     products = Product.objects.select_related('category', 'brand').order_by('name')
@@ -43,15 +119,15 @@ def product_create(request):
     if request.method == 'POST':
         form = ProductForm(request.POST)
         if form.is_valid():
-            form.save()
+            product = form.save()
             
             if request.headers.get('HX-Request'):
-                return HttpResponse(status=204, headers={'HX-Trigger': 'productListChanged'})
+                return _product_row(request, product, created=True)
             return redirect('catalog:product_list')
     else:
         form = ProductForm()
     
-    return render(request, 'catalog/product_form.html', {'form': form})
+    return _form_page(request, 'catalog/product_form.html', {'form': form})
 
 
 def product_edit(request, pk):
@@ -66,19 +142,23 @@ def product_edit(request, pk):
             form.save()
             
             if request.headers.get('HX-Request'):
-                return HttpResponse(status=204, headers={'HX-Trigger': 'productListChanged'})
+                return _product_row(request, product)
             return redirect('catalog:product_list')
     else:
         form = ProductForm(instance=product)
     
-    return render(request, 'catalog/product_form.html', {
+    return _form_page(request, 'catalog/product_form.html', {
         'product': product,
         'form': form,
     })
 
 
 def product_delete(request, pk):
-    """Exclui um produto."""
+    """
+    Desativa um produto (exclusão lógica: vendas e movimentações antigas
+    continuam apontando para ele). A listagem segue exibindo a linha,
+    agora marcada como inativa.
+    """
     product = get_object_or_404(Product, pk=pk)
     
     if request.method == 'POST':
@@ -86,16 +166,32 @@ def product_delete(request, pk):
         product.save()
         
         if request.headers.get('HX-Request'):
-            return HttpResponse(status=204, headers={'HX-Trigger': 'productListChanged'})
+            return _product_row(request, product)
         return redirect('catalog:product_list')
     
     return render(request, 'catalog/product_confirm_delete.html', {'product': product})
 
 
+def _product_detail_versions(request, pk):
+    from .models import Brand
+    from core.models import Client
+    from stock.models import Stock, Warehouse
+    from sales.models import Sale, SaleItem
+
+    return [
+        model_version(Product, Category, Brand, Stock, Warehouse, Sale, SaleItem, Client),
+        # Métricas dos "últimos 30 dias"
+        day_version(),
+    ]
+
+
+@replica_view
+@conditional_get(_product_detail_versions)
 def product_detail(request, pk):
     """Exibe detalhes completos de um produto."""
     from stock.models import Stock
     from sales.models import SaleItem
+    from sales.services import SalesService
     from decimal import Decimal
     
     product = get_object_or_404(Product.objects.select_related('category', 'brand'), pk=pk)
@@ -106,18 +202,19 @@ def product_detail(request, pk):
     else:
         margin = Decimal('0.00')
     
-    # Estoque por depósito
-    stock_by_warehouse = Stock.objects.filter(product=product).select_related('warehouse')
+    # Estoque por depósito (as linhas já são exibidas; o total sai delas)
+    stock_by_warehouse = list(
+        Stock.objects.filter(product=product).select_related('warehouse')
+    )
     total_stock = sum(s.quantity for s in stock_by_warehouse)
     
-    # Histórico de vendas (últimas 10)
+    # Histórico de vendas (últimas 10, apenas para exibição)
     sales_history = SaleItem.objects.filter(
         product=product
     ).select_related('sale', 'sale__client').order_by('-created_at')[:10]
     
-    # Total vendido
-    total_sold = sum(item.quantity for item in sales_history)
-    total_revenue = sum(item.total_price for item in sales_history)
+    # Totais de vendas: agregados no banco sobre todo o histórico
+    summary = SalesService.get_product_summary(product)
     
     context = {
         'product': product,
@@ -125,8 +222,9 @@ def product_detail(request, pk):
         'stock_by_warehouse': stock_by_warehouse,
         'total_stock': total_stock,
         'sales_history': sales_history,
-        'total_sold': total_sold,
-        'total_revenue': total_revenue,
+        'total_sold': summary['units_sold'],
+        'total_revenue': summary['revenue'],
+        'sales_summary': summary,
     }
     
     return render(request, 'catalog/product_detail.html', context)
@@ -136,9 +234,14 @@ def product_detail(request, pk):
 # Category CRUD
 # ============================================
 
+def _category_list_versions(request):
+    return [model_version(Category, Product)]
+
+
+@conditional_get(_category_list_versions)
 def category_list(request):
     """Lista todas as categorias."""
-    categories = Category.objects.all()
+    categories = Category.objects.annotate(product_count=Count('products'))
     return render(request, 'catalog/category_list.html', {'categories': categories})
 
 
@@ -149,14 +252,14 @@ def category_create(request):
     if request.method == 'POST':
         form = CategoryForm(request.POST)
         if form.is_valid():
-            form.save()
+            category = form.save()
             if request.headers.get('HX-Request'):
-                return HttpResponse(status=204, headers={'HX-Trigger': 'categoryListChanged'})
+                return _category_row(request, category, created=True)
             return redirect('catalog:category_list')
     else:
         form = CategoryForm()
     
-    return render(request, 'catalog/category_form.html', {'form': form})
+    return _form_page(request, 'catalog/category_form.html', {'form': form})
 
 
 def category_edit(request, pk):
@@ -170,12 +273,12 @@ def category_edit(request, pk):
         if form.is_valid():
             form.save()
             if request.headers.get('HX-Request'):
-                return HttpResponse(status=204, headers={'HX-Trigger': 'categoryListChanged'})
+                return _category_row(request, category)
             return redirect('catalog:category_list')
     else:
         form = CategoryForm(instance=category)
     
-    return render(request, 'catalog/category_form.html', {'form': form, 'category': category})
+    return _form_page(request, 'catalog/category_form.html', {'form': form, 'category': category})
 
 
 def category_delete(request, pk):
@@ -185,9 +288,10 @@ def category_delete(request, pk):
     category = get_object_or_404(Category, pk=pk)
     
     if request.method == 'POST':
+        pk = category.pk
         category.delete()
         if request.headers.get('HX-Request'):
-            return HttpResponse(status=204, headers={'HX-Trigger': 'categoryListChanged'})
+            return _row_deleted('category', pk)
         return redirect('catalog:category_list')
     
     return render(request, 'catalog/category_confirm_delete.html', {'category': category})
@@ -197,11 +301,18 @@ def category_delete(request, pk):
 # Brand CRUD
 # ============================================
 
+def _brand_list_versions(request):
+    from .models import Brand
+
+    return [model_version(Brand, Product)]
+
+
+@conditional_get(_brand_list_versions)
 def brand_list(request):
     """Lista todas as marcas."""
     from .models import Brand
     
-    brands = Brand.objects.all()
+    brands = Brand.objects.annotate(product_count=Count('products'))
     return render(request, 'catalog/brand_list.html', {'brands': brands})
 
 
@@ -212,14 +323,14 @@ def brand_create(request):
     if request.method == 'POST':
         form = BrandForm(request.POST)
         if form.is_valid():
-            form.save()
+            brand = form.save()
             if request.headers.get('HX-Request'):
-                return HttpResponse(status=204, headers={'HX-Trigger': 'brandListChanged'})
+                return _brand_row(request, brand, created=True)
             return redirect('catalog:brand_list')
     else:
         form = BrandForm()
     
-    return render(request, 'catalog/brand_form.html', {'form': form})
+    return _form_page(request, 'catalog/brand_form.html', {'form': form})
 
 
 def brand_edit(request, pk):
@@ -234,12 +345,12 @@ def brand_edit(request, pk):
         if form.is_valid():
             form.save()
             if request.headers.get('HX-Request'):
-                return HttpResponse(status=204, headers={'HX-Trigger': 'brandListChanged'})
+                return _brand_row(request, brand)
             return redirect('catalog:brand_list')
     else:
         form = BrandForm(instance=brand)
     
-    return render(request, 'catalog/brand_form.html', {'form': form, 'brand': brand})
+    return _form_page(request, 'catalog/brand_form.html', {'form': form, 'brand': brand})
 
 
 def brand_delete(request, pk):
@@ -249,9 +360,10 @@ def brand_delete(request, pk):
     brand = get_object_or_404(Brand, pk=pk)
     
     if request.method == 'POST':
+        pk = brand.pk
         brand.delete()
         if request.headers.get('HX-Request'):
-            return HttpResponse(status=204, headers={'HX-Trigger': 'brandListChanged'})
+            return _row_deleted('brand', pk)
         return redirect('catalog:brand_list')
     
     return render(request, 'catalog/brand_confirm_delete.html', {'brand': brand})
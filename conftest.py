@@ -6,6 +6,30 @@ import pytest
 from decimal import Decimal
 
 
+def pytest_configure(config):
+    """
+    Alias 'replica' para os testes do roteamento de leitura: espelho do
+    banco de testes (TEST MIRROR), como uma réplica sem atraso.
+    """
+    from django.conf import settings
+    if 'replica' not in settings.DATABASES:
+        settings.DATABASES['replica'] = {
+            **settings.DATABASES['default'],
+            'TEST': {'MIRROR': 'default'},
+        }
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Isola os testes do cache (fragmentos e carimbos ficam em memória)."""
+    from django.core.cache import caches
+    for cache in caches.all():
+        cache.clear()
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
 @pytest.fixture
 def warehouse(db):
     """Cria um depósito para testes."""
@@ -1,12 +1,29 @@
 from django.contrib import admin
-from .models import Client, Supplier
+from .models import Client, ClientSummary, Job, Supplier
 
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
-    list_display = ('name', 'email', 'phone', 'created_at')
-    search_fields = ('name', 'email', 'document')
+    list_display = ('name', 'document', 'email', 'phone', 'active', 'created_at')
+    list_filter = ('active',)
+    search_fields = ('name', 'email', 'document', 'phone')
+
+@admin.register(ClientSummary)
+class ClientSummaryAdmin(admin.ModelAdmin):
+    list_display = ('client', 'purchase_count', 'total_spent', 'last_purchase_at')
+    search_fields = ('client__name',)
+    readonly_fields = ('client', 'purchase_count', 'total_spent', 'first_purchase_at', 'last_purchase_at')
+
+    # Mantido pelo ClientSummaryService (vendas e refresh_client_summaries)
+    def has_add_permission(self, request):
+        return False
 
 @admin.register(Supplier)
 class SupplierAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'phone', 'created_at')
-    search_fields = ('name', 'email')
\ No newline at end of file
+    search_fields = ('name', 'email')
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'progress', 'attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('result', 'error', 'locked_by', 'started_at', 'finished_at')
@@ -1,5 +1,19 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from core.cache_keys import touch_model
+        from core.models import ModelBase
+
+        # Renova o carimbo "última alteração" de cada modelo (cache de fragmentos)
+        def _touch(sender, using=None, **kwargs):
+            touch_model(sender, using=using)
+
+        for model in apps.get_models():
+            if issubclass(model, ModelBase):
+                post_save.connect(_touch, sender=model, weak=False)
+                post_delete.connect(_touch, sender=model, weak=False)
@@ -0,0 +1,62 @@
+"""
+Fontes do autocomplete (busca remota que substitui <select> com a tabela inteira).
+
+Cada fonte recebe o termo digitado e devolve um queryset ordenado; o
+endpoint (core.views.autocomplete) pagina com LIMIT sem COUNT, e o
+formulário valida apenas o id enviado (ModelChoiceField faz um único
+get por pk). A ordenação acompanha os índices por nome dos modelos.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db.models import Q
+
+
+PAGE_SIZE = 20
+
+
+@dataclass(frozen=True)
+class AutocompleteSource:
+    search: Callable
+    label: Callable
+    detail: Callable
+    placeholder: str
+
+
+def _search_products(term):
+    from catalog.models import Product
+
+    products = Product.objects.filter(active=True)
+    if term:
+        products = products.filter(Q(name__icontains=term) | Q(sku__istartswith=term))
+    return products.order_by('name')
+
+
+def _search_clients(term):
+    from core.models import Client
+    from core.services import ClientService
+
+    # Chaves normalizadas; resultados mais relevantes primeiro
+    return ClientService.ranked(term, Client.objects.filter(active=True))
+
+
+SOURCES = {
+    'produtos': AutocompleteSource(
+        search=_search_products,
+        label=lambda product: product.name,
+        detail=lambda product: product.sku,
+        placeholder='Buscar por nome ou SKU...',
+    ),
+    'clientes': AutocompleteSource(
+        search=_search_clients,
+        label=lambda client: client.name,
+        detail=lambda client: client.document or client.email or '',
+        placeholder='Buscar por nome, CPF/CNPJ, telefone ou e-mail...',
+    ),
+}
+
+
+def get_source(name: str) -> AutocompleteSource:
+    """Retorna a fonte registrada. Raises: KeyError se não existir."""
+    return SOURCES[name]
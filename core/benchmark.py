@@ -0,0 +1,417 @@
+"""
+Benchmarks de infraestrutura do banco.
+
+ConnectionBenchmark - custo de conexão por requisição. Repete uma
+requisição pequena (por padrão a busca do autocomplete, o tipo de chamada
+HTMX que mais sofre com o handshake) em dois perfis:
+
+    - sem_persistencia: CONN_MAX_AGE=0 e sem pool (uma conexão nova por
+      requisição, o comportamento anterior)
+    - configurado: o perfil de DATABASES atual (conexões persistentes com
+      health check ou pool do psycopg 3)
+
+e informa latência, conexões abertas e o tempo médio de um handshake.
+
+IdInsertBenchmark - inserts em massa numa tabela com o formato do razão
+de movimentações (StockMovement), com chave UUIDv4 x UUIDv7 (core.ids).
+
+ClientSearchBenchmark - latência da busca de clientes (ClientService) por
+documento, telefone, e-mail e nome, sobre a base atual (popule antes com
+`manage.py populate_db --clients N`).
+
+HttpLoadBenchmark - carga HTTP num servidor já em execução (ex.: o
+gunicorn de bikeshop.gunicorn_conf), com N conexões simultâneas por um
+tempo fixo; serve para escolher workers x threads.
+
+Usados pelos comandos `manage.py bench_connections` / `bench_ids` /
+`bench_client_search` / `bench_http` e pelos testes.
+"""
+
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from statistics import mean
+from time import perf_counter
+
+from django.db import close_old_connections, connections, models, transaction
+from django.db.backends.signals import connection_created
+from django.test import Client as HttpClient
+from django.urls import reverse
+from django.utils import timezone
+
+from core.ids import uuid7
+from core.models import Client
+from core.services import ClientService
+from sales.benchmark import percentile
+
+
+PROFILES = ('sem_persistencia', 'configurado')
+
+
+class ConnectionBenchmark:
+    """
+    Mede `requests` requisições sequenciais em cada perfil de conexão.
+
+    Args:
+        requests: Requisições por perfil
+        url: URL medida (padrão: autocomplete de produtos em JSON)
+        alias: Alias do banco medido
+    """
+
+    def __init__(self, requests: int = 200, url: str | None = None, alias: str = 'default'):
+        self.requests = requests
+        self.url = url or reverse('autocomplete', args=['produtos']) + '?format=json&q=a'
+        self.alias = alias
+
+    @contextmanager
+    def _profile(self, name):
+        connection = connections[self.alias]
+        saved = connection.settings_dict.copy()
+        connection.close()
+        if name == 'sem_persistencia':
+            connection.settings_dict['CONN_MAX_AGE'] = 0
+            connection.settings_dict['OPTIONS'] = {
+                key: value for key, value in saved['OPTIONS'].items() if key != 'pool'
+            }
+        try:
+            yield connection
+        finally:
+            connection.close()
+            connection.settings_dict.clear()
+            connection.settings_dict.update(saved)
+
+    def _handshake_ms(self, connection, samples: int = 5) -> float:
+        """Tempo médio para abrir uma conexão nova (fora do pool)."""
+        params = connection.get_connection_params()
+        timings = []
+        for _ in range(samples):
+            start = perf_counter()
+            raw = connection.Database.connect(**params)
+            timings.append(perf_counter() - start)
+            raw.close()
+        return round(mean(timings) * 1000, 3)
+
+    def _measure(self, name) -> dict:
+        opened = []
+
+        def on_connect(sender, connection, **kwargs):
+            if connection.alias == self.alias:
+                opened.append(connection.alias)
+
+        client = HttpClient(SERVER_NAME='localhost')
+        timings = []
+        with self._profile(name):
+            connection_created.connect(on_connect)
+            try:
+                for _ in range(self.requests):
+                    start = perf_counter()
+                    client.get(self.url)
+                    # O Client de testes não fecha conexões ao fim da
+                    # requisição; o handler WSGI/ASGI real faz isso aqui
+                    close_old_connections()
+                    timings.append(perf_counter() - start)
+            finally:
+                connection_created.disconnect(on_connect)
+
+        return {
+            'requests': self.requests,
+            'connections_opened': len(opened),
+            'mean_ms': round(mean(timings) * 1000, 3),
+            'p50_ms': round(percentile(timings, 50) * 1000, 3),
+            'p95_ms': round(percentile(timings, 95) * 1000, 3),
+        }
+
+    def run(self) -> dict:
+        connection = connections[self.alias]
+        settings_dict = connection.settings_dict
+        profiles = {name: self._measure(name) for name in PROFILES}
+        before, after = profiles['sem_persistencia'], profiles['configurado']
+        return {
+            'config': {
+                'url': self.url,
+                'database': connection.vendor,
+                'conn_max_age': settings_dict.get('CONN_MAX_AGE'),
+                'health_checks': settings_dict.get('CONN_HEALTH_CHECKS'),
+                'pool': bool(settings_dict['OPTIONS'].get('pool')),
+            },
+            'handshake_ms': self._handshake_ms(connection),
+            'profiles': profiles,
+            'overhead_saved_ms_per_request': round(before['mean_ms'] - after['mean_ms'], 3),
+        }
+
+
+ID_GENERATORS = {'uuid4': uuid.uuid4, 'uuid7': uuid7}
+
+
+class IdInsertBenchmark:
+    """
+    Insere `rows` linhas com cada gerador de id e compara vazão e índice.
+
+    A tabela de rascunho imita StockMovement (pk UUID, produto, depósito,
+    quantidade, data) e é removida ao final. Com chaves aleatórias a vazão
+    cai à medida que o índice da PK deixa de caber no cache; a última
+    fração dos inserts (`tail_rows_per_s`) mostra essa degradação.
+
+    Args:
+        rows: Linhas inseridas por gerador (use milhões no PostgreSQL)
+        batch_size: Linhas por executemany/transação
+        alias: Alias do banco
+    """
+
+    TABLE_PREFIX = 'bench_ids_'
+
+    def __init__(self, rows: int = 2_000_000, batch_size: int = 10_000, alias: str = 'default'):
+        self.rows = rows
+        self.batch_size = batch_size
+        self.alias = alias
+        self.connection = connections[alias]
+        self._uuid_field = models.UUIDField()
+
+    def _create_table(self, table: str) -> None:
+        types = self.connection.data_types
+        uuid_type = types['UUIDField']
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+            cursor.execute(
+                f'CREATE TABLE {table} ('
+                f'id {uuid_type} NOT NULL PRIMARY KEY, '
+                f'product_id {uuid_type} NOT NULL, '
+                f'warehouse_id {uuid_type} NOT NULL, '
+                f'quantity integer NOT NULL, '
+                f'created_at {types["DateTimeField"]} NOT NULL)'
+            )
+
+    def _drop_table(self, table: str) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+    def _index_bytes(self, table: str) -> int | None:
+        """Tamanho do índice da PK (PostgreSQL; SQLite só com dbstat)."""
+        with self.connection.cursor() as cursor:
+            try:
+                if self.connection.vendor == 'postgresql':
+                    cursor.execute(
+                        'SELECT pg_relation_size(indexrelid) FROM pg_index '
+                        'WHERE indrelid = %s::regclass AND indisprimary',
+                        [table],
+                    )
+                elif self.connection.vendor == 'sqlite':
+                    cursor.execute(
+                        "SELECT SUM(pgsize) FROM dbstat WHERE name = %s",
+                        [f'sqlite_autoindex_{table}_1'],
+                    )
+                else:
+                    return None
+                row = cursor.fetchone()
+            except Exception:
+                return None
+        return int(row[0]) if row and row[0] is not None else None
+
+    def _measure(self, kind: str) -> dict:
+        generate = ID_GENERATORS[kind]
+        table = f'{self.TABLE_PREFIX}{kind}'
+        prep = lambda value: self._uuid_field.get_db_prep_value(value, self.connection)  # noqa: E731
+        now = self.connection.ops.adapt_datetimefield_value(timezone.now())
+        products = [prep(uuid.uuid4()) for _ in range(50)]
+        warehouses = [prep(uuid.uuid4()) for _ in range(3)]
+        sql = (
+            f'INSERT INTO {table} (id, product_id, warehouse_id, quantity, created_at) '
+            f'VALUES (%s, %s, %s, %s, %s)'
+        )
+
+        self._create_table(table)
+        try:
+            batch_timings = []
+            inserted = 0
+            while inserted < self.rows:
+                size = min(self.batch_size, self.rows - inserted)
+                params = [
+                    (prep(generate()), products[i % 50], warehouses[i % 3], 1, now)
+                    for i in range(inserted, inserted + size)
+                ]
+                start = perf_counter()
+                with transaction.atomic(using=self.alias):
+                    with self.connection.cursor() as cursor:
+                        cursor.executemany(sql, params)
+                batch_timings.append((size, perf_counter() - start))
+                inserted += size
+
+            index_bytes = self._index_bytes(table)
+        finally:
+            self._drop_table(table)
+
+        total_s = sum(elapsed for _, elapsed in batch_timings)
+        tail = batch_timings[-max(1, len(batch_timings) // 10):]
+        tail_rows = sum(size for size, _ in tail)
+        tail_s = sum(elapsed for _, elapsed in tail)
+        return {
+            'rows': inserted,
+            'elapsed_s': round(total_s, 3),
+            'rows_per_s': round(inserted / total_s) if total_s else 0,
+            'tail_rows_per_s': round(tail_rows / tail_s) if tail_s else 0,
+            'index_bytes': index_bytes,
+        }
+
+    def run(self) -> dict:
+        results = {kind: self._measure(kind) for kind in ID_GENERATORS}
+        v4, v7 = results['uuid4'], results['uuid7']
+        return {
+            'config': {
+                'rows': self.rows,
+                'batch_size': self.batch_size,
+                'database': self.connection.vendor,
+            },
+            'generators': results,
+            'speedup': round(v7['rows_per_s'] / v4['rows_per_s'], 2) if v4['rows_per_s'] else None,
+        }
+
+
+class ClientSearchBenchmark:
+    """
+    Busca `samples` clientes existentes por cada tipo de termo, digitado
+    como no balcão (com máscara, caixa e acento variados).
+
+    Args:
+        samples: Clientes sorteados por tipo de busca
+        page_size: Resultados por busca ranqueada
+    """
+
+    KINDS = ('documento', 'telefone', 'email', 'nome')
+
+    def __init__(self, samples: int = 200, page_size: int = 20):
+        self.samples = samples
+        self.page_size = page_size
+
+    @staticmethod
+    def _terms(client) -> dict:
+        document = client.document_key
+        if len(document) == 11:
+            document = f'{document[:3]}.{document[3:6]}.{document[6:9]}-{document[9:]}'
+        phone = client.phone_key
+        if len(phone) >= 10:
+            phone = f'({phone[:2]}) {phone[2:-4]}-{phone[-4:]}'
+        return {
+            'documento': document,
+            'telefone': phone,
+            'email': (client.email or '').upper(),
+            'nome': client.name,
+        }
+
+    def _time(self, term) -> tuple[float, int]:
+        start = perf_counter()
+        found = len(list(ClientService.ranked(term)[:self.page_size]))
+        return perf_counter() - start, found
+
+    def run(self) -> dict:
+        clients = list(Client.objects.order_by('pk')[:self.samples])
+        timings = {kind: [] for kind in self.KINDS}
+        misses = {kind: 0 for kind in self.KINDS}
+        for client in clients:
+            for kind, term in self._terms(client).items():
+                if not term:
+                    continue
+                elapsed, found = self._time(term)
+                timings[kind].append(elapsed)
+                misses[kind] += not found
+
+        connection = connections[Client.objects.db]
+        return {
+            'config': {
+                'clients': Client.objects.count(),
+                'samples': len(clients),
+                'database': connection.vendor,
+            },
+            'kinds': {
+                kind: {
+                    'queries': len(values),
+                    'misses': misses[kind],
+                    'mean_ms': round(mean(values) * 1000, 3) if values else None,
+                    'p50_ms': round(percentile(values, 50) * 1000, 3) if values else None,
+                    'p95_ms': round(percentile(values, 95) * 1000, 3) if values else None,
+                }
+                for kind, values in timings.items()
+            },
+        }
+
+
+class HttpLoadBenchmark:
+    """
+    `concurrency` threads repetem as `paths` em rodízio contra `base_url`
+    durante `duration` segundos.
+
+    Args:
+        base_url: Servidor medido (ex.: http://127.0.0.1:8000)
+        paths: Caminhos requisitados (padrão: /healthz e o autocomplete)
+        concurrency: Conexões simultâneas
+        duration: Segundos de medição
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        paths: list[str] | None = None,
+        concurrency: int = 16,
+        duration: float = 20.0,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.paths = paths or [
+            reverse('healthz'),
+            reverse('autocomplete', args=['produtos']) + '?format=json&q=a',
+        ]
+        self.concurrency = concurrency
+        self.duration = duration
+
+    def _client(self, deadline: float, timings: list, statuses: Counter, lock) -> None:
+        own_timings, own_statuses = [], Counter()
+        index = 0
+        while perf_counter() < deadline:
+            url = self.base_url + self.paths[index % len(self.paths)]
+            index += 1
+            start = perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+            except OSError:
+                status = 'conexao'
+            own_timings.append(perf_counter() - start)
+            own_statuses[status] += 1
+        with lock:
+            timings.extend(own_timings)
+            statuses.update(own_statuses)
+
+    def run(self) -> dict:
+        timings, statuses, lock = [], Counter(), threading.Lock()
+        start = perf_counter()
+        deadline = start + self.duration
+        clients = [
+            threading.Thread(target=self._client, args=(deadline, timings, statuses, lock))
+            for _ in range(self.concurrency)
+        ]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = perf_counter() - start
+
+        return {
+            'config': {
+                'base_url': self.base_url,
+                'paths': self.paths,
+                'concurrency': self.concurrency,
+                'duration_s': self.duration,
+            },
+            'requests': len(timings),
+            'errors': sum(count for status, count in statuses.items() if status != 200),
+            'statuses': {str(status): count for status, count in statuses.items()},
+            'requests_per_s': round(len(timings) / elapsed, 1),
+            'mean_ms': round(mean(timings) * 1000, 3) if timings else None,
+            'p50_ms': round(percentile(timings, 50) * 1000, 3),
+            'p95_ms': round(percentile(timings, 95) * 1000, 3),
+            'p99_ms': round(percentile(timings, 99) * 1000, 3),
+        }
@@ -0,0 +1,147 @@
+"""
+Chaves versionadas para o cache de fragmentos de template.
+
+Uma chave é montada a partir de partes que mudam quando o dado muda:
+
+    - instância de modelo -> (modelo, id, updated_at)
+    - classe de modelo    -> carimbo "última alteração" do modelo inteiro
+    - qualquer outro valor -> str(valor)
+
+O carimbo por modelo é um número guardado no próprio cache e renovado
+por signal a cada save/delete de qualquer ModelBase (ver CoreConfig.ready).
+Dentro de uma transação a renovação é adiada para o commit e feita uma
+única vez por modelo: uma venda que grava dezenas de linhas faz um
+cache.set por modelo, não um por linha (o FileBasedCache varre o
+diretório a cada set), e um fragmento renderizado antes do commit não
+fica guardado sob o carimbo novo.
+Assim a chave de um fragmento agregado (ex.: dashboard) não exige
+consultar o banco; alterações em massa que não disparam signals
+(queryset.update, bulk_create) devem chamar touch_model().
+
+Leituras da réplica podem ainda não conter a alteração que renovou um
+carimbo: enquanto ele tiver menos de REPLICA_PIN_SECONDS, o valor
+calculado na réplica é usado mas não guardado (ver can_store).
+
+FRAGMENT_CACHE_VERSION entra em todas as chaves: trocar o valor invalida
+todos os fragmentos de uma vez (ex.: ao publicar templates novos).
+"""
+
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+
+from core.db_router import reads_from_replica
+from core.instrumentation import current_metrics
+
+
+FRAGMENT_CACHE_ALIAS = 'fragments'
+
+# Contadores acumulados do processo (painel de debug)
+_totals = Counter()
+_totals_lock = threading.Lock()
+
+
+def fragment_cache():
+    return caches[FRAGMENT_CACHE_ALIAS]
+
+
+def _stamp_key(model) -> str:
+    # Proxies (customers.Customer) compartilham o carimbo do modelo concreto
+    return f'stamp:{model._meta.concrete_model._meta.label_lower}'
+
+
+def model_stamp(model) -> int:
+    """Carimbo de última alteração do modelo (criado na primeira consulta)."""
+    cache = fragment_cache()
+    key = _stamp_key(model)
+    stamp = cache.get(key)
+    if stamp is None:
+        cache.add(key, time.time_ns(), None)
+        stamp = cache.get(key)
+    return stamp
+
+
+def _bump(key: str) -> None:
+    fragment_cache().set(key, time.time_ns(), None)
+
+
+def touch_model(model, using: str | None = None) -> None:
+    """
+    Renova o carimbo do modelo, invalidando os fragmentos que dependem dele.
+
+    Em transação, agenda uma única renovação por modelo para o commit.
+    """
+    key = _stamp_key(model)
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        _bump(key)
+        return
+
+    # Modelos já agendados nesta transação. A lista run_on_commit é
+    # trocada a cada commit/rollback, o que descarta o conjunto junto.
+    hooks, pending = getattr(connection, '_stamp_hooks', (None, None))
+    if hooks is not connection.run_on_commit:
+        pending = set()
+        connection._stamp_hooks = (connection.run_on_commit, pending)
+    if key not in pending:
+        pending.add(key)
+        transaction.on_commit(lambda: _bump(key), using=using)
+
+
+def can_store(*parts) -> bool:
+    """
+    Se um valor calculado agora pode ser guardado sob a chave das partes.
+
+    Fora da réplica, sempre. Na réplica, só se nenhum carimbo de modelo
+    das partes foi renovado dentro da janela de atraso da replicação:
+    senão o dado antigo ficaria guardado sob o carimbo novo até a próxima
+    alteração.
+    """
+    if not reads_from_replica():
+        return True
+    settled = time.time_ns() - settings.REPLICA_PIN_SECONDS * 1_000_000_000
+    return all(
+        model_stamp(part) < settled
+        for part in parts
+        if isinstance(part, type) and issubclass(part, models.Model)
+    )
+
+
+def _token(part) -> str:
+    if isinstance(part, models.Model):
+        updated_at = getattr(part, 'updated_at', None)
+        stamp = updated_at.timestamp() if updated_at else ''
+        return f'{part._meta.label_lower}:{part.pk}:{stamp}'
+    if isinstance(part, type) and issubclass(part, models.Model):
+        return f'{part._meta.label_lower}@{model_stamp(part)}'
+    if part is None:
+        return '-'
+    return str(part)
+
+
+def fragment_key(name: str, *parts) -> str:
+    """Chave do fragmento `name` para as partes informadas."""
+    digest = hashlib.md5('|'.join(_token(part) for part in parts).encode()).hexdigest()
+    return f'frag:{settings.FRAGMENT_CACHE_VERSION}:{name}:{digest}'
+
+
+def record_lookup(hit: bool) -> None:
+    """Contabiliza um acerto/erro na requisição atual e no processo."""
+    metrics = current_metrics()
+    if metrics is not None:
+        if hit:
+            metrics.fragment_hits += 1
+        else:
+            metrics.fragment_misses += 1
+    with _totals_lock:
+        _totals['hits' if hit else 'misses'] += 1
+
+
+def process_totals() -> dict:
+    with _totals_lock:
+        return {'hits': _totals['hits'], 'misses': _totals['misses']}
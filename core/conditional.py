@@ -0,0 +1,110 @@
+"""
+GET condicional (ETag / Last-Modified) para listagens e detalhes.
+
+A view declara de quais modelos a página depende; a versão de cada um é
+o carimbo "última alteração" de core.cache_keys, lido do cache sem
+nenhuma query. Se o navegador (ou o polling do HTMX) já tiver a versão
+atual, a resposta é um 304 sem corpo e a view nem chega a rodar.
+
+    def _product_list_versions(request):
+        return [model_version(Product, Category)]
+
+    @conditional_get(_product_list_versions)
+    def product_list(request): ...
+
+O carimbo vale para o modelo inteiro (não para os filtros da página):
+qualquer alteração invalida todas as variações, que se distinguem pela
+URL completa no ETag. save/delete renovam o carimbo no commit; alterações
+em massa (queryset.update, bulk_create/bulk_update) devem chamar
+touch_model().
+
+Páginas com janelas relativas a hoje ("últimos 30 dias") mudam à
+meia-noite mesmo sem alteração nas tabelas: inclua day_version().
+"""
+
+import hashlib
+import time
+from datetime import datetime
+from functools import wraps
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from core.cache_keys import can_store, model_stamp
+
+
+def model_version(*models) -> dict:
+    """
+    Versão dos modelos: o carimbo de última alteração de cada um.
+
+    Lida da réplica logo após uma alteração, a página pode ainda não
+    refleti-la: enquanto o carimbo estiver na janela de atraso (ver
+    can_store), a versão é única por requisição e não gera 304.
+    """
+    version = {model._meta.label_lower: model_stamp(model) for model in models}
+    if not can_store(*models):
+        version['unsettled'] = time.time_ns()
+    return version
+
+
+def day_version() -> dict:
+    """Versão que muda a cada dia (data local)."""
+    return {'day': timezone.localdate()}
+
+
+def _seconds(value) -> float:
+    if isinstance(value, int):
+        # Carimbo de modelo, em nanossegundos
+        return value / 1_000_000_000
+    if isinstance(value, datetime):
+        return value.timestamp()
+    # Data: vale desde a meia-noite local
+    return timezone.make_aware(datetime.combine(value, datetime.min.time())).timestamp()
+
+
+def _validators(request, versions):
+    stamps = [_seconds(value) for version in versions for value in version.values() if value is not None]
+    last_modified = int(max(stamps)) if stamps else None
+    signature = repr((
+        settings.FRAGMENT_CACHE_VERSION,
+        request.get_full_path(),
+        bool(request.headers.get('HX-Request')),
+        versions,
+    ))
+    return quote_etag(hashlib.md5(signature.encode()).hexdigest()), last_modified
+
+
+def conditional_get(versions_func):
+    """
+    Responde 304 a GET/HEAD cuja versão o cliente já tem.
+
+    versions_func(request, *args, **kwargs) retorna a lista de versões
+    (model_version(), day_version()) dos dados exibidos. Outros métodos passam direto.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            etag, last_modified = _validators(request, versions_func(request, *args, **kwargs))
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    response.headers.setdefault('ETag', etag)
+                    if last_modified is not None:
+                        response.headers.setdefault('Last-Modified', http_date(last_modified))
+
+            # Página completa e parcial HTMX têm a mesma URL
+            patch_vary_headers(response, ['HX-Request'])
+            # Sempre revalida: o 304 é a economia, não a idade do cache
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return inner
+
+    return decorator
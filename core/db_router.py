@@ -0,0 +1,146 @@
+"""
+Roteamento de leituras para a réplica (alias 'replica', ver DATABASES).
+
+As leituras só vão para a réplica quando pedidas explicitamente:
+
+    - views de leitura marcadas com @replica_view (dashboard, histórico,
+      detalhe de produto, exportações);
+    - serviços de relatório dentro de `with use_replica():`.
+
+Todo o resto (PDV, checkout, formulários) continua no banco principal,
+assim um relatório pesado não disputa o primário com as vendas.
+
+Read-your-writes: requisições que escrevem (POST etc.) leem do primário, e
+o ReplicaPinMiddleware grava um cookie que mantém o navegador no primário
+por REPLICA_PIN_SECONDS, cobrindo o atraso de replicação. Leituras dentro
+de uma transação aberta no primário também ficam nele.
+
+Sem o alias 'replica' configurado, tudo vai para o primário.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_ALIAS = 'replica'
+PIN_COOKIE = 'db_primary'
+
+_use_replica = ContextVar('use_replica', default=False)
+_pinned = ContextVar('pinned_to_primary', default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in connections.settings
+
+
+@contextmanager
+def use_replica():
+    """Envia as leituras do bloco para a réplica (se houver e não houver pino)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def pin_primary(pinned: bool = True):
+    """Mantém as leituras do bloco no primário (read-your-writes)."""
+    token = _pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def replica_view(view):
+    """Marca uma view (sync ou async) como somente leitura: lê da réplica."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            with use_replica():
+                return await view(request, *args, **kwargs)
+    else:
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            with use_replica():
+                return view(request, *args, **kwargs)
+    return inner
+
+
+def reads_from_replica() -> bool:
+    """Se as leituras do contexto atual vão para a réplica."""
+    return (
+        _use_replica.get()
+        and not _pinned.get()
+        and replica_configured()
+        and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+    )
+
+
+class ReplicaRouter:
+    """Router do DATABASE_ROUTERS: escrita no primário, leitura conforme contexto."""
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return REPLICA_ALIAS if reads_from_replica() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica e primário têm os mesmos dados
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinMiddleware:
+    """
+    Read-your-writes: requisições com escrita e as seguintes, enquanto o
+    cookie de pino valer, leem apenas do primário.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = settings.REPLICA_PIN_SECONDS
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        with pin_primary(self._pinned(request)):
+            response = self.get_response(request)
+        return self._finish(request, response)
+
+    async def __acall__(self, request):
+        with pin_primary(self._pinned(request)):
+            response = await self.get_response(request)
+        return self._finish(request, response)
+
+    @staticmethod
+    def _writes(request) -> bool:
+        return request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def _pinned(self, request) -> bool:
+        return self._writes(request) or PIN_COOKIE in request.COOKIES
+
+    def _finish(self, request, response):
+        if self._writes(request) and response.status_code < 500:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax'
+            )
+        return response
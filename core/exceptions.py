@@ -44,6 +44,18 @@ class InvalidStatusTransitionError(BikeShopException):
         super().__init__(message)
 
 
+class IdempotencyConflictError(BikeShopException):
+    """
+    Lançada quando a chave de idempotência já foi usada por outra
+    requisição cuja venda não pôde ser lida (ainda em andamento ou
+    desfeita). O cliente deve reenviar.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        super().__init__(f"Checkout com a chave '{key}' em andamento; tente novamente")
+
+
 class BusinessRuleViolationError(BikeShopException):
     """Lançada quando uma regra de negócio é violada."""
 
@@ -0,0 +1,85 @@
+"""
+Geração das chaves primárias (ModelBase.id).
+
+UUIDv4 é aleatório: em tabelas que só crescem (StockMovement, Sale,
+SaleItem) cada insert cai numa página qualquer do índice da PK, o que
+fragmenta o B-tree e espalha o cache. UUIDv7 (RFC 9562) começa com o
+timestamp em milissegundos, então ids novos vão sempre para o fim do
+índice, como um autoincremento, mas continuam globalmente únicos.
+
+O tipo da coluna não muda (continua UUID). MODEL_ID_VERSION escolhe o
+gerador de linhas novas: 7 (padrão) ou 4.
+"""
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+
+def uuid7() -> uuid.UUID:
+    """
+    UUID versão 7: 48 bits de timestamp (ms), 12 bits de contador e 62
+    bits aleatórios.
+
+    O contador (rand_a) torna os ids monotônicos dentro do mesmo
+    milissegundo no processo; ao estourar, o timestamp avança 1 ms.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), 'big') & (_COUNTER_MAX >> 1)
+        else:
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                _last_ms += 1
+                _counter = 0
+        timestamp_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    return _pack(timestamp_ms, counter, rand_b)
+
+
+def _pack(timestamp_ms: int, rand_a: int, rand_b: int) -> uuid.UUID:
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | (rand_a & _COUNTER_MAX) << 64
+        | 0b10 << 62
+        | (rand_b & ((1 << 62) - 1))
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_at(moment: datetime, bits: int) -> uuid.UUID:
+    """
+    UUIDv7 de um instante dado, com os 74 bits restantes vindos de `bits`
+    (ex.: de um random.Random com semente, para cargas reproduzíveis).
+    """
+    timestamp_ms = int(moment.timestamp() * 1000)
+    return _pack(timestamp_ms, bits >> 62, bits)
+
+
+def uuid7_timestamp(value: uuid.UUID) -> float:
+    """Instante (epoch, segundos) embutido em um UUIDv7."""
+    return (value.int >> 80) / 1000
+
+
+def new_id() -> uuid.UUID:
+    """Default de ModelBase.id, conforme MODEL_ID_VERSION."""
+    if getattr(settings, 'MODEL_ID_VERSION', 7) == 4:
+        return uuid.uuid4()
+    return uuid7()
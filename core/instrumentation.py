@@ -0,0 +1,124 @@
+"""
+Instrumentação de requisições do Bike Shop ERP.
+
+Coleta, por requisição, a quantidade de queries, o tempo gasto no banco
+e o tempo de renderização de templates, além dos acertos do cache de
+fragmentos (core.cache_keys). As métricas ficam em uma
+ContextVar, preenchida pelo RequestMetricsMiddleware (core.middleware),
+de modo que cada thread/tarefa enxerga apenas a própria requisição.
+"""
+
+import re
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.template.backends.django import DjangoTemplates, Template
+
+
+_current_metrics = ContextVar('request_metrics', default=None)
+
+# Normalização de SQL: listas IN de tamanho variável e espaços extras
+# não devem gerar assinaturas diferentes para a mesma query.
+_IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def sql_signature(sql: str) -> str:
+    """Retorna a assinatura normalizada de uma query (sem parâmetros)."""
+    sql = _WHITESPACE_RE.sub(' ', sql).strip()
+    return _IN_LIST_RE.sub('IN (...)', sql)
+
+
+class RequestMetrics:
+    """
+    Acumulador de métricas de uma requisição.
+
+    Os tempos são guardados em segundos; a conversão para milissegundos
+    acontece apenas na hora de expor (header/log).
+    """
+
+    def __init__(self, capture_sql: bool = False):
+        self.capture_sql = capture_sql
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.view_time = 0.0
+        self.total_time = 0.0
+        self.fragment_hits = 0
+        self.fragment_misses = 0
+        self.signatures = Counter()
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Wrapper para connection.execute_wrapper: conta e cronometra queries."""
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - start
+            self.queries += 1
+            if self.capture_sql:
+                self.signatures[sql_signature(sql)] += 1
+
+    def duplicated_queries(self, limit: int = 5):
+        """Retorna as assinaturas executadas mais de uma vez (suspeitas de N+1)."""
+        return [
+            (signature, count)
+            for signature, count in self.signatures.most_common(limit)
+            if count > 1
+        ]
+
+    def as_dict(self) -> dict:
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'render_ms': round(self.render_time * 1000, 2),
+            'view_ms': round(self.view_time * 1000, 2),
+            'total_ms': round(self.total_time * 1000, 2),
+            'fragment_hits': self.fragment_hits,
+            'fragment_misses': self.fragment_misses,
+        }
+
+
+def current_metrics() -> RequestMetrics | None:
+    """Retorna as métricas da requisição em andamento (ou None)."""
+    return _current_metrics.get()
+
+
+def activate_metrics(metrics: RequestMetrics):
+    """Associa as métricas ao contexto atual. Retorna o token para reset."""
+    return _current_metrics.set(metrics)
+
+
+def deactivate_metrics(token) -> None:
+    _current_metrics.reset(token)
+
+
+class InstrumentedTemplate(Template):
+    """Template que soma seu tempo de renderização às métricas da requisição."""
+
+    def render(self, context=None, request=None):
+        metrics = current_metrics()
+        if metrics is None:
+            return super().render(context, request)
+
+        start = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.render_time += perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    Backend DjangoTemplates que devolve InstrumentedTemplate.
+
+    Observação: querysets avaliados de forma preguiçosa dentro do template
+    contam tanto no tempo de renderização quanto no tempo de banco.
+    """
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return InstrumentedTemplate(super().get_template(template_name).template, self)
@@ -0,0 +1,45 @@
+"""
+Registro de tarefas em segundo plano.
+
+Cada app declara suas tarefas em `<app>/jobs.py` com o decorator `task`:
+
+    @task('stock.refresh_replenishment')
+    def refresh_replenishment(job, full=False):
+        job.progress(50, 'Calculando giro')
+        ...
+        return {'updated': 10}
+
+A função recebe um JobContext (para reportar progresso) e o payload da
+tarefa como argumentos nomeados. O retorno, se houver, precisa ser
+serializável em JSON: ele é gravado em Job.result.
+"""
+
+from django.utils.module_loading import autodiscover_modules
+
+
+_registry = {}
+
+
+def task(name: str):
+    """Registra a função como tarefa executável pelo worker."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def autodiscover() -> None:
+    """Importa `jobs.py` de todos os apps instalados."""
+    autodiscover_modules('jobs')
+
+
+def get_task(name: str):
+    """
+    Retorna a função registrada para a tarefa.
+
+    Raises:
+        KeyError: Se a tarefa não estiver registrada
+    """
+    if name not in _registry:
+        autodiscover()
+    return _registry[name]
@@ -0,0 +1,36 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import ClientSearchBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a latência da busca de clientes (CPF/CNPJ, telefone, e-mail e '
+        'nome) sobre a base atual. Popule antes com populate_db --clients N.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=200, help='Clientes buscados por tipo')
+        parser.add_argument('--json', action='store_true', help='Imprime o relatório completo em JSON')
+
+    def handle(self, *args, **options):
+        if options['samples'] < 1:
+            raise CommandError('--samples deve ser maior que zero.')
+
+        report = ClientSearchBenchmark(samples=options['samples']).run()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        config = report['config']
+        self.stdout.write(f'{config["database"]} | {config["clients"]} clientes | {config["samples"]} amostras')
+        self.stdout.write(f'{"busca":<10} {"n":>6} {"sem acerto":>10} {"média ms":>9} {"p50 ms":>9} {"p95 ms":>9}')
+        for kind in ClientSearchBenchmark.KINDS:
+            data = report['kinds'][kind]
+            self.stdout.write(
+                f'{kind:<10} {data["queries"]:>6} {data["misses"]:>10} '
+                f'{data["mean_ms"]!s:>9} {data["p50_ms"]!s:>9} {data["p95_ms"]!s:>9}'
+            )
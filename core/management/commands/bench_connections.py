@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import PROFILES, ConnectionBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o custo de conexão com o banco por requisição: uma conexão nova '
+        'a cada requisição x o perfil configurado (persistente ou pool).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requisições por perfil')
+        parser.add_argument('--url', help='URL medida (padrão: autocomplete de produtos)')
+        parser.add_argument('--database', default='default', help='Alias do banco')
+        parser.add_argument('--json', action='store_true', help='Imprime o relatório completo em JSON')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests deve ser maior que zero.')
+
+        bench = ConnectionBenchmark(
+            requests=options['requests'], url=options['url'], alias=options['database']
+        )
+        report = bench.run()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        config = report['config']
+        self.stdout.write(
+            f'{config["database"]} | CONN_MAX_AGE={config["conn_max_age"]} '
+            f'health_checks={config["health_checks"]} pool={config["pool"]} | {config["url"]}'
+        )
+        self.stdout.write(f'Handshake de uma conexão nova: {report["handshake_ms"]} ms')
+        self.stdout.write(f'{"perfil":<18} {"n":>6} {"conexões":>9} {"média ms":>9} {"p50 ms":>9} {"p95 ms":>9}')
+        for name in PROFILES:
+            data = report['profiles'][name]
+            self.stdout.write(
+                f'{name:<18} {data["requests"]:>6} {data["connections_opened"]:>9} '
+                f'{data["mean_ms"]:>9} {data["p50_ms"]:>9} {data["p95_ms"]:>9}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Economia por requisição: {report["overhead_saved_ms_per_request"]} ms'
+        ))
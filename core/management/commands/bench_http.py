@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import HttpLoadBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Teste de carga HTTP num servidor em execução (ex.: gunicorn -c '
+        'python:bikeshop.gunicorn_conf). Compare combinações de WEB_WORKERS '
+        'e WEB_THREADS com a mesma carga.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Endereço do servidor')
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Caminho requisitado (repetível; padrão: /healthz e autocomplete)',
+        )
+        parser.add_argument('--concurrency', type=int, default=16, help='Conexões simultâneas')
+        parser.add_argument('--duration', type=float, default=20.0, help='Segundos de medição')
+        parser.add_argument('--json', action='store_true', help='Imprime o relatório completo em JSON')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['duration'] <= 0:
+            raise CommandError('--concurrency e --duration devem ser maiores que zero.')
+
+        report = HttpLoadBenchmark(
+            base_url=options['url'],
+            paths=options['paths'],
+            concurrency=options['concurrency'],
+            duration=options['duration'],
+        ).run()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        config = report['config']
+        self.stdout.write(
+            f'{config["base_url"]} | {config["concurrency"]} conexões | {config["duration_s"]}s'
+        )
+        self.stdout.write(
+            f'{report["requests"]} requisições ({report["errors"]} erros) | '
+            f'{report["requests_per_s"]} req/s | p50 {report["p50_ms"]} ms | '
+            f'p95 {report["p95_ms"]} ms | p99 {report["p99_ms"]} ms'
+        )
@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import ID_GENERATORS, IdInsertBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara inserts em massa com chave UUIDv4 (aleatória) x UUIDv7 '
+        '(ordenada por tempo) numa tabela de rascunho no formato de StockMovement.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2_000_000, help='Linhas por gerador')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Linhas por transação')
+        parser.add_argument('--database', default='default', help='Alias do banco')
+        parser.add_argument('--json', action='store_true', help='Imprime o relatório completo em JSON')
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--rows e --batch-size devem ser maiores que zero.')
+
+        bench = IdInsertBenchmark(
+            rows=options['rows'], batch_size=options['batch_size'], alias=options['database']
+        )
+        self.stdout.write(f'Inserindo {bench.rows} linhas por gerador ({bench.connection.vendor})...')
+        report = bench.run()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f'{"gerador":<8} {"linhas":>10} {"segundos":>9} {"linhas/s":>10} {"final/s":>10} {"índice":>12}')
+        for kind in ID_GENERATORS:
+            data = report['generators'][kind]
+            index = data['index_bytes'] if data['index_bytes'] is not None else '-'
+            self.stdout.write(
+                f'{kind:<8} {data["rows"]:>10} {data["elapsed_s"]:>9} '
+                f'{data["rows_per_s"]:>10} {data["tail_rows_per_s"]:>10} {index:>12}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'UUIDv7 / UUIDv4 (linhas/s): {report["speedup"]}x'))
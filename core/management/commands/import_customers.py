@@ -0,0 +1,64 @@
+from contextlib import nullcontext
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.services import ClientImportService
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa clientes de um CSV (sistema legado), em fluxo e em lotes. '
+        'Normaliza documento, telefone e e-mail, mescla duplicatas do arquivo '
+        'e do cadastro (por CPF/CNPJ, depois e-mail) e grava com bulk_create. '
+        'Colunas reconhecidas: nome, email, telefone/celular, cpf/cnpj/documento.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Arquivo CSV (separado por vírgula, ponto e vírgula ou tab)')
+        parser.add_argument('--encoding', default='utf-8-sig', help='Codificação do arquivo (padrão: utf-8-sig)')
+        parser.add_argument('--delimiter', default=None, help='Separador (padrão: deduzido do cabeçalho)')
+        parser.add_argument(
+            '--batch-size', type=int, default=ClientImportService.BATCH_SIZE,
+            help='Linhas por lote (limita a memória usada)',
+        )
+        parser.add_argument('--report', default=None, help='Grava o relatório de mesclagem neste CSV')
+        parser.add_argument('--dry-run', action='store_true', help='Processa tudo e desfaz no final')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size deve ser maior que zero.')
+
+        report_stream = None
+        if options['report']:
+            report_stream = open(options['report'], 'w', encoding='utf-8', newline='')
+
+        start = perf_counter()
+        try:
+            with open(options['path'], encoding=options['encoding'], newline='') as stream:
+                # Sem simulação, cada lote é confirmado na sua própria transação
+                with transaction.atomic() if options['dry_run'] else nullcontext():
+                    result = ClientImportService.import_csv(
+                        stream,
+                        delimiter=options['delimiter'],
+                        batch_size=options['batch_size'],
+                        report_stream=report_stream,
+                    )
+                    if options['dry_run']:
+                        transaction.set_rollback(True)
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            if report_stream is not None:
+                report_stream.close()
+
+        for line, message in result['issues']:
+            self.stdout.write(self.style.WARNING(f'Linha {line}: {message}'))
+        prefix = '[simulação] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}{result["rows"]} linhas em {perf_counter() - start:.2f}s: '
+            f'{result["created"]} criados, {result["updated"]} atualizados, '
+            f'{result["merged"]} duplicatas mescladas ({result["conflicts"]} com conflito), '
+            f'{result["skipped"]} ignoradas'
+        ))
@@ -1,9 +1,37 @@
-from django.core.management.base import BaseCommand
+from datetime import timedelta
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
 from catalog.models import Category, Product
+from django.utils import timezone
+
+from core.synthetic import SKU_PREFIX, SyntheticDataGenerator
 from stock.models import Warehouse
+from stock.services import MovementPartitionService
 
 class Command(BaseCommand):
-    help = 'Popula o banco de dados com dados iniciais para teste'
+    help = (
+        'Popula o banco de dados com dados iniciais para teste. '
+        'Com --products/--warehouses/--sales/--movements gera também uma '
+        'massa sintética em larga escala (ex.: --products 200000 '
+        '--warehouses 20 --sales 2000000 --movements 10000000).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=0, help='Produtos sintéticos')
+        parser.add_argument('--warehouses', type=int, default=0, help='Depósitos sintéticos')
+        parser.add_argument(
+            '--clients', type=int, default=None,
+            help='Clientes sintéticos (padrão: 1 para cada 20 vendas, mínimo 100)'
+        )
+        parser.add_argument('--sales', type=int, default=0, help='Vendas sintéticas')
+        parser.add_argument(
+            '--movements', type=int, default=0,
+            help='Movimentações além das geradas pelas vendas (compras e saídas manuais)'
+        )
+        parser.add_argument('--days', type=int, default=730, help='Janela de tempo em dias (padrão: 730)')
+        parser.add_argument('--seed', type=int, default=42, help='Semente para resultados reproduzíveis')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Linhas por INSERT')
 
     def handle(self, *args, **options):
         self.stdout.write('Iniciando populagem de dados...')
@@ -45,4 +73,59 @@ class Command(BaseCommand):
             
         self.stdout.write(self.style.SUCCESS(f'Serviço criado: {revisao} (É serviço? {revisao.is_service})'))
 
-        self.stdout.write(self.style.SUCCESS('--- Concluído com Sucesso ---'))
\ No newline at end of file
+        self.generate_synthetic(options)
+
+        self.stdout.write(self.style.SUCCESS('--- Concluído com Sucesso ---'))
+
+    def generate_synthetic(self, options):
+        """Gera a massa sintética em larga escala, se solicitada."""
+        products = options['products']
+        warehouses = options['warehouses']
+        sales = options['sales']
+        movements = options['movements']
+        clients = options['clients']
+        if clients is None:
+            clients = max(100, sales // 20) if sales else 0
+
+        if not any([products, warehouses, clients, sales, movements]):
+            return
+
+        if (sales or movements) and not (products and warehouses):
+            raise CommandError('--sales/--movements exigem --products e --warehouses.')
+        if sales and not clients:
+            raise CommandError('--sales exige ao menos um cliente (--clients).')
+        if products and Product.objects.filter(sku__startswith=SKU_PREFIX).exists():
+            raise CommandError(
+                f'Já existem produtos sintéticos ({SKU_PREFIX}*). '
+                'Use um banco limpo para gerar uma nova massa.'
+            )
+
+        self.stdout.write(
+            f'Gerando massa sintética (seed={options["seed"]}): {products} produtos, '
+            f'{warehouses} depósitos, {clients} clientes, {sales} vendas, '
+            f'{movements} movimentações...'
+        )
+        start = perf_counter()
+        generator = SyntheticDataGenerator(
+            products=products,
+            warehouses=warehouses,
+            clients=clients,
+            sales=sales,
+            movements=movements,
+            days=options['days'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        # As movimentações retroagem `days` dias (o saldo de abertura, um a
+        # mais): cria as partições mensais antes da carga, para as linhas
+        # não caírem todas na partição DEFAULT (PostgreSQL)
+        partitions = MovementPartitionService.ensure_partitions(
+            since=timezone.localdate(generator.start) - timedelta(days=1)
+        )
+        if partitions:
+            self.stdout.write(f'{len(partitions)} partições de movimentações criadas')
+        generator.run()
+        self.stdout.write(self.style.SUCCESS(
+            f'Massa sintética gerada em {perf_counter() - start:.1f}s'
+        ))
\ No newline at end of file
@@ -0,0 +1,20 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from core.services import ClientSummaryService
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula o resumo de compras (LTV, recência, visitas) de todos os '
+        'clientes a partir das vendas. As vendas do PDV já atualizam o resumo; '
+        'use após cargas em lote ou correções diretas no banco.'
+    )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        count = ClientSummaryService.refresh()
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} resumos recalculados em {perf_counter() - start:.2f}s'
+        ))
@@ -0,0 +1,204 @@
+import logging
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from time import monotonic, sleep
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+
+from core.jobs import autodiscover
+from core.models import Job
+from core.services import JobService
+
+
+logger = logging.getLogger('bikeshop.jobs')
+
+# Intervalo entre as varreduras de tarefas travadas (worker que morreu)
+STALE_CHECK_INTERVAL = 60
+
+
+class Heartbeat(threading.Thread):
+    """
+    Renova o updated_at das tarefas em execução do worker a cada
+    `interval` segundos, para que tarefas longas (que não chamam
+    progress()) não sejam tomadas como travadas e executadas duas vezes.
+    """
+
+    def __init__(self, worker_id: str, interval: float):
+        super().__init__(name='job-heartbeat', daemon=True)
+        self.worker_id = worker_id
+        self.interval = interval
+        self._active = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def add(self, job_id) -> None:
+        with self._lock:
+            self._active.add(job_id)
+
+    def discard(self, job_id) -> None:
+        with self._lock:
+            self._active.discard(job_id)
+
+    def beat(self) -> None:
+        with self._lock:
+            job_ids = list(self._active)
+        if job_ids:
+            JobService.heartbeat(self.worker_id, job_ids)
+
+    def run(self):
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    self.beat()
+                except DatabaseError:
+                    logger.exception('Falha ao renovar o sinal de vida das tarefas')
+                    connections.close_all()
+        finally:
+            # Conexão própria desta thread
+            connections.close_all()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+def _init_process():
+    """Inicializa o processo filho do pool (necessário com start method 'spawn')."""
+    django.setup()
+    autodiscover()
+
+
+def _run_job(job_id):
+    job = Job.objects.get(pk=job_id)
+    JobService.run(job)
+    return job.status
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa tarefas em segundo plano da fila no banco (tabela core_job), '
+        'usando SELECT ... FOR UPDATE SKIP LOCKED e um pool de processos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.JOB_WORKER_PROCESSES,
+            help='Processos no pool (0 executa as tarefas no próprio processo do worker)'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Segundos de espera quando a fila está vazia'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Processa as tarefas prontas e encerra (útil para cron e testes)'
+        )
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        if processes < 0:
+            raise CommandError('--processes deve ser >= 0')
+
+        autodiscover()
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+        if not options['once']:
+            signal.signal(signal.SIGTERM, self._stop)
+            signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(f'Worker {self.worker_id} iniciado ({processes or "sem"} processos)')
+        # Bem abaixo do limite de requeue_stale(), mesmo com atrasos
+        self.heartbeat = Heartbeat(self.worker_id, max(1, settings.JOB_STALE_TIMEOUT_SECONDS // 4))
+        self.heartbeat.start()
+        try:
+            if processes:
+                processed = self._run_pool(processes, options['poll_interval'], options['once'])
+            else:
+                processed = self._run_inline(options['poll_interval'], options['once'])
+        finally:
+            self.heartbeat.stop()
+        self.stdout.write(self.style.SUCCESS(f'Worker encerrado: {processed} tarefas executadas'))
+
+    def _stop(self, signum, frame):
+        # Termina as tarefas em andamento e não reserva novas
+        self.stopping = True
+
+    def _check_stale(self):
+        now = monotonic()
+        if now - getattr(self, '_last_stale_check', 0) >= STALE_CHECK_INTERVAL:
+            self._last_stale_check = now
+            requeued = JobService.requeue_stale()
+            if requeued:
+                logger.warning('%s tarefas travadas devolvidas à fila', requeued)
+
+    def _claim(self, limit):
+        """
+        Reserva tarefas. Retorna None em erro transitório de banco (conexão
+        caiu, lock), para o laço tentar de novo em vez de derrubar o worker.
+        """
+        try:
+            return JobService.claim(self.worker_id, limit=limit)
+        except DatabaseError:
+            logger.exception('Falha ao reservar tarefas; nova tentativa no próximo ciclo')
+            connections.close_all()
+            return None
+
+    def _run_inline(self, poll_interval, once):
+        processed = 0
+        while not self.stopping:
+            self._check_stale()
+            jobs = self._claim(1)
+            for job in jobs or []:
+                self.heartbeat.add(job.pk)
+                try:
+                    JobService.run(job)
+                finally:
+                    self.heartbeat.discard(job.pk)
+                processed += 1
+                logger.info('Tarefa %s (%s): %s', job.pk, job.name, job.status)
+            if not jobs:
+                if once and jobs is not None:
+                    break
+                sleep(poll_interval)
+        return processed
+
+    def _run_pool(self, processes, poll_interval, once):
+        processed = 0
+        running = {}
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_process) as executor:
+            while running or not self.stopping:
+                self._check_stale()
+                jobs = []
+                if not self.stopping:
+                    jobs = self._claim(processes - len(running))
+                    # Filhos criados por fork não podem herdar a conexão do pai
+                    connections.close_all()
+                for job in jobs or []:
+                    self.heartbeat.add(job.pk)
+                    running[executor.submit(_run_job, job.pk)] = job
+
+                if not running:
+                    if once and jobs is not None:
+                        break
+                    sleep(poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    self.heartbeat.discard(job.pk)
+                    processed += 1
+                    try:
+                        logger.info('Tarefa %s (%s): %s', job.pk, job.name, future.result())
+                    except Exception:
+                        # O processo filho morreu; requeue_stale() recupera a tarefa
+                        logger.exception('Tarefa %s (%s) interrompida', job.pk, job.name)
+                if once and jobs == [] and not running:
+                    break
+        return processed
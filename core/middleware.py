@@ -0,0 +1,130 @@
+"""
+Middlewares do Bike Shop ERP.
+"""
+
+import json
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from core.instrumentation import (
+    RequestMetrics,
+    activate_metrics,
+    deactivate_metrics,
+)
+
+
+logger = logging.getLogger('bikeshop.requests')
+
+
+class RequestMetricsMiddleware:
+    """
+    Mede cada requisição: queries, tempo de banco, renderização e view.
+
+    - Expõe os tempos no header Server-Timing (visível no DevTools).
+    - Registra uma linha de log estruturada (JSON) em 'bikeshop.requests'.
+    - Se SLOW_REQUEST_THRESHOLD_MS > 0, requisições acima do limite geram
+      um aviso com as queries repetidas (assinaturas de N+1).
+
+    Só atua com REQUEST_METRICS_ENABLED (padrão: DEBUG).
+
+    Funciona nos dois modos (WSGI e ASGI), para que as views async não
+    sejam adaptadas para síncronas só por causa deste middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_METRICS_ENABLED', settings.DEBUG)
+        self.slow_threshold_ms = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 0)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics, token, start = self._begin(request)
+        try:
+            with self._wrap_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            deactivate_metrics(token)
+        return self._finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        metrics, token, start = self._begin(request)
+        # As conexões são por thread e o ORM async executa as queries na
+        # thread "thread-sensitive" da requisição: os wrappers vão nela.
+        stack = await sync_to_async(self._wrap_connections)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            deactivate_metrics(token)
+        return self._finish(request, response, metrics, start)
+
+    def _begin(self, request):
+        metrics = RequestMetrics(capture_sql=self.slow_threshold_ms > 0)
+        request.metrics = metrics
+        return metrics, activate_metrics(metrics), perf_counter()
+
+    @staticmethod
+    def _wrap_connections(metrics: RequestMetrics) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics.execute_wrapper))
+        return stack
+
+    def _finish(self, request, response, metrics: RequestMetrics, start: float):
+        end = perf_counter()
+        metrics.total_time = end - start
+        view_start = getattr(request, '_metrics_view_start', None)
+        if view_start is not None:
+            metrics.view_time = end - view_start
+
+        response['Server-Timing'] = self._server_timing(metrics)
+        self._log(request, response, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view_start = perf_counter()
+
+    @staticmethod
+    def _server_timing(metrics: RequestMetrics) -> str:
+        data = metrics.as_dict()
+        return ', '.join([
+            f'db;dur={data["db_ms"]};desc="{data["queries"]} queries"',
+            f'render;dur={data["render_ms"]}',
+            f'cache;desc="fragmentos {data["fragment_hits"]}/{data["fragment_hits"] + data["fragment_misses"]}"',
+            f'view;dur={data["view_ms"]}',
+            f'total;dur={data["total_ms"]}',
+        ])
+
+    def _log(self, request, response, metrics: RequestMetrics) -> None:
+        payload = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **metrics.as_dict(),
+        }
+        logger.info(json.dumps(payload))
+
+        if self.slow_threshold_ms and payload['total_ms'] >= self.slow_threshold_ms:
+            payload['duplicated_queries'] = [
+                {'sql': signature, 'count': count}
+                for signature, count in metrics.duplicated_queries()
+            ]
+            logger.warning(json.dumps(payload))
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:05
+
+import django.core.serializers.json
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('name', models.CharField(max_length=100, verbose_name='Tarefa')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Parâmetros')),
+                ('status', models.CharField(choices=[('PENDING', 'Pendente'), ('RUNNING', 'Em execução'), ('SUCCEEDED', 'Concluída'), ('FAILED', 'Falhou')], default='PENDING', max_length=20, verbose_name='Status')),
+                ('run_at', models.DateTimeField(verbose_name='Executar a partir de')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('max_attempts', models.PositiveIntegerField(default=3, verbose_name='Máximo de tentativas')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='Progresso (%)')),
+                ('progress_message', models.CharField(blank=True, max_length=200, verbose_name='Etapa')),
+                ('result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Resultado')),
+                ('error', models.TextField(blank=True, verbose_name='Erro')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizada em')),
+            ],
+            options={
+                'verbose_name': 'Tarefa',
+                'verbose_name_plural': 'Tarefas',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_at'], name='job_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:40
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_client_client_name_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='client',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='supplier',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:50
+
+from django.db import migrations, models
+
+from core.normalize import digits, email_key, text_key
+
+
+def fill_keys(apps, schema_editor):
+    Client = apps.get_model('core', 'Client')
+    batch = []
+    for client in Client.objects.iterator(chunk_size=2000):
+        client.document_key = digits(client.document)
+        client.phone_key = digits(client.phone)
+        client.email_key = email_key(client.email)
+        client.name_key = text_key(client.name)
+        batch.append(client)
+        if len(batch) >= 2000:
+            Client.objects.bulk_update(batch, ['document_key', 'phone_key', 'email_key', 'name_key'])
+            batch = []
+    Client.objects.bulk_update(batch, ['document_key', 'phone_key', 'email_key', 'name_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_alter_client_id_alter_job_id_alter_supplier_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='active',
+            field=models.BooleanField(default=True, verbose_name='Ativo'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='document_key',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='email_key',
+            field=models.CharField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='name_key',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='phone_key',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='name',
+            field=models.CharField(max_length=255, verbose_name='Nome Completo'),
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['document_key'], name='client_document_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['phone_key'], name='client_phone_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['email_key'], name='client_email_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
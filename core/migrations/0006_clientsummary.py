@@ -0,0 +1,71 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:20
+
+from decimal import Decimal
+
+import core.ids
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def fill_summaries(apps, schema_editor):
+    """Um resumo por cliente, calculado das vendas concluídas."""
+    Client = apps.get_model('core', 'Client')
+    ClientSummary = apps.get_model('core', 'ClientSummary')
+    Sale = apps.get_model('sales', 'Sale')
+
+    totals = {
+        row['client_id']: row
+        for row in Sale.objects.filter(status='COMPLETED').order_by().values('client_id').annotate(
+            purchase_count=Count('pk'),
+            total_spent=Sum('total_amount'),
+            first_purchase_at=Min('created_at'),
+            last_purchase_at=Max('created_at'),
+        )
+    }
+    batch = []
+    for client_id in Client.objects.values_list('pk', flat=True).iterator():
+        row = totals.get(client_id, {})
+        batch.append(ClientSummary(
+            client_id=client_id,
+            purchase_count=row.get('purchase_count', 0),
+            total_spent=row.get('total_spent') or Decimal('0.00'),
+            first_purchase_at=row.get('first_purchase_at'),
+            last_purchase_at=row.get('last_purchase_at'),
+        ))
+        if len(batch) >= 2000:
+            ClientSummary.objects.bulk_create(batch)
+            batch = []
+    ClientSummary.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_client_search_keys'),
+        # Os clientes vindos de customers.Customer também recebem resumo
+        ('customers', '0003_merge_customer_into_client'),
+        ('sales', '0003_alter_sale_id_alter_saleitem_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientSummary',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('purchase_count', models.PositiveIntegerField(default=0, verbose_name='Compras')),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Gasto')),
+                ('first_purchase_at', models.DateTimeField(blank=True, null=True, verbose_name='Primeira Compra')),
+                ('last_purchase_at', models.DateTimeField(blank=True, null=True, verbose_name='Última Compra')),
+                ('client', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='core.client', verbose_name='Cliente')),
+            ],
+            options={
+                'verbose_name': 'Resumo do Cliente',
+                'verbose_name_plural': 'Resumos dos Clientes',
+                'indexes': [models.Index(fields=['-total_spent'], name='client_summary_ltv_idx'), models.Index(fields=['-last_purchase_at'], name='client_summary_recency_idx'), models.Index(fields=['-purchase_count'], name='client_summary_visits_idx')],
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
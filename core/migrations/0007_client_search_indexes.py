@@ -0,0 +1,57 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:45
+#
+# Busca de clientes:
+#   - documento e telefone voltam ao btree comum: a busca por prefixo de
+#     dígitos usa faixa (>=, <), que o operador pattern_ops não atende;
+#   - índice trigram (pg_trgm, GIN) na chave de nome sem acento do cliente:
+# atende LIKE '%trecho%' e similarity() da busca de clientes. Só no
+# PostgreSQL; a extensão exige permissão de criação no banco (ou ser
+# criada antes pelo DBA). Fora do Meta.indexes porque GIN não existe nos
+# demais bancos.
+
+from django.db import migrations, models
+
+
+INDEX = 'client_name_key_trgm_idx'
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX} ON core_client USING gin (name_key gin_trgm_ops)'
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_clientsummary'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='client',
+            name='client_document_key_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='client',
+            name='client_phone_key_idx',
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['document_key'], name='client_document_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['phone_key'], name='client_phone_key_idx'),
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0.2 on 2026-10-19 20:40
+
+from django.db import migrations, models
+
+
+def create_recency_index(apps, schema_editor):
+    # No PostgreSQL, DESC ordena NULL primeiro: o índice declara NULLS LAST,
+    # como o ORDER BY da lista. No SQLite NULL já é o menor valor (e o
+    # índice não aceita NULLS LAST).
+    nulls = ' NULLS LAST' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        'CREATE INDEX client_summary_recency_idx ON core_clientsummary '
+        f'(last_purchase_at DESC{nulls}, client_id)'
+    )
+
+
+def drop_recency_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX client_summary_recency_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_client_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='clientsummary',
+            name='client_summary_ltv_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='clientsummary',
+            name='client_summary_recency_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='clientsummary',
+            name='client_summary_visits_idx',
+        ),
+        migrations.AddIndex(
+            model_name='clientsummary',
+            index=models.Index(fields=['-total_spent', 'client'], name='client_summary_ltv_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientsummary',
+            index=models.Index(fields=['-purchase_count', 'client'], name='client_summary_visits_idx'),
+        ),
+        migrations.RunPython(create_recency_index, drop_recency_index),
+    ]
@@ -1,14 +1,17 @@
-import uuid
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
+from core.ids import new_id
+from core.normalize import digits, email_key, text_key
+
 class ModelBase(models.Model):
     """
     Classe base abstrata para todos os modelos do sistema.
-    Adiciona ID (UUID) e timestamps automáticos.
+    Adiciona ID (UUID ordenado por tempo, ver core.ids) e timestamps automáticos.
     """
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=new_id,
         editable=False
     )
     created_at = models.DateTimeField(
@@ -25,7 +28,14 @@ class ModelBase(models.Model):
         ordering = ['-created_at']
 
 class Client(ModelBase):
-    name = models.CharField(max_length=150, verbose_name="Nome Completo")
+    """
+    Cadastro único de clientes (PDV, vendas e telas de clientes).
+
+    As chaves *_key guardam a forma normalizada de documento, telefone,
+    e-mail e nome (core.normalize) e são recalculadas no save(); as buscas
+    do ClientService comparam direto nessas colunas indexadas.
+    """
+    name = models.CharField(max_length=255, verbose_name="Nome Completo")
     email = models.EmailField(
         unique=True, 
         null=True, 
@@ -43,15 +53,100 @@ class Client(ModelBase):
         verbose_name="CPF/CNPJ",
         help_text="Apenas números"
     )
+    active = models.BooleanField(default=True, verbose_name="Ativo")
+
+    # Chaves normalizadas de busca (preenchidas no save)
+    document_key = models.CharField(max_length=20, blank=True, editable=False)
+    phone_key = models.CharField(max_length=20, blank=True, editable=False)
+    email_key = models.CharField(max_length=254, blank=True, editable=False)
+    name_key = models.CharField(max_length=255, blank=True, editable=False)
+
+    KEY_FIELDS = ('document_key', 'phone_key', 'email_key', 'name_key')
 
     class Meta:
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name'], name='client_name_idx'),
+            # Só dígitos: prefixo vira faixa (>=, <) no btree comum
+            models.Index(fields=['document_key'], name='client_document_key_idx'),
+            models.Index(fields=['phone_key'], name='client_phone_key_idx'),
+            models.Index(fields=['email_key'], name='client_email_key_idx',
+                         opclasses=['varchar_pattern_ops']),
+        ]
 
     def __str__(self):
         return self.name
 
+    def refresh_keys(self) -> None:
+        """Recalcula as chaves normalizadas (use antes de bulk_create)."""
+        self.document_key = digits(self.document)
+        self.phone_key = digits(self.phone)
+        self.email_key = email_key(self.email)
+        self.name_key = text_key(self.name)
+
+    def save(self, *args, **kwargs):
+        if not self.email:
+            # E-mail vazio vira NULL para não colidir no índice único
+            self.email = None
+        self.refresh_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'email', *self.KEY_FIELDS}
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            # Todo cliente tem um resumo; a lista ordena por ele sem LEFT JOIN
+            ClientSummary.objects.get_or_create(client=self)
+
+
+class ClientSummary(ModelBase):
+    """
+    Resumo de compras por cliente (histórico e valor do cliente, LTV).
+
+    Atualizado de forma incremental pelo ClientSummaryService a cada venda
+    concluída ou cancelada, para que a lista de clientes ordene por valor
+    ou recência lendo os índices desta tabela, sem agregar Sale.
+    """
+    client = models.OneToOneField(
+        Client,
+        on_delete=models.CASCADE,
+        related_name='summary',
+        verbose_name="Cliente"
+    )
+    purchase_count = models.PositiveIntegerField(default=0, verbose_name="Compras")
+    total_spent = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Total Gasto"
+    )
+    first_purchase_at = models.DateTimeField(null=True, blank=True, verbose_name="Primeira Compra")
+    last_purchase_at = models.DateTimeField(null=True, blank=True, verbose_name="Última Compra")
+
+    class Meta:
+        verbose_name = "Resumo do Cliente"
+        verbose_name_plural = "Resumos dos Clientes"
+        # Mesma ordem do ORDER BY da lista de clientes (customers.views._sort):
+        # coluna DESC e client_id como desempate; a ordem crescente percorre
+        # o índice de trás para frente. client_summary_recency_idx
+        # (last_purchase_at DESC NULLS LAST, client_id) é criado pela
+        # migração 0008: o SQLite não aceita NULLS LAST em índice.
+        indexes = [
+            models.Index(fields=['-total_spent', 'client'], name='client_summary_ltv_idx'),
+            models.Index(fields=['-purchase_count', 'client'], name='client_summary_visits_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.client}: {self.purchase_count} compras, R$ {self.total_spent}"
+
+    @property
+    def average_ticket(self):
+        if not self.purchase_count:
+            return 0
+        return self.total_spent / self.purchase_count
+
 class Supplier(ModelBase):
     name = models.CharField(max_length=150, verbose_name="Razão Social/Nome")
     email = models.EmailField(
@@ -71,4 +166,58 @@ class Supplier(ModelBase):
         ordering = ['name']
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+class Job(ModelBase):
+    """
+    Tarefa em segundo plano executada pelo `manage.py run_worker`.
+
+    A própria tabela é a fila: o worker reserva linhas pendentes com
+    SELECT ... FOR UPDATE SKIP LOCKED, então vários workers podem rodar
+    em paralelo sem broker externo.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pendente'
+        RUNNING = 'RUNNING', 'Em execução'
+        SUCCEEDED = 'SUCCEEDED', 'Concluída'
+        FAILED = 'FAILED', 'Falhou'
+
+    name = models.CharField(max_length=100, verbose_name="Tarefa")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Parâmetros")
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Status"
+    )
+    run_at = models.DateTimeField(verbose_name="Executar a partir de")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentativas")
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name="Máximo de tentativas")
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name="Progresso (%)")
+    progress_message = models.CharField(max_length=200, blank=True, verbose_name="Etapa")
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        verbose_name="Resultado"
+    )
+    error = models.TextField(blank=True, verbose_name="Erro")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Iniciada em")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finalizada em")
+
+    class Meta:
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED)
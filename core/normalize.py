@@ -0,0 +1,31 @@
+"""
+Chaves normalizadas de busca (cadastro de clientes).
+
+Os campos digitados (CPF/CNPJ, telefone, e-mail, nome) chegam com
+máscara, acento e caixa variados. As chaves guardam a forma canônica em
+colunas indexadas, para que a busca seja uma comparação direta no índice
+em vez de uma varredura com funções sobre a coluna original.
+"""
+
+import re
+import unicodedata
+
+
+_NON_DIGITS = re.compile(r'\D+')
+_SPACES = re.compile(r'\s+')
+
+
+def digits(value: str | None) -> str:
+    """Somente os dígitos: '123.456.789-00' -> '12345678900'."""
+    return _NON_DIGITS.sub('', value or '')
+
+
+def text_key(value: str | None) -> str:
+    """Sem acentos, minúsculo e com espaços simples: ' João  Silva' -> 'joao silva'."""
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    plain = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _SPACES.sub(' ', plain).strip().casefold()
+
+
+def email_key(value: str | None) -> str:
+    return (value or '').strip().casefold()
@@ -0,0 +1,6 @@
+from .client_import_service import ClientImportService
+from .client_service import ClientService
+from .client_summary_service import ClientSummaryService
+from .job_service import JobContext, JobService
+
+__all__ = ["ClientImportService", "ClientService", "ClientSummaryService", "JobContext", "JobService"]
@@ -0,0 +1,302 @@
+"""
+ClientImportService - Carga em lote de clientes a partir de CSV (sistema legado).
+
+O arquivo é lido em fluxo, em lotes de BATCH_SIZE linhas; a memória
+depende do tamanho do lote, não do arquivo. Para cada lote:
+
+    1. normaliza documento, telefone e e-mail (core.normalize);
+    2. carrega, numa consulta pelos índices de chave, os clientes já
+       cadastrados com os mesmos documentos ou e-mails;
+    3. deduplica com um dicionário chave -> cliente: documento primeiro,
+       depois e-mail (telefone não identifica: é comum na mesma família);
+    4. grava com bulk_create (novos) e bulk_update (existentes), numa
+       transação por lote.
+
+Como cada lote é gravado antes do próximo, uma linha repetida mais
+adiante no arquivo é encontrada no passo 2, como qualquer cadastro.
+
+Duplicatas são mescladas: o cadastro existente só recebe os campos que
+estão em branco nele; documento ou e-mail divergentes não são
+sobrescritos e entram como conflito no relatório de mesclagem.
+
+Uma linha com documento nunca é mesclada por e-mail num cliente com
+outro documento (seria outra pessoa, como na migração customers 0003):
+vira um cliente novo, sem o e-mail (único em Client), e entra no
+relatório como conflito de documento com o dono do e-mail.
+"""
+
+import csv
+from collections import Counter
+from itertools import chain, islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.cache_keys import touch_model
+from core.models import Client, ClientSummary
+from core.normalize import digits, email_key, text_key
+
+
+class ClientImportService:
+    """
+    Serviço de importação e deduplicação de clientes.
+    """
+
+    BATCH_SIZE = 2000
+    MAX_ISSUES = 1000
+
+    # Cabeçalhos aceitos (já normalizados por _header) para cada campo
+    COLUMNS = {
+        'name': ('name', 'nome', 'nome_completo', 'cliente', 'razao_social'),
+        'email': ('email', 'e-mail', 'e_mail'),
+        'phone': ('phone', 'telefone', 'celular', 'fone'),
+        'document': ('document', 'documento', 'cpf', 'cnpj', 'cpf_cnpj', 'cpf/cnpj'),
+    }
+    REPORT_HEADER = ('linha', 'cliente_id', 'origem', 'chave', 'conflitos')
+
+    @staticmethod
+    def _header(value: str) -> str:
+        return text_key(value).replace(' ', '_')
+
+    @staticmethod
+    def read_rows(stream, delimiter: str | None = None):
+        """
+        Lê o CSV em fluxo.
+
+        O delimitador (',', ';' ou tab) é deduzido da linha de cabeçalho
+        quando não informado.
+
+        Yields:
+            (número da linha, {'name', 'email', 'phone', 'document'})
+        """
+        first = stream.readline()
+        if not first:
+            return
+        if delimiter is None:
+            delimiter = max((',', ';', '\t'), key=first.count)
+        reader = csv.reader(chain([first], stream), delimiter=delimiter)
+
+        header = [ClientImportService._header(column) for column in next(reader)]
+        positions = {}
+        for field, aliases in ClientImportService.COLUMNS.items():
+            for alias in aliases:
+                if alias in header:
+                    positions[field] = header.index(alias)
+                    break
+        if 'name' not in positions:
+            raise ValueError('O CSV precisa de uma coluna de nome (nome ou name).')
+
+        for values in reader:
+            if not any(values):
+                continue
+            yield reader.line_num, {
+                field: values[index].strip() if index < len(values) else ''
+                for field, index in positions.items()
+            }
+
+    @staticmethod
+    def normalize(row: dict) -> tuple[dict | None, str | None]:
+        """
+        Forma gravada de uma linha: nome com espaços simples, documento e
+        telefone só com dígitos, e-mail minúsculo.
+
+        Returns:
+            (dados ou None se a linha deve ser ignorada, aviso ou None)
+        """
+        name = ' '.join(row.get('name', '').split())
+        if not name:
+            return None, 'sem nome'
+
+        data = {
+            'name': name[:Client._meta.get_field('name').max_length],
+            'document': digits(row.get('document')),
+            'phone': digits(row.get('phone')),
+            'email': email_key(row.get('email')),
+        }
+        warning = None
+        for field in ('document', 'phone'):
+            if len(data[field]) > Client._meta.get_field(field).max_length:
+                warning = f'{field} inválido ignorado'
+                data[field] = ''
+        if data['email']:
+            try:
+                validate_email(data['email'])
+            except ValidationError:
+                warning = 'e-mail inválido ignorado'
+                data['email'] = ''
+        return data, warning
+
+    @staticmethod
+    def _existing(data: list[dict]) -> dict:
+        """Clientes cadastrados com os documentos/e-mails do lote, por chave."""
+        documents = {row['document'] for row in data if row['document']}
+        emails = {row['email'] for row in data if row['email']}
+        if not documents and not emails:
+            return {}
+        owners = {}
+        # Mesma prioridade do ClientService.lookup: ativos e mais antigos primeiro
+        clients = Client.objects.filter(
+            Q(document_key__in=documents) | Q(email_key__in=emails)
+        ).order_by('-active', 'created_at')
+        for client in clients:
+            if client.document_key:
+                owners.setdefault(('document', client.document_key), client)
+            if client.email_key:
+                owners.setdefault(('email', client.email_key), client)
+        return owners
+
+    @staticmethod
+    def _merge(client: Client, data: dict, owners: dict) -> tuple[bool, list[str]]:
+        """
+        Completa `client` com os campos em branco vindos de `data`.
+
+        Returns:
+            (houve alteração, campos em conflito)
+        """
+        changed, conflicts = False, []
+
+        if data['document'] and data['document'] != digits(client.document):
+            if client.document:
+                conflicts.append('documento')
+            else:
+                client.document = data['document']
+                owners.setdefault(('document', data['document']), client)
+                changed = True
+
+        if data['email'] and data['email'] != email_key(client.email):
+            owner = owners.get(('email', data['email']))
+            if client.email or (owner is not None and owner is not client):
+                conflicts.append('email')
+            else:
+                client.email = data['email']
+                owners[('email', data['email'])] = client
+                changed = True
+
+        if data['phone'] and not client.phone:
+            client.phone = data['phone']
+            changed = True
+
+        return changed, conflicts
+
+    @staticmethod
+    def _write_batch(batch, owners, report, writer, started) -> None:
+        created, updated = {}, {}
+
+        def origin(client):
+            return 'arquivo' if client.pk in created or client.created_at >= started else 'cadastro'
+
+        for line, data in batch:
+            target, key = None, None
+            for key in ('document', 'email'):
+                target = owners.get((key, data[key])) if data[key] else None
+                if target is not None:
+                    break
+
+            rival = None
+            if (
+                key == 'email' and target is not None and data['document']
+                and digits(target.document) not in ('', data['document'])
+            ):
+                # Mesmo e-mail, outro documento: outra pessoa, não mescla
+                rival, target = target, None
+
+            if target is None:
+                # O e-mail é único em Client: fica com quem já o tinha
+                email = data['email'] if rival is None else ''
+                client = Client(
+                    name=data['name'], document=data['document'],
+                    phone=data['phone'], email=email or None,
+                )
+                created[client.pk] = client
+                for key in ('document', 'email'):
+                    if data[key] and (key, data[key]) not in owners:
+                        owners[(key, data[key])] = client
+                if rival is not None:
+                    report['conflicts'] += 1
+                    if writer is not None:
+                        writer.writerow((line, rival.pk, origin(rival), 'email', 'documento'))
+                continue
+
+            changed, conflicts = ClientImportService._merge(target, data, owners)
+            if changed and target.pk not in created:
+                updated[target.pk] = target
+            report['merged'] += 1
+            report['conflicts'] += bool(conflicts)
+            if writer is not None:
+                key = 'documento' if key == 'document' else 'email'
+                writer.writerow((line, target.pk, origin(target), key, ' '.join(conflicts)))
+
+        now = timezone.now()
+        for client in chain(created.values(), updated.values()):
+            client.refresh_keys()
+            client.updated_at = now
+
+        with transaction.atomic():
+            Client.objects.bulk_create(created.values())
+            # bulk_create não passa pelo save(): o resumo de compras é criado aqui
+            ClientSummary.objects.bulk_create(
+                ClientSummary(client_id=pk) for pk in created
+            )
+            Client.objects.bulk_update(
+                updated.values(),
+                ['document', 'phone', 'email', *Client.KEY_FIELDS, 'updated_at'],
+            )
+        report['created'] += len(created)
+        report['updated'] += len(updated)
+
+    @staticmethod
+    def import_rows(rows, batch_size: int | None = None, report_stream=None) -> dict:
+        """
+        Importa linhas já lidas (ver `read_rows`) em lotes.
+
+        Args:
+            rows: Iterável de (número da linha, dados brutos)
+            batch_size: Linhas por lote (padrão BATCH_SIZE)
+            report_stream: Texto aberto para o relatório CSV de mesclagem
+                (uma linha por duplicata ou por linha não mesclada por ter
+                outro documento: linha, cliente, origem, chave, conflitos)
+
+        Returns:
+            Contagens (rows, created, updated, merged, conflicts, skipped) e
+            os primeiros MAX_ISSUES avisos como (linha, mensagem)
+        """
+        batch_size = batch_size or ClientImportService.BATCH_SIZE
+        report = Counter()
+        issues = []
+        writer = None
+        if report_stream is not None:
+            writer = csv.writer(report_stream)
+            writer.writerow(ClientImportService.REPORT_HEADER)
+
+        started = timezone.now()
+        rows = iter(rows)
+        while chunk := list(islice(rows, batch_size)):
+            batch = []
+            for line, row in chunk:
+                report['rows'] += 1
+                data, warning = ClientImportService.normalize(row)
+                if warning and len(issues) < ClientImportService.MAX_ISSUES:
+                    issues.append((line, warning))
+                if data is None:
+                    report['skipped'] += 1
+                else:
+                    batch.append((line, data))
+            owners = ClientImportService._existing([data for _, data in batch])
+            ClientImportService._write_batch(batch, owners, report, writer, started)
+
+        touch_model(Client)
+        touch_model(ClientSummary)
+        return {
+            **{key: report[key] for key in ('rows', 'created', 'updated', 'merged', 'conflicts', 'skipped')},
+            'issues': issues,
+        }
+
+    @staticmethod
+    def import_csv(stream, delimiter: str | None = None, **options) -> dict:
+        """Importa um CSV aberto em modo texto (ver `import_rows`)."""
+        return ClientImportService.import_rows(
+            ClientImportService.read_rows(stream, delimiter), **options
+        )
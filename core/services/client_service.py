@@ -0,0 +1,137 @@
+"""
+ClientService - Busca no cadastro único de clientes (core.Client).
+
+As consultas comparam as chaves normalizadas (core.normalize) em vez dos
+campos digitados, então máscara, acento e caixa não importam e cada busca
+por documento, telefone ou e-mail é uma leitura direta no índice. A
+busca por nome usa a chave sem acento, com índice trigram no PostgreSQL
+(migração core 0007).
+"""
+
+from django.db import connections
+from django.db.models import Case, FloatField, Func, Q, QuerySet, Value, When
+
+from core.models import Client
+from core.normalize import digits, email_key, text_key
+
+
+class Similarity(Func):
+    """similarity() do pg_trgm (0 a 1), só no PostgreSQL."""
+
+    function = 'SIMILARITY'
+    output_field = FloatField()
+
+
+class ClientService:
+    """
+    Serviço de busca de clientes.
+    """
+
+    @staticmethod
+    def _is_number(term: str) -> bool:
+        """Termo numérico, com ou sem máscara: CPF/CNPJ ou telefone."""
+        return bool(digits(term)) and not any(char.isalpha() for char in term)
+
+    @staticmethod
+    def _digits_prefix(field: str, key: str) -> Q:
+        """
+        Prefixo numérico como faixa no btree: '129' -> >= '129' e < '13'.
+
+        Só dígitos, então a ordem é a mesma em qualquer collation, e o
+        índice comum atende tanto a busca exata quanto a por prefixo.
+        """
+        upper = key.rstrip('9')
+        if not upper:
+            return Q(**{f'{field}__gte': key})
+        upper = upper[:-1] + str(int(upper[-1]) + 1)
+        return Q(**{f'{field}__gte': key, f'{field}__lt': upper})
+
+    @staticmethod
+    def lookup(term: str) -> Client | None:
+        """
+        Busca exata por CPF/CNPJ, telefone ou e-mail (checkout, importação).
+
+        Returns:
+            O cliente (ativos e mais antigos primeiro) ou None
+        """
+        term = (term or '').strip()
+        if '@' in term:
+            condition = Q(email_key=email_key(term))
+        elif ClientService._is_number(term):
+            key = digits(term)
+            condition = Q(document_key=key) | Q(phone_key=key)
+        else:
+            return None
+        return Client.objects.filter(condition).order_by('-active', 'created_at').first()
+
+    @staticmethod
+    def _match(term: str, vendor: str) -> tuple[Q, object] | None:
+        """
+        Filtro e pontuação (0 a 1) do termo, conforme o tipo de busca.
+
+        - e-mail: prefixo da chave de e-mail; exata = 1.0
+        - número: prefixo do documento ou do telefone; exato = 1.0
+        - texto: cada palavra contida no nome sem acento (no PostgreSQL, o
+          LIKE '%palavra%' usa o índice trigram client_name_key_trgm_idx);
+          nome igual = 1.0, começo do nome = 0.8, trecho = 0.6, mais a
+          similaridade trigram como desempate no PostgreSQL
+        """
+        term = (term or '').strip()
+        if not term:
+            return None
+
+        if '@' in term:
+            key = email_key(term)
+            exact = Q(email_key=key)
+            if vendor == 'postgresql':
+                prefix = Q(email_key__startswith=key)
+            else:
+                # LIKE do SQLite ignora caixa e não usa o índice; a chave já é minúscula
+                prefix = Q(email_key__gte=key, email_key__lt=key[:-1] + chr(ord(key[-1]) + 1))
+            return prefix, Case(
+                When(exact, then=Value(1.0)), default=Value(0.9), output_field=FloatField()
+            )
+
+        if ClientService._is_number(term):
+            key = digits(term)
+            exact = Q(document_key=key) | Q(phone_key=key)
+            prefix = ClientService._digits_prefix('document_key', key) | ClientService._digits_prefix('phone_key', key)
+            return prefix, Case(
+                When(exact, then=Value(1.0)), default=Value(0.9), output_field=FloatField()
+            )
+
+        key = text_key(term)
+        condition = Q()
+        for word in key.split(' '):
+            condition &= Q(name_key__contains=word)
+        score = Case(
+            When(name_key=key, then=Value(1.0)),
+            When(name_key__startswith=key, then=Value(0.8)),
+            default=Value(0.6),
+            output_field=FloatField(),
+        )
+        if vendor == 'postgresql':
+            score = score + Similarity('name_key', Value(key)) * Value(0.1)
+        return condition, score
+
+    @staticmethod
+    def search(term: str, queryset: QuerySet | None = None) -> QuerySet:
+        """Busca incremental sem ordenação própria (lista de clientes)."""
+        clients = queryset if queryset is not None else Client.objects.all()
+        match = ClientService._match(term, connections[clients.db].vendor)
+        if match is None:
+            return clients
+        return clients.filter(match[0])
+
+    @staticmethod
+    def ranked(term: str, queryset: QuerySet | None = None) -> QuerySet:
+        """
+        Busca combinada (documento, telefone, e-mail ou nome) ordenada pela
+        relevância: anota `score` e ordena por score e nome.
+        """
+        clients = queryset if queryset is not None else Client.objects.all()
+        match = ClientService._match(term, connections[clients.db].vendor)
+        if match is None:
+            return clients.order_by('name')
+        condition, score = match
+        return clients.filter(condition).annotate(score=score).order_by('-score', 'name')
@@ -0,0 +1,104 @@
+"""
+ClientSummaryService - Resumo de compras por cliente (core.ClientSummary).
+
+Venda concluída: um UPDATE com F() soma a venda ao resumo (contagem,
+total, primeira/última compra), sem ler as vendas anteriores.
+Venda cancelada e cargas em lote: `refresh` recalcula o resumo dos
+clientes informados a partir das vendas concluídas (uma agregação por
+lote de clientes, pelo índice de Sale.client).
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, F, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from core.cache_keys import touch_model
+from core.models import Client, ClientSummary
+
+
+class ClientSummaryService:
+    """
+    Serviço do resumo de compras dos clientes.
+    """
+
+    BATCH_SIZE = 2000
+
+    @staticmethod
+    def record_sale(sale) -> None:
+        """Soma uma venda concluída ao resumo do cliente (chamar na mesma transação)."""
+        moment = Value(sale.created_at)
+        updated = ClientSummary.objects.filter(client_id=sale.client_id).update(
+            purchase_count=F('purchase_count') + 1,
+            total_spent=F('total_spent') + sale.total_amount,
+            first_purchase_at=Least(Coalesce('first_purchase_at', moment), moment),
+            last_purchase_at=Greatest(Coalesce('last_purchase_at', moment), moment),
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            # Cliente criado por bulk_create, ainda sem resumo
+            ClientSummaryService.refresh([sale.client_id])
+            return
+        # UPDATE em massa não dispara signals
+        touch_model(ClientSummary)
+
+    @staticmethod
+    def refresh(client_ids=None) -> int:
+        """
+        Recalcula os resumos a partir das vendas concluídas.
+
+        Args:
+            client_ids: Clientes a recalcular (None = todos)
+
+        Returns:
+            Quantidade de resumos gravados
+        """
+        from sales.models import Sale
+
+        if client_ids is None:
+            client_ids = Client.objects.values_list('pk', flat=True).order_by().iterator()
+        client_ids = list(client_ids)
+
+        written = 0
+        now = timezone.now()
+        for offset in range(0, len(client_ids), ClientSummaryService.BATCH_SIZE):
+            batch = client_ids[offset:offset + ClientSummaryService.BATCH_SIZE]
+            totals = {
+                row['client_id']: row
+                for row in Sale.objects.filter(
+                    client_id__in=batch, status=Sale.Status.COMPLETED
+                ).order_by().values('client_id').annotate(
+                    purchase_count=Count('pk'),
+                    total_spent=Sum('total_amount'),
+                    first_purchase_at=Min('created_at'),
+                    last_purchase_at=Max('created_at'),
+                )
+            }
+            existing = {
+                summary.client_id: summary
+                for summary in ClientSummary.objects.filter(client_id__in=batch)
+            }
+
+            to_create, to_update = [], []
+            for client_id in batch:
+                row = totals.get(client_id, {})
+                summary = existing.get(client_id)
+                if summary is None:
+                    summary = ClientSummary(client_id=client_id)
+                    to_create.append(summary)
+                else:
+                    to_update.append(summary)
+                summary.purchase_count = row.get('purchase_count', 0)
+                summary.total_spent = row.get('total_spent') or Decimal('0.00')
+                summary.first_purchase_at = row.get('first_purchase_at')
+                summary.last_purchase_at = row.get('last_purchase_at')
+                summary.updated_at = now
+
+            ClientSummary.objects.bulk_create(to_create)
+            ClientSummary.objects.bulk_update(to_update, [
+                'purchase_count', 'total_spent', 'first_purchase_at', 'last_purchase_at', 'updated_at',
+            ])
+            written += len(batch)
+        touch_model(ClientSummary)
+        return written
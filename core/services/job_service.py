@@ -0,0 +1,170 @@
+"""
+JobService - Fila de tarefas em segundo plano apoiada no banco.
+
+Fluxo de uma tarefa:
+    enqueue() -> PENDING -> claim() -> RUNNING -> SUCCEEDED
+                                               -> PENDING (nova tentativa, com espera)
+                                               -> FAILED (tentativas esgotadas)
+"""
+
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.exceptions import BusinessRuleViolationError
+from core.jobs import get_task
+from core.models import Job
+
+
+class JobContext:
+    """Objeto entregue à tarefa para reportar progresso."""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    def progress(self, percent: int, message: str = '') -> None:
+        """Grava o progresso (0-100) sem tocar nos demais campos do Job."""
+        percent = max(0, min(100, int(percent)))
+        Job.objects.filter(pk=self.job.pk).update(
+            progress=percent,
+            progress_message=message[:200],
+            updated_at=timezone.now(),
+        )
+        self.job.progress = percent
+        self.job.progress_message = message[:200]
+
+
+class JobService:
+    """
+    Serviço da fila de tarefas.
+    """
+
+    @staticmethod
+    def enqueue(name: str, payload: dict | None = None, max_attempts: int | None = None, run_at=None) -> Job:
+        """
+        Coloca uma tarefa na fila.
+
+        Raises:
+            BusinessRuleViolationError: Se a tarefa não estiver registrada
+        """
+        try:
+            get_task(name)
+        except KeyError:
+            raise BusinessRuleViolationError("Tarefa desconhecida", details=name)
+
+        return Job.objects.create(
+            name=name,
+            payload=payload or {},
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_at=run_at or timezone.now(),
+        )
+
+    @staticmethod
+    def enqueue_once(name: str, payload: dict | None = None) -> Job:
+        """
+        Como `enqueue`, mas reaproveita uma tarefa igual (mesmo nome e
+        payload) que ainda esteja na fila ou em execução. Evita que cada
+        requisição a um relatório ainda não calculado agende outro cálculo.
+        """
+        # Transação: a consulta fica no primário mesmo em views de réplica
+        with transaction.atomic():
+            existing = Job.objects.filter(
+                name=name,
+                payload=payload or {},
+                status__in=[Job.Status.PENDING, Job.Status.RUNNING],
+            ).order_by('created_at').first()
+            return existing or JobService.enqueue(name, payload)
+
+    @staticmethod
+    def claim(worker_id: str, limit: int = 1) -> list:
+        """
+        Reserva até `limit` tarefas prontas para execução.
+
+        SKIP LOCKED faz cada worker pular as linhas já travadas por outro,
+        em vez de esperar por elas.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            jobs = list(
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(status=Job.Status.PENDING, run_at__lte=now)
+                .order_by('run_at')[:limit]
+            )
+            for job in jobs:
+                job.status = Job.Status.RUNNING
+                job.attempts += 1
+                job.locked_by = worker_id
+                job.started_at = now
+                job.progress = 0
+                job.progress_message = ''
+            Job.objects.bulk_update(
+                jobs,
+                ['status', 'attempts', 'locked_by', 'started_at', 'progress', 'progress_message', 'updated_at'],
+            )
+        return jobs
+
+    @staticmethod
+    def run(job: Job) -> Job:
+        """Executa uma tarefa já reservada e registra o resultado."""
+        try:
+            func = get_task(job.name)
+            result = func(JobContext(job), **job.payload)
+        except Exception as e:
+            JobService._fail(job, f"{e.__class__.__name__}: {e}\n{traceback.format_exc()}")
+        else:
+            job.status = Job.Status.SUCCEEDED
+            job.result = result
+            job.progress = 100
+            job.error = ''
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'result', 'progress', 'error', 'finished_at', 'updated_at'])
+        return job
+
+    @staticmethod
+    def _fail(job: Job, error: str) -> None:
+        job.error = error
+        if job.attempts < job.max_attempts:
+            # Espera exponencial entre tentativas: base, 2x base, 4x base...
+            delay = settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** (job.attempts - 1))
+            job.status = Job.Status.PENDING
+            job.run_at = timezone.now() + timedelta(seconds=delay)
+            job.locked_by = ''
+        else:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'run_at', 'locked_by', 'finished_at', 'updated_at'])
+
+    @staticmethod
+    def heartbeat(worker_id: str, job_ids) -> int:
+        """Renova o sinal de vida das tarefas em execução reservadas por `worker_id`."""
+        return Job.objects.filter(
+            pk__in=list(job_ids), status=Job.Status.RUNNING, locked_by=worker_id,
+        ).update(updated_at=timezone.now())
+
+    @staticmethod
+    def requeue_stale(timeout_seconds: int | None = None) -> int:
+        """
+        Devolve à fila tarefas RUNNING sem sinal de vida (worker morreu).
+
+        O "sinal de vida" é o updated_at, renovado a cada progress() e pelo
+        heartbeat do run_worker enquanto a tarefa executa. Tarefas
+        que já esgotaram as tentativas são marcadas como FAILED, para que uma
+        tarefa que derruba o worker não volte à fila indefinidamente.
+        """
+        timeout_seconds = timeout_seconds or settings.JOB_STALE_TIMEOUT_SECONDS
+        now = timezone.now()
+        stale = Job.objects.filter(
+            status=Job.Status.RUNNING,
+            updated_at__lt=now - timedelta(seconds=timeout_seconds),
+        )
+        stale.filter(attempts__gte=F('max_attempts')).update(
+            status=Job.Status.FAILED,
+            error='Worker interrompido durante a execução',
+            finished_at=now,
+            updated_at=now,
+        )
+        return stale.update(status=Job.Status.PENDING, locked_by='', run_at=now, updated_at=now)
@@ -0,0 +1,390 @@
+"""
+Gerador de dados sintéticos em larga escala para testes de carga.
+
+Produz catálogo, depósitos, clientes, vendas e movimentações com
+distribuições enviesadas (poucos SKUs concentram a maior parte das
+vendas, sazonalidade por mês e dia da semana) usando bulk_create em
+lotes. Com a mesma semente, o resultado é sempre o mesmo (inclusive
+os UUIDs), o que permite reproduzir investigações de performance.
+
+Os sinais de post_save não disparam em bulk_create, por isso o saldo
+(Stock) é calculado aqui mesmo a partir do razão de movimentações.
+"""
+
+import random
+import uuid
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.db import transaction
+from django.utils import timezone
+
+from catalog.models import Brand, Category, Product
+from core.ids import uuid7_at
+from core.models import Client
+from core.services import ClientSummaryService
+from sales.models import Sale, SaleItem
+from stock.models import Stock, StockMovement, Warehouse
+
+
+SKU_PREFIX = 'GEN-'
+
+CATEGORY_NAMES = [
+    'Bicicletas', 'Pneus e Câmaras', 'Transmissão', 'Freios', 'Suspensão',
+    'Rodas', 'Acessórios', 'Vestuário', 'Ferramentas', 'Componentes',
+]
+BRAND_NAMES = [
+    'Caloi', 'Shimano', 'SRAM', 'Specialized', 'Trek', 'Oggi', 'Sense',
+    'Pirelli', 'Maxxis', 'Absolute', 'Vzan', 'Rockshox',
+]
+
+# Peso relativo de vendas por mês (jan..dez): pico no fim de ano e
+# no verão, vale no inverno.
+MONTH_WEIGHTS = [1.1, 0.9, 0.9, 0.8, 0.7, 0.6, 0.7, 0.8, 0.9, 1.0, 1.2, 1.6]
+# Peso por dia da semana (seg..dom): sábado forte, domingo quase fechado.
+WEEKDAY_WEIGHTS = [0.9, 0.9, 1.0, 1.0, 1.2, 1.6, 0.2]
+
+# Expoente da distribuição de popularidade (Zipf). Com 1.1, ~20% dos
+# SKUs respondem por 80% a 90% das unidades vendidas.
+ZIPF_EXPONENT = 1.1
+CANCELLED_RATIO = 0.02
+
+
+@contextmanager
+def manual_timestamps(*models):
+    """
+    Desliga auto_now/auto_now_add de ModelBase durante o bloco, para que
+    created_at/updated_at definidos pelo gerador sejam gravados como estão.
+    """
+    saved = []
+    for model in models:
+        for name in ('created_at', 'updated_at'):
+            field = model._meta.get_field(name)
+            saved.append((field, field.auto_now, field.auto_now_add))
+            field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class SyntheticDataGenerator:
+    """
+    Gera um conjunto de dados sintético e determinístico.
+
+    Args:
+        products: Quantidade de produtos (SKUs com prefixo GEN-)
+        warehouses: Quantidade de depósitos
+        clients: Quantidade de clientes
+        sales: Quantidade de vendas (cada uma com 1 a 5 itens)
+        movements: Movimentações além das geradas pelas vendas
+            (entradas de compra e saídas manuais)
+        days: Janela de tempo, em dias, terminando agora
+        seed: Semente do gerador aleatório
+        batch_size: Linhas por INSERT/transação
+        log: Função chamada com mensagens de progresso
+    """
+
+    def __init__(
+        self,
+        products: int = 0,
+        warehouses: int = 0,
+        clients: int = 0,
+        sales: int = 0,
+        movements: int = 0,
+        days: int = 730,
+        seed: int = 42,
+        batch_size: int = 5000,
+        log=None,
+    ):
+        self.n_products = products
+        self.n_warehouses = warehouses
+        self.n_clients = clients
+        self.n_sales = sales
+        self.n_movements = movements
+        self.days = days
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.log = log or (lambda message: None)
+
+        self.end = timezone.now()
+        self.start = self.end - timedelta(days=days)
+
+        self.product_ids = []
+        self.product_prices = []
+        self.warehouse_ids = []
+        self.client_ids = []
+        self._popularity = None
+        self._day_weights = None
+        self._balances = None
+        self._touched = None
+
+    # ------------------------------------------------------------------
+    # Utilitários determinísticos
+    # ------------------------------------------------------------------
+
+    def _uuid(self, moment: datetime | None = None) -> uuid.UUID:
+        """UUIDv7 do instante da linha (padrão: fim da janela), reproduzível pela semente."""
+        return uuid7_at(moment or self.end, self.rng.getrandbits(74))
+
+    def _batches(self, total: int):
+        for offset in range(0, total, self.batch_size):
+            yield offset, min(self.batch_size, total - offset)
+
+    def _pick_product(self) -> int:
+        """Índice de produto segundo a distribuição de popularidade."""
+        return self.rng.choices(range(self.n_products), cum_weights=self._popularity)[0]
+
+    def _pick_moment(self) -> datetime:
+        """Data/hora com sazonalidade mensal e semanal, em horário comercial."""
+        day = self.rng.choices(range(self.days), cum_weights=self._day_weights)[0]
+        moment = self.start + timedelta(days=day)
+        seconds = self.rng.randint(9 * 3600, 19 * 3600)
+        return datetime.combine(moment.date(), time(), tzinfo=moment.tzinfo) + timedelta(seconds=seconds)
+
+    def _prepare_distributions(self) -> None:
+        if self.n_products:
+            # Produtos em ordem aleatória de popularidade (o SKU 0 não é sempre o campeão)
+            ranks = list(range(1, self.n_products + 1))
+            self.rng.shuffle(ranks)
+            self._popularity = list(accumulate(1 / rank ** ZIPF_EXPONENT for rank in ranks))
+
+        weights = []
+        for day in range(self.days):
+            moment = self.start + timedelta(days=day)
+            weights.append(MONTH_WEIGHTS[moment.month - 1] * WEEKDAY_WEIGHTS[moment.weekday()])
+        self._day_weights = list(accumulate(weights))
+
+    def _add_balance(self, product_index: int, warehouse_index: int, delta: int) -> None:
+        index = product_index * self.n_warehouses + warehouse_index
+        self._balances[index] += delta
+        self._touched[index] = 1
+
+    # ------------------------------------------------------------------
+    # Etapas
+    # ------------------------------------------------------------------
+
+    def run(self) -> None:
+        self._prepare_distributions()
+        with manual_timestamps(Client, Sale, SaleItem, StockMovement):
+            self.generate_catalog()
+            self.generate_warehouses()
+            self.generate_clients()
+            if self.n_products and self.n_warehouses:
+                pairs = self.n_products * self.n_warehouses
+                self._balances = array('q', bytes(8 * pairs))
+                self._touched = bytearray(pairs)
+                self.generate_sales()
+                self.generate_movements()
+                self.generate_balances()
+        self.generate_summaries()
+
+    def generate_summaries(self) -> None:
+        """Resumo de compras dos clientes gerados (bulk_create não o atualiza)."""
+        if not self.client_ids:
+            return
+        ClientSummaryService.refresh(self.client_ids)
+        self.log(f'Resumos de clientes: {len(self.client_ids)}')
+
+    def generate_catalog(self) -> None:
+        if not self.n_products:
+            return
+
+        categories = [
+            Category.objects.get_or_create(name=name, defaults={'type': Category.Type.PRODUCT})[0]
+            for name in CATEGORY_NAMES
+        ]
+        brands = [Brand.objects.get_or_create(name=name)[0] for name in BRAND_NAMES]
+
+        for offset, size in self._batches(self.n_products):
+            batch = []
+            for i in range(offset, offset + size):
+                cost = Decimal(str(round(self.rng.lognormvariate(4.0, 1.2) + 5, 2)))
+                price = (cost * Decimal(str(round(self.rng.uniform(1.3, 2.0), 2)))).quantize(Decimal('0.01'))
+                category = self.rng.choice(categories)
+                brand = self.rng.choice(brands)
+                product = Product(
+                    id=self._uuid(),
+                    sku=f'{SKU_PREFIX}{i:07d}',
+                    name=f'{category.name} {brand.name} modelo {i}',
+                    category=category,
+                    brand=brand,
+                    cost=cost,
+                    price=price,
+                )
+                batch.append(product)
+                self.product_ids.append(product.id)
+                self.product_prices.append(price)
+            Product.objects.bulk_create(batch)
+            self.log(f'Produtos: {offset + size}/{self.n_products}')
+
+    def generate_warehouses(self) -> None:
+        if not self.n_warehouses:
+            return
+        batch = [
+            Warehouse(id=self._uuid(), name=f'Filial {i + 1:02d}', location=f'Unidade {i + 1:02d}')
+            for i in range(self.n_warehouses)
+        ]
+        Warehouse.objects.bulk_create(batch)
+        self.warehouse_ids = [warehouse.id for warehouse in batch]
+        self.log(f'Depósitos: {self.n_warehouses}')
+
+    def generate_clients(self) -> None:
+        for offset, size in self._batches(self.n_clients):
+            batch = []
+            for i in range(offset, offset + size):
+                created_at = self.start + timedelta(seconds=self.rng.randint(0, self.days * 86400))
+                client = Client(
+                    id=self._uuid(created_at),
+                    name=f'Cliente Sintético {i}',
+                    email=f'cliente{i}@sintetico.invalid',
+                    phone=f'11{self.rng.randint(900000000, 999999999)}',
+                    document=f'{self.rng.randint(0, 99999999999):011d}',
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+                client.refresh_keys()
+                batch.append(client)
+                self.client_ids.append(client.id)
+            Client.objects.bulk_create(batch)
+            self.log(f'Clientes: {offset + size}/{self.n_clients}')
+
+    def generate_sales(self) -> None:
+        if not self.n_sales:
+            return
+
+        for offset, size in self._batches(self.n_sales):
+            sales, items, movements = [], [], []
+            for _ in range(size):
+                moment = self._pick_moment()
+                sale_id = self._uuid(moment)
+                warehouse_index = self.rng.randrange(self.n_warehouses)
+                cancelled = self.rng.random() < CANCELLED_RATIO
+
+                total = Decimal('0.00')
+                lines = self.rng.choices([1, 2, 3, 4, 5], weights=[45, 25, 15, 10, 5])[0]
+                for product_index in {self._pick_product() for _ in range(lines)}:
+                    quantity = self.rng.choices([1, 2, 3, 4], weights=[70, 20, 7, 3])[0]
+                    unit_price = self.product_prices[product_index]
+                    line_total = unit_price * quantity
+                    total += line_total
+                    items.append(SaleItem(
+                        id=self._uuid(moment),
+                        sale_id=sale_id,
+                        product_id=self.product_ids[product_index],
+                        quantity=quantity,
+                        unit_price=unit_price,
+                        total_price=line_total,
+                        created_at=moment,
+                        updated_at=moment,
+                    ))
+                    if not cancelled:
+                        movements.append(StockMovement(
+                            id=self._uuid(moment),
+                            product_id=self.product_ids[product_index],
+                            warehouse_id=self.warehouse_ids[warehouse_index],
+                            quantity=quantity,
+                            movement_type=StockMovement.MovementType.OUT,
+                            reference_type=StockMovement.ReferenceType.SALE,
+                            reference_id=sale_id,
+                            reason=f'Venda {sale_id}',
+                            created_at=moment,
+                            updated_at=moment,
+                        ))
+                        self._add_balance(product_index, warehouse_index, -quantity)
+
+                sales.append(Sale(
+                    id=sale_id,
+                    client_id=self.rng.choice(self.client_ids),
+                    warehouse_id=self.warehouse_ids[warehouse_index],
+                    total_amount=total,
+                    status=Sale.Status.CANCELLED if cancelled else Sale.Status.COMPLETED,
+                    created_at=moment,
+                    updated_at=moment,
+                ))
+
+            with transaction.atomic():
+                Sale.objects.bulk_create(sales)
+                SaleItem.objects.bulk_create(items)
+                StockMovement.objects.bulk_create(movements)
+            self.log(f'Vendas: {offset + size}/{self.n_sales}')
+
+    def generate_movements(self) -> None:
+        for offset, size in self._batches(self.n_movements):
+            batch = []
+            for _ in range(size):
+                product_index = self._pick_product()
+                warehouse_index = self.rng.randrange(self.n_warehouses)
+                moment = self._pick_moment()
+                if self.rng.random() < 0.85:
+                    movement_type = StockMovement.MovementType.IN
+                    reference_type = StockMovement.ReferenceType.PURCHASE
+                    quantity = self.rng.randint(5, 50)
+                    reason = 'Compra de fornecedor'
+                    self._add_balance(product_index, warehouse_index, quantity)
+                else:
+                    movement_type = StockMovement.MovementType.OUT
+                    reference_type = StockMovement.ReferenceType.MANUAL
+                    quantity = self.rng.randint(1, 3)
+                    reason = 'Perda/avaria'
+                    self._add_balance(product_index, warehouse_index, -quantity)
+                batch.append(StockMovement(
+                    id=self._uuid(moment),
+                    product_id=self.product_ids[product_index],
+                    warehouse_id=self.warehouse_ids[warehouse_index],
+                    quantity=quantity,
+                    movement_type=movement_type,
+                    reference_type=reference_type,
+                    reason=reason,
+                    created_at=moment,
+                    updated_at=moment,
+                ))
+            StockMovement.objects.bulk_create(batch)
+            self.log(f'Movimentações: {offset + size}/{self.n_movements}')
+
+    def generate_balances(self) -> None:
+        """
+        Grava a tabela Stock a partir do razão gerado.
+
+        Onde as saídas superam as entradas, cria uma entrada de saldo
+        inicial no começo da janela, mantendo razão e saldo consistentes.
+        """
+        opening_moment = self.start - timedelta(days=1)
+        stocks, openings = [], []
+        for index, balance in enumerate(self._balances):
+            product_index, warehouse_index = divmod(index, self.n_warehouses)
+            if balance < 0:
+                deficit = -balance + self.rng.randint(0, 10)
+                openings.append(StockMovement(
+                    id=self._uuid(opening_moment),
+                    product_id=self.product_ids[product_index],
+                    warehouse_id=self.warehouse_ids[warehouse_index],
+                    quantity=deficit,
+                    movement_type=StockMovement.MovementType.IN,
+                    reference_type=StockMovement.ReferenceType.MANUAL,
+                    reason='Saldo inicial (carga sintética)',
+                    created_at=opening_moment,
+                    updated_at=opening_moment,
+                ))
+                balance += deficit
+            if self._touched[index]:
+                stocks.append(Stock(
+                    id=self._uuid(),
+                    product_id=self.product_ids[product_index],
+                    warehouse_id=self.warehouse_ids[warehouse_index],
+                    quantity=balance,
+                ))
+            if len(stocks) >= self.batch_size:
+                Stock.objects.bulk_create(stocks)
+                stocks = []
+            if len(openings) >= self.batch_size:
+                StockMovement.objects.bulk_create(openings)
+                openings = []
+        Stock.objects.bulk_create(stocks)
+        StockMovement.objects.bulk_create(openings)
+        self.log('Saldos de estoque gravados')
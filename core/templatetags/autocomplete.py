@@ -0,0 +1,23 @@
+"""
+Autocomplete fora de formulários Django (ver core.widgets.AutocompleteWidget).
+
+Uso:
+    {% load autocomplete %}
+    {% autocomplete 'produtos' 'product_id' required=True %}
+
+Atributos extras viram atributos do input oculto com o id; "_" vira "-"
+(ex.: x_model='clientId' -> x-model="clientId").
+"""
+
+from django import template
+
+from core.widgets import AutocompleteWidget
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def autocomplete(source, name, value=None, **attrs):
+    attrs = {key.replace('_', '-'): attr for key, attr in attrs.items()}
+    return AutocompleteWidget(source, attrs=attrs).render(name, value)
@@ -0,0 +1,73 @@
+"""
+Cache de fragmentos com chaves versionadas (ver core.cache_keys).
+
+Uso:
+    {% load fragment_cache %}
+    {% fragment_cache 'product_row' product product.category %}
+        ... HTML que depende de product e da categoria ...
+    {% endfragment_cache %}
+
+    {% fragment_cache_panel %}   {# painel de acertos (apenas com DEBUG) #}
+"""
+
+from django import template
+from django.conf import settings
+
+from core.cache_keys import can_store, fragment_cache, fragment_key, process_totals, record_lookup
+from core.instrumentation import current_metrics
+
+
+register = template.Library()
+
+
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, name, parts):
+        self.nodelist = nodelist
+        self.name = name
+        self.parts = parts
+
+    def render(self, context):
+        parts = [part.resolve(context) for part in self.parts]
+        key = fragment_key(self.name, *parts)
+        cache = fragment_cache()
+        html = cache.get(key)
+        record_lookup(html is not None)
+        if html is None:
+            html = self.nodelist.render(context)
+            if can_store(*parts):
+                cache.set(key, html, settings.FRAGMENT_CACHE_TIMEOUT)
+        return html
+
+
+@register.tag('fragment_cache')
+def do_fragment_cache(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            "'fragment_cache' exige um nome e ao menos uma parte da chave"
+        )
+    name = bits[1]
+    if name[0] in ('"', "'") and name[0] == name[-1]:
+        name = name[1:-1]
+    nodelist = parser.parse(('endfragment_cache',))
+    parser.delete_first_token()
+    return FragmentCacheNode(nodelist, name, [parser.compile_filter(bit) for bit in bits[2:]])
+
+
+def _ratio(hits, misses):
+    total = hits + misses
+    return f'{hits}/{total} ({hits * 100 // total}%)' if total else '—'
+
+
+@register.inclusion_tag('core/partials/fragment_cache_panel.html')
+def fragment_cache_panel():
+    """Acertos do cache de fragmentos nesta página e no processo (DEBUG)."""
+    if not settings.DEBUG:
+        return {'enabled': False}
+    metrics = current_metrics()
+    totals = process_totals()
+    return {
+        'enabled': True,
+        'request_ratio': _ratio(metrics.fragment_hits, metrics.fragment_misses) if metrics else '—',
+        'process_ratio': _ratio(totals['hits'], totals['misses']),
+    }
@@ -0,0 +1,111 @@
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from catalog.models import Product
+from core.autocomplete import PAGE_SIZE
+from core.models import Client
+from stock.forms import StockAdjustmentForm
+
+
+@pytest.fixture
+def many_products(db, category):
+    return Product.objects.bulk_create([
+        Product(sku=f'AUTO-{i:03d}', name=f'Produto {i:03d}', category=category,
+                cost=Decimal('1.00'), price=Decimal('2.00'))
+        for i in range(PAGE_SIZE + 5)
+    ])
+
+
+@pytest.mark.django_db
+class TestAutocompleteEndpoint:
+    def test_json_pages_without_count(self, client, many_products, django_assert_num_queries):
+        url = reverse('autocomplete', args=['produtos'])
+
+        with django_assert_num_queries(1):
+            first = client.get(url, {'format': 'json'}).json()
+        second = client.get(url, {'format': 'json', 'page': 2}).json()
+
+        assert len(first['results']) == PAGE_SIZE
+        assert first['has_more'] is True
+        assert len(second['results']) == 5
+        assert second['has_more'] is False
+
+    def test_searches_name_and_sku_prefix(self, client, product, product_secondary):
+        url = reverse('autocomplete', args=['produtos'])
+
+        by_name = client.get(url, {'format': 'json', 'q': 'câmara'}).json()['results']
+        by_sku = client.get(url, {'format': 'json', 'q': 'pneu-0'}).json()['results']
+
+        assert [r['id'] for r in by_name] == [str(product_secondary.pk)]
+        assert [r['label'] for r in by_sku] == [product.name]
+
+    def test_inactive_products_are_hidden(self, client, product):
+        product.active = False
+        product.save()
+
+        response = client.get(reverse('autocomplete', args=['produtos']), {'format': 'json'})
+
+        assert response.json()['results'] == []
+
+    def test_html_partial_links_next_page(self, client, many_products):
+        response = client.get(reverse('autocomplete', args=['produtos']), {'q': 'Produto'})
+
+        content = response.content.decode()
+        assert content.count('autocomplete-option') == PAGE_SIZE
+        assert 'page=2' in content
+
+    def test_clients_by_document(self, client):
+        Client.objects.create(name='Ana', document='12345678900')
+        Client.objects.create(name='Bruno', document='99999999999')
+
+        response = client.get(reverse('autocomplete', args=['clientes']), {'format': 'json', 'q': '123'})
+
+        assert [r['label'] for r in response.json()['results']] == ['Ana']
+
+    def test_unknown_source_is_404(self, client):
+        assert client.get(reverse('autocomplete', args=['nada'])).status_code == 404
+
+
+@pytest.mark.django_db
+class TestAutocompleteWidget:
+    def test_form_does_not_render_catalog(self, many_products, warehouse, django_assert_num_queries):
+        form = StockAdjustmentForm()
+
+        # apenas os depósitos do <select>; nenhum produto é consultado
+        with django_assert_num_queries(1):
+            html = form.as_p()
+        assert many_products[0].name not in html
+        assert reverse('autocomplete', args=['produtos']) in html
+
+    def test_bound_form_shows_selected_label(self, product, warehouse):
+        form = StockAdjustmentForm(data={'product': str(product.pk), 'warehouse': ''})
+
+        assert product.name in str(form['product'])
+
+    def test_validation_resolves_submitted_id(self, product, warehouse, django_assert_num_queries):
+        form = StockAdjustmentForm(data={
+            'product': str(product.pk), 'warehouse': str(warehouse.pk),
+            'new_quantity': 3, 'reason': 'Inventário',
+        })
+
+        with django_assert_num_queries(2):
+            assert form.is_valid()
+        assert form.cleaned_data['product'] == product
+
+    def test_required_goes_to_the_visible_input(self):
+        from core.templatetags.autocomplete import autocomplete
+
+        html = str(autocomplete('produtos', 'product_id', required=True))
+        hidden, search = html.split('type="search"')
+
+        assert 'required' not in hidden.split('type="hidden"')[1].split('>')[0]
+        assert ' required' in search.split('>')[0]
+        assert 'setCustomValidity' in html
+
+    def test_pages_use_remote_search(self, client, many_products):
+        for url in (reverse('stock:stock_movement'), reverse('sales:pdv')):
+            content = client.get(url).content.decode()
+            assert many_products[0].name not in content
+            assert 'autocomplete' in content
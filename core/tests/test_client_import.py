@@ -0,0 +1,135 @@
+import csv
+import io
+
+import pytest
+from django.core.management import call_command
+
+from core.models import Client, ClientSummary
+from core.services import ClientImportService
+
+
+def _csv(*lines):
+    return io.StringIO('\n'.join(lines) + '\n')
+
+
+@pytest.fixture
+def ana(db):
+    return Client.objects.create(name='Ana Conceição', document='123.456.789-00', phone='')
+
+
+class TestReadRows:
+    def test_semicolon_and_portuguese_headers(self):
+        rows = list(ClientImportService.read_rows(_csv(
+            'Nome;E-mail;Celular;CPF/CNPJ',
+            'Ana;ana@example.com;(11) 98888-7777;123.456.789-00',
+        )))
+
+        assert rows == [(2, {
+            'name': 'Ana', 'email': 'ana@example.com',
+            'phone': '(11) 98888-7777', 'document': '123.456.789-00',
+        })]
+
+    def test_name_column_is_required(self):
+        with pytest.raises(ValueError):
+            list(ClientImportService.read_rows(_csv('email,telefone', 'a@b.com,1')))
+
+    def test_normalize_drops_invalid_email(self):
+        data, warning = ClientImportService.normalize({'name': ' Ana  Paula ', 'email': 'nope'})
+
+        assert data['name'] == 'Ana Paula'
+        assert data['email'] == ''
+        assert warning == 'e-mail inválido ignorado'
+
+
+@pytest.mark.django_db
+class TestImport:
+    def test_creates_normalized_clients_with_summary(self):
+        result = ClientImportService.import_csv(_csv(
+            'nome,email,telefone,cpf',
+            'Bruno,BRUNO@Example.com,(11) 97777-6666,987.654.321-00',
+        ))
+
+        client = Client.objects.get()
+        assert (client.document, client.phone, client.email) == ('98765432100', '11977776666', 'bruno@example.com')
+        assert client.document_key == '98765432100'
+        assert ClientSummary.objects.filter(client=client).exists()
+        assert result['created'] == 1
+
+    def test_merges_duplicates_in_file_and_database(self, ana):
+        report = io.StringIO()
+        result = ClientImportService.import_csv(_csv(
+            'nome,email,telefone,cpf',
+            'Ana C,ana@example.com,11 98888-7777,12345678900',
+            'Carla,carla@example.com,,',
+            'Carla Souza,CARLA@example.com,,111.222.333-44',
+        ), report_stream=report)
+
+        ana.refresh_from_db()
+        assert ana.name == 'Ana Conceição'
+        assert (ana.email, ana.phone) == ('ana@example.com', '11988887777')
+        carla = Client.objects.get(email_key='carla@example.com')
+        assert carla.document == '11122233344'
+        assert Client.objects.count() == 2
+        assert (result['created'], result['updated'], result['merged']) == (1, 1, 2)
+
+        lines = list(csv.reader(io.StringIO(report.getvalue())))
+        assert lines[1:] == [
+            ['2', str(ana.pk), 'cadastro', 'documento', ''],
+            ['4', str(carla.pk), 'arquivo', 'email', ''],
+        ]
+
+    def test_duplicates_across_batches(self):
+        result = ClientImportService.import_csv(_csv(
+            'nome,cpf',
+            'Ana,12345678900',
+            'Bruno,98765432100',
+            'Ana Repetida,123.456.789-00',
+        ), batch_size=1)
+
+        assert Client.objects.count() == 2
+        assert result['merged'] == 1
+
+    def test_conflicting_email_is_kept_and_reported(self, ana):
+        Client.objects.create(name='Outra', email='ana@example.com')
+
+        result = ClientImportService.import_csv(_csv(
+            'nome,email,cpf',
+            'Ana,ana@example.com,12345678900',
+        ))
+
+        ana.refresh_from_db()
+        assert ana.email is None
+        assert result['conflicts'] == 1
+
+    def test_same_email_with_other_document_is_not_merged(self, ana):
+        ana.email = 'ana@example.com'
+        ana.save()
+        report = io.StringIO()
+
+        result = ClientImportService.import_csv(_csv(
+            'nome,email,cpf',
+            'Mariana,ana@example.com,98765432100',
+        ), report_stream=report)
+
+        ana.refresh_from_db()
+        assert ana.document == '123.456.789-00'
+        mariana = Client.objects.get(document_key='98765432100')
+        assert mariana.email is None
+        assert (result['created'], result['merged'], result['conflicts']) == (1, 0, 1)
+        lines = list(csv.reader(io.StringIO(report.getvalue())))
+        assert lines[1:] == [['2', str(ana.pk), 'cadastro', 'email', 'documento']]
+
+    def test_rows_without_name_are_skipped(self):
+        result = ClientImportService.import_csv(_csv('nome,cpf', ',12345678900', 'Ana,'))
+
+        assert result['skipped'] == 1
+        assert result['issues'] == [(2, 'sem nome')]
+        assert Client.objects.count() == 1
+
+    def test_command_dry_run_rolls_back(self, tmp_path):
+        path = tmp_path / 'clientes.csv'
+        path.write_text('nome;cpf\nAna;12345678900\n', encoding='utf-8')
+
+        call_command('import_customers', str(path), '--dry-run', stdout=io.StringIO())
+
+        assert not Client.objects.exists()
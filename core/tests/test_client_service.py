@@ -0,0 +1,138 @@
+from decimal import Decimal
+
+import pytest
+from django.db.models import Q
+from django.urls import reverse
+
+from core.models import Client
+from core.services import ClientService
+from customers.models import Customer
+from sales.services import SalesService
+from stock.services import StockService
+
+
+@pytest.fixture
+def ana(db):
+    return Client.objects.create(
+        name='Ana Conceição', document='123.456.789-00', phone='(11) 98888-7777',
+        email='Ana@Example.com',
+    )
+
+
+@pytest.mark.django_db
+class TestClientKeys:
+    def test_keys_are_normalized_on_save(self, ana):
+        assert ana.document_key == '12345678900'
+        assert ana.phone_key == '11988887777'
+        assert ana.email_key == 'ana@example.com'
+        assert ana.name_key == 'ana conceicao'
+
+    def test_keys_follow_update_fields(self, ana):
+        ana.document = '987.654.321-00'
+        ana.save(update_fields=['document'])
+
+        ana.refresh_from_db()
+        assert ana.document_key == '98765432100'
+
+    def test_blank_email_is_stored_as_null(self):
+        first = Client.objects.create(name='Sem e-mail', email='')
+        second = Client.objects.create(name='Também sem', email='')
+
+        assert first.email is None and second.email is None
+
+
+@pytest.mark.django_db
+class TestClientLookup:
+    @pytest.mark.parametrize('term', ['12345678900', '123.456.789-00', '11 98888-7777', ' ANA@example.COM '])
+    def test_exact_lookup_ignores_mask_and_case(self, ana, term, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            assert ClientService.lookup(term) == ana
+
+    def test_lookup_without_key_returns_none(self, ana, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert ClientService.lookup('Ana') is None
+
+    def test_search_by_prefix_and_accentless_name(self, ana):
+        Client.objects.create(name='Bruno', document='99999999999')
+
+        assert list(ClientService.search('123.456')) == [ana]
+        assert list(ClientService.search('conceicao')) == [ana]
+        assert list(ClientService.search('ana@ex')) == [ana]
+
+
+@pytest.mark.django_db
+class TestUnifiedCustomers:
+    def test_customer_screens_share_the_sales_table(self, ana):
+        assert Customer.objects.get(pk=ana.pk).name == ana.name
+        assert Customer._meta.db_table == Client._meta.db_table
+
+    def test_edit_page_shows_purchase_history(self, client, ana, warehouse, product):
+        StockService.add_stock(product, warehouse, 5)
+        SalesService.create_sale(ana, warehouse, [
+            {'product': product, 'quantity': 1, 'unit_price': Decimal('80.00')}
+        ])
+
+        response = client.get(reverse('customers:customer_edit', args=[ana.pk]))
+
+        assert [sale.client_id for sale in response.context['recent_sales']] == [ana.pk]
+
+    def test_delete_with_sales_deactivates(self, client, ana, warehouse, product):
+        StockService.add_stock(product, warehouse, 5)
+        SalesService.create_sale(ana, warehouse, [
+            {'product': product, 'quantity': 1, 'unit_price': Decimal('80.00')}
+        ])
+
+        client.post(reverse('customers:customer_delete', args=[ana.pk]))
+
+        ana.refresh_from_db()
+        assert ana.active is False
+
+    def test_inactive_clients_are_hidden_from_pdv_search(self, client, ana):
+        ana.active = False
+        ana.save()
+
+        response = client.get(reverse('autocomplete', args=['clientes']), {'format': 'json', 'q': 'Ana'})
+
+        assert response.json()['results'] == []
+
+
+class TestDigitsPrefix:
+    def test_prefix_becomes_a_range(self):
+        assert ClientService._digits_prefix('document_key', '129') == Q(
+            document_key__gte='129', document_key__lt='13'
+        )
+
+    def test_all_nines_has_no_upper_bound(self):
+        assert ClientService._digits_prefix('phone_key', '999') == Q(phone_key__gte='999')
+
+
+@pytest.mark.django_db
+class TestRankedSearch:
+    def test_exact_document_before_prefix(self, ana):
+        longer = Client.objects.create(name='Bruno', document='12345678900123')
+
+        assert list(ClientService.ranked('123.456.789-00')) == [ana, longer]
+        assert list(ClientService.ranked('1234567890012')) == [longer]
+
+    def test_name_start_before_substring(self):
+        middle = Client.objects.create(name='Maria Silva')
+        start = Client.objects.create(name='Silvana Souza')
+        exact = Client.objects.create(name='Silva')
+
+        assert list(ClientService.ranked('SILVA')) == [exact, start, middle]
+
+    def test_every_word_must_match(self, ana):
+        Client.objects.create(name='Ana Paula')
+
+        assert list(ClientService.ranked('ana conce')) == [ana]
+
+    def test_search_endpoint_returns_ranked_json(self, client, ana):
+        Client.objects.create(name='Bruno', phone='(11) 98888-7770')
+
+        response = client.get(reverse('customers:customer_search'), {'q': '11 98888-777', 'limit': 1})
+
+        [result] = response.json()['results']
+        assert result['id'] == str(ana.pk)
+        assert result['score'] == 0.9
+        assert result['purchase_count'] == 0
+        assert result['url'] == reverse('customers:customer_edit', args=[ana.pk])
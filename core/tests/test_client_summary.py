@@ -0,0 +1,77 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from core.models import Client, ClientSummary
+from core.services import ClientSummaryService
+from sales.models import Sale
+from sales.services import SalesService
+from stock.services import StockService
+
+
+@pytest.fixture
+def buyer(db):
+    return Client.objects.create(name='Cliente LTV')
+
+
+def _sell(buyer, warehouse, product, amount):
+    return SalesService.create_sale(buyer, warehouse, [
+        {'product': product, 'quantity': 1, 'unit_price': Decimal(amount)}
+    ])
+
+
+@pytest.mark.django_db
+class TestClientSummary:
+    def test_new_client_starts_with_empty_summary(self, buyer):
+        summary = buyer.summary
+
+        assert summary.purchase_count == 0
+        assert summary.total_spent == 0
+        assert summary.last_purchase_at is None
+
+    def test_sales_update_summary_incrementally(self, buyer, warehouse, product):
+        StockService.add_stock(product, warehouse, 10)
+        first = _sell(buyer, warehouse, product, '100.00')
+        second = _sell(buyer, warehouse, product, '50.00')
+
+        summary = ClientSummary.objects.get(client=buyer)
+        assert summary.purchase_count == 2
+        assert summary.total_spent == Decimal('150.00')
+        assert summary.first_purchase_at == first.created_at
+        assert summary.last_purchase_at == second.created_at
+
+    def test_cancellation_recomputes_client(self, buyer, warehouse, product):
+        StockService.add_stock(product, warehouse, 10)
+        first = _sell(buyer, warehouse, product, '100.00')
+        last = _sell(buyer, warehouse, product, '50.00')
+
+        SalesService.cancel_sale(last)
+
+        summary = ClientSummary.objects.get(client=buyer)
+        assert summary.purchase_count == 1
+        assert summary.total_spent == Decimal('100.00')
+        assert summary.last_purchase_at == first.created_at
+
+    def test_refresh_matches_incremental_updates(self, buyer, warehouse, product):
+        StockService.add_stock(product, warehouse, 10)
+        _sell(buyer, warehouse, product, '100.00')
+        old = _sell(buyer, warehouse, product, '30.00')
+        Sale.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=400))
+        ClientSummary.objects.filter(client=buyer).delete()
+
+        assert ClientSummaryService.refresh() == 1
+
+        summary = ClientSummary.objects.get(client=buyer)
+        assert summary.purchase_count == 2
+        assert summary.total_spent == Decimal('130.00')
+        assert summary.first_purchase_at < summary.last_purchase_at
+
+    def test_bulk_created_client_gets_summary_on_first_sale(self, warehouse, product):
+        [bulk] = Client.objects.bulk_create([Client(name='Importado')])
+        StockService.add_stock(product, warehouse, 10)
+
+        _sell(bulk, warehouse, product, '20.00')
+
+        assert ClientSummary.objects.get(client=bulk).total_spent == Decimal('20.00')
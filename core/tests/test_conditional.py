@@ -0,0 +1,116 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import parse_http_date
+
+from catalog.models import Category
+from core.db_router import REPLICA_ALIAS
+from stock.services import ReplenishmentService, StockService
+
+
+def _revalidate(client, url, response, **extra):
+    return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'], **extra)
+
+
+# Transação real: os carimbos dos modelos são renovados no commit
+@pytest.mark.django_db(transaction=True, databases=['default', REPLICA_ALIAS])
+class TestConditionalGet:
+    @pytest.fixture(autouse=True)
+    def settled_replica(self, settings):
+        # Sem janela de atraso da réplica (ver TestReplicaCache)
+        settings.REPLICA_PIN_SECONDS = 0
+
+    def test_list_answers_304_when_unchanged(self, client, product, django_assert_num_queries):
+        url = reverse('catalog:product_list')
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response['ETag']
+        assert response['Last-Modified']
+
+        # A versão vem dos carimbos no cache: nenhuma query
+        with django_assert_num_queries(0):
+            response = _revalidate(client, url, response)
+        assert response.status_code == 304
+        assert response.content == b''
+
+    def test_edit_invalidates_etag(self, client, product):
+        url = reverse('catalog:product_list')
+        response = client.get(url)
+
+        product.price = Decimal('90.00')
+        product.save()
+
+        assert _revalidate(client, url, response).status_code == 200
+
+    def test_related_change_invalidates_etag(self, client, product):
+        url = reverse('catalog:product_list')
+        response = client.get(url)
+
+        Category.objects.filter(pk=product.category_id).get().save()
+
+        assert _revalidate(client, url, response).status_code == 200
+
+    def test_delete_invalidates_etag(self, client, category):
+        url = reverse('catalog:category_list')
+        Category.objects.create(name='Acessórios')
+        response = client.get(url)
+
+        category.delete()
+
+        assert _revalidate(client, url, response).status_code == 200
+
+    def test_htmx_partial_has_its_own_etag(self, client, product):
+        url = reverse('catalog:product_list')
+        full = client.get(url)
+        partial = client.get(url, HTTP_HX_REQUEST='true')
+
+        assert full['ETag'] != partial['ETag']
+        assert 'HX-Request' in partial['Vary']
+        assert _revalidate(client, url, partial, HTTP_HX_REQUEST='true').status_code == 304
+
+    def test_filters_have_their_own_etag(self, client, product):
+        url = reverse('catalog:product_list')
+        response = client.get(url)
+
+        assert _revalidate(client, f'{url}?q=pneu', response).status_code == 200
+
+    def test_detail_follows_stock_changes(self, client, product, warehouse):
+        url = reverse('catalog:product_detail', args=[product.pk])
+        response = client.get(url)
+        assert _revalidate(client, url, response).status_code == 304
+
+        StockService.add_stock(product, warehouse, 3)
+
+        assert _revalidate(client, url, response).status_code == 200
+
+    def test_detail_changes_at_midnight(self, client, product, monkeypatch):
+        url = reverse('catalog:product_detail', args=[product.pk])
+        response = client.get(url)
+
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        monkeypatch.setattr(timezone, 'localdate', lambda: tomorrow)
+        revalidated = _revalidate(client, url, response)
+
+        assert revalidated.status_code == 200
+        assert revalidated['ETag'] != response['ETag']
+        assert parse_http_date(revalidated['Last-Modified']) >= parse_http_date(response['Last-Modified'])
+
+    def test_stock_list_follows_replenishment_refresh(self, client, product, warehouse):
+        StockService.add_stock(product, warehouse, 3)
+        url = reverse('stock:stock_list')
+        response = client.get(url)
+
+        ReplenishmentService.refresh(full=True)
+
+        assert _revalidate(client, url, response).status_code == 200
+
+    def test_post_is_not_conditional(self, client, product):
+        url = reverse('catalog:product_list')
+        response = client.get(url)
+
+        response = client.post(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert response.status_code != 304
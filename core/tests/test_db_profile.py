@@ -0,0 +1,64 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from bikeshop import settings as project_settings
+from core.benchmark import PROFILES, ConnectionBenchmark
+
+
+class TestDatabaseProfile:
+    def test_persistent_connections_with_health_checks(self):
+        database = project_settings._database('db', '5432')
+
+        assert database['CONN_MAX_AGE'] == project_settings.DB_CONN_MAX_AGE
+        assert database['CONN_HEALTH_CHECKS'] is True
+        assert 'pool' not in database['OPTIONS']
+        # Sem limite de tempo fora do servidor web
+        assert 'statement_timeout' not in database['OPTIONS'].get('options', '')
+
+    def test_pool_disables_persistent_connections(self, monkeypatch):
+        monkeypatch.setattr(project_settings, 'DB_POOL', True)
+
+        database = project_settings._database('db', '5432')
+
+        assert database['CONN_MAX_AGE'] == 0
+        assert database['OPTIONS']['pool']['max_size'] == project_settings.DB_POOL_MAX_SIZE
+
+    def test_statement_timeout_goes_to_connection_options(self, monkeypatch):
+        monkeypatch.setattr(project_settings, 'DB_STATEMENT_TIMEOUT_MS', 5000)
+
+        database = project_settings._database('replica-host', '5432', read_only=True)
+
+        assert database['OPTIONS']['options'] == (
+            '-c default_transaction_read_only=on -c statement_timeout=5000'
+        )
+
+    def test_web_server_sets_the_statement_timeout(self):
+        from bikeshop import gunicorn_conf
+
+        assert gunicorn_conf.raw_env == ['DB_STATEMENT_TIMEOUT_MS=30000']
+
+    def test_replica_is_read_only(self):
+        database = project_settings._database('replica-host', '5432', read_only=True)
+
+        assert database['HOST'] == 'replica-host'
+        assert 'default_transaction_read_only=on' in database['OPTIONS']['options']
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnectionBenchmark:
+    def test_report_covers_both_profiles(self, product):
+        report = ConnectionBenchmark(requests=3).run()
+
+        assert set(report['profiles']) == set(PROFILES)
+        assert all(data['requests'] == 3 for data in report['profiles'].values())
+        assert report['handshake_ms'] >= 0
+        assert 'overhead_saved_ms_per_request' in report
+
+    def test_command_outputs_json(self, product):
+        out = StringIO()
+        call_command('bench_connections', requests=2, json=True, stdout=out)
+
+        assert json.loads(out.getvalue())['profiles']['configurado']['requests'] == 2
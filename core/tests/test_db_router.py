@@ -0,0 +1,139 @@
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from catalog.models import Product
+from core.cache_keys import can_store, fragment_cache, touch_model
+from core.db_router import PIN_COOKIE, REPLICA_ALIAS, pin_primary, use_replica
+from stock.services import ReportService, StockService
+
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=['default', REPLICA_ALIAS])
+
+
+def _queries(alias, func):
+    with CaptureQueriesContext(connections[alias]) as captured:
+        result = func()
+    return len(captured), result
+
+
+class TestReplicaRouter:
+    def test_reads_stay_on_primary_by_default(self, product):
+        on_replica, _ = _queries(REPLICA_ALIAS, lambda: list(Product.objects.all()))
+
+        assert on_replica == 0
+
+    def test_use_replica_routes_reads(self, product):
+        def read():
+            with use_replica():
+                return list(Product.objects.all())
+
+        on_replica, products = _queries(REPLICA_ALIAS, read)
+
+        assert on_replica == 1
+        assert products == [product]
+
+    def test_writes_always_go_to_primary(self, category):
+        def write():
+            with use_replica():
+                return Product.objects.create(
+                    sku='R-1', name='Réplica', category=category, price=1, cost=1
+                )
+
+        on_replica, created = _queries(REPLICA_ALIAS, write)
+
+        assert on_replica == 0
+        assert created._state.db == 'default'
+
+    def test_pin_keeps_reads_on_primary(self, product):
+        def read():
+            with use_replica(), pin_primary():
+                return list(Product.objects.all())
+
+        assert _queries(REPLICA_ALIAS, read)[0] == 0
+
+    def test_report_service_reads_from_replica(self, product, warehouse):
+        StockService.add_stock(product, warehouse, 5)
+
+        on_replica, rows = _queries(REPLICA_ALIAS, lambda: ReportService.valuation(refresh=True))
+
+        assert on_replica == 1
+        assert rows[0]['units'] == 5
+
+
+class TestReplicaViews:
+    def test_read_view_uses_replica(self, client, product):
+        url = reverse('catalog:product_detail', args=[product.pk])
+
+        on_replica, response = _queries(REPLICA_ALIAS, lambda: client.get(url))
+
+        assert response.status_code == 200
+        assert on_replica > 0
+
+    def test_async_dashboard_uses_replica(self, client, product):
+        on_replica, response = _queries(REPLICA_ALIAS, lambda: client.get(reverse('dashboard')))
+
+        assert response.status_code == 200
+        assert on_replica > 0
+
+    def test_post_pins_following_reads_to_primary(self, client, product, warehouse):
+        response = client.post(reverse('stock:stock_movement'), {
+            'product_id': product.pk, 'warehouse_id': warehouse.pk,
+            'quantity': 2, 'movement_type': 'IN',
+        })
+        assert response.cookies[PIN_COOKIE]['max-age'] > 0
+
+        url = reverse('catalog:product_detail', args=[product.pk])
+        on_replica, response = _queries(REPLICA_ALIAS, lambda: client.get(url))
+
+        assert response.status_code == 200
+        assert on_replica == 0
+
+    def test_pin_expires_with_cookie(self, client, product):
+        client.cookies.pop(PIN_COOKIE, None)
+        url = reverse('stock:stock_history')
+
+        assert _queries(REPLICA_ALIAS, lambda: client.get(url))[0] > 0
+
+
+class TestReplicaCache:
+    @pytest.fixture(autouse=True)
+    def clear_fragments(self):
+        fragment_cache().clear()
+        yield
+        fragment_cache().clear()
+
+    def test_recent_stamp_is_only_a_risk_on_replica(self, settings):
+        settings.REPLICA_PIN_SECONDS = 60
+        touch_model(Product)
+
+        assert can_store(Product)
+        with use_replica():
+            assert not can_store(Product)
+            assert can_store('sem modelo')
+
+    def test_dashboard_does_not_cache_replica_reads_after_a_change(self, client, product, settings):
+        settings.REPLICA_PIN_SECONDS = 60
+        touch_model(Product)
+        url = reverse('dashboard')
+
+        client.get(url)
+        assert _queries(REPLICA_ALIAS, lambda: client.get(url))[0] > 0
+
+        # Passada a janela de atraso da réplica, o resultado é guardado
+        settings.REPLICA_PIN_SECONDS = 0
+        client.get(url)
+        assert _queries(REPLICA_ALIAS, lambda: client.get(url))[0] == 0
+
+    def test_replica_page_is_not_revalidated_after_a_change(self, client, product, settings):
+        settings.REPLICA_PIN_SECONDS = 60
+        touch_model(Product)
+        url = reverse('catalog:product_detail', args=[product.pk])
+
+        response = client.get(url)
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 200
+
+        settings.REPLICA_PIN_SECONDS = 0
+        response = client.get(url)
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
@@ -0,0 +1,143 @@
+from decimal import Decimal
+
+import pytest
+from django.db import transaction
+from django.template import Context, Template
+from django.test import override_settings
+from django.urls import reverse
+
+from catalog.models import Product
+from core import cache_keys
+from core.cache_keys import fragment_key, model_stamp, touch_model
+from core.instrumentation import RequestMetrics, activate_metrics, deactivate_metrics
+from stock.services import StockService
+
+
+def _render(source, **context):
+    return Template('{% load fragment_cache %}' + source).render(Context(context))
+
+
+@pytest.mark.django_db
+class TestFragmentKey:
+    def test_key_changes_when_instance_is_saved(self, product):
+        before = fragment_key('product_row', product)
+        product.price = Decimal('99.00')
+        product.save()
+
+        assert fragment_key('product_row', product) != before
+
+    def test_key_depends_on_all_parts(self, product, product_secondary):
+        assert fragment_key('row', product) != fragment_key('row', product_secondary)
+        assert fragment_key('row', product, 1) != fragment_key('row', product, 2)
+        assert fragment_key('a', product) != fragment_key('b', product)
+
+    def test_version_invalidates_every_key(self, product):
+        key = fragment_key('row', product)
+        with override_settings(FRAGMENT_CACHE_VERSION='2'):
+            assert fragment_key('row', product) != key
+
+    @pytest.mark.django_db(transaction=True)
+    def test_model_stamp_is_renewed_on_commit(self, product):
+        stamp = model_stamp(Product)
+        with transaction.atomic():
+            product.save()
+            # Até o commit os fragmentos continuam sob o carimbo anterior
+            assert model_stamp(Product) == stamp
+
+        assert model_stamp(Product) > stamp
+
+    def test_touch_model_renews_stamp(self, django_capture_on_commit_callbacks):
+        stamp = model_stamp(Product)
+        with django_capture_on_commit_callbacks(execute=True):
+            touch_model(Product)
+
+        assert model_stamp(Product) > stamp
+
+    @pytest.mark.django_db(transaction=True)
+    def test_stamp_is_bumped_once_per_transaction(self, product, product_secondary, monkeypatch):
+        bumps = []
+        monkeypatch.setattr(cache_keys, '_bump', bumps.append)
+
+        with transaction.atomic():
+            for _ in range(3):
+                product.save()
+                product_secondary.save()
+        assert bumps == ['stamp:catalog.product']
+
+        with transaction.atomic():
+            product.save()
+        assert len(bumps) == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_rolled_back_transaction_does_not_bump(self, product, monkeypatch):
+        bumps = []
+        monkeypatch.setattr(cache_keys, '_bump', bumps.append)
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                product.save()
+                raise RuntimeError
+        assert bumps == []
+
+        with transaction.atomic():
+            product.save()
+        assert bumps == ['stamp:catalog.product']
+
+
+@pytest.mark.django_db
+class TestFragmentCacheTag:
+    def test_second_render_is_served_from_cache(self, product):
+        source = "{% fragment_cache 'name' product %}{{ product.name }}{% endfragment_cache %}"
+        metrics = RequestMetrics()
+        token = activate_metrics(metrics)
+        try:
+            first = _render(source, product=product)
+            Product.objects.filter(pk=product.pk).update(name='Alterado sem signal')
+            product.name = 'Alterado sem signal'
+            second = _render(source, product=product)
+        finally:
+            deactivate_metrics(token)
+
+        assert first == second == 'Pneu Aro 29'
+        assert (metrics.fragment_hits, metrics.fragment_misses) == (1, 1)
+
+    def test_saved_instance_is_rendered_again(self, product):
+        source = "{% fragment_cache 'name' product %}{{ product.name }}{% endfragment_cache %}"
+        _render(source, product=product)
+        product.name = 'Pneu Novo'
+        product.save()
+
+        assert _render(source, product=product) == 'Pneu Novo'
+
+
+@pytest.mark.django_db
+class TestDashboardCache:
+    def test_dashboard_is_served_without_queries_until_data_changes(
+        self, client, product, warehouse, django_assert_num_queries, django_capture_on_commit_callbacks,
+        settings,
+    ):
+        # Sem janela de atraso da réplica (ver TestReplicaCache)
+        settings.REPLICA_PIN_SECONDS = 0
+        settings.REQUEST_METRICS_ENABLED = True
+        url = reverse('dashboard')
+        client.get(url)
+
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert 'fragmentos 1/1' in response['Server-Timing']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            StockService.add_stock(product, warehouse, 5)
+        response = client.get(url)
+        assert 'fragmentos 0/1' in response['Server-Timing']
+
+    @override_settings(DEBUG=True)
+    def test_panel_is_shown_in_debug(self, client):
+        response = client.get(reverse('dashboard'))
+
+        assert 'id="fragment-cache-panel"' in response.content.decode()
+
+    def test_panel_is_hidden_without_debug(self, client):
+        response = client.get(reverse('dashboard'))
+
+        assert 'fragment-cache-panel' not in response.content.decode()
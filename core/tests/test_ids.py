@@ -0,0 +1,67 @@
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from core.benchmark import IdInsertBenchmark
+from core.ids import new_id, uuid7, uuid7_at, uuid7_timestamp
+from core.models import Client
+
+
+class TestUuid7:
+    def test_version_and_variant(self):
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_monotonic_within_process(self):
+        values = [uuid7() for _ in range(10_000)]
+
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+    def test_embeds_current_time(self):
+        assert abs(uuid7_timestamp(uuid7()) - time.time()) < 1
+
+    @override_settings(MODEL_ID_VERSION=4)
+    def test_new_id_can_fall_back_to_v4(self):
+        assert new_id().version == 4
+
+
+@pytest.mark.django_db
+class TestModelIds:
+    def test_new_rows_get_time_ordered_ids(self):
+        first = Client.objects.create(name='Ana')
+        second = Client.objects.create(name='Bruno')
+
+        assert first.id.version == 7
+        assert first.id < second.id
+
+
+@pytest.mark.django_db(transaction=True)
+class TestIdInsertBenchmark:
+    def test_reports_both_generators_and_drops_tables(self):
+        report = IdInsertBenchmark(rows=2_000, batch_size=500).run()
+
+        assert set(report['generators']) == {'uuid4', 'uuid7'}
+        for data in report['generators'].values():
+            assert data['rows'] == 2_000
+            assert data['rows_per_s'] > 0
+        assert report['speedup'] is not None
+
+        assert not [t for t in connection.introspection.table_names() if t.startswith('bench_ids_')]
+
+
+class TestSyntheticIds:
+    def test_ids_follow_row_timestamps_and_seed(self):
+        earlier = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        later = datetime(2025, 6, 1, tzinfo=dt_timezone.utc)
+
+        assert uuid7_at(earlier, 123).version == 7
+        assert uuid7_at(earlier, 2 ** 74 - 1) < uuid7_at(later, 0)
+        assert uuid7_timestamp(uuid7_at(later, 5)) == later.timestamp()
+        assert uuid7_at(later, 5) == uuid7_at(later, 5)
@@ -0,0 +1,168 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from core.exceptions import BusinessRuleViolationError
+from core.jobs import task
+from core.models import Job
+from core.services import JobService
+
+
+calls = []
+
+
+@task('tests.echo')
+def echo(job, value=None):
+    job.progress(50, 'Metade')
+    calls.append(value)
+    return {'value': value}
+
+
+@task('tests.boom')
+def boom(job):
+    raise RuntimeError('falhou')
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+class TestJobService:
+    def test_enqueue_unknown_task(self):
+        with pytest.raises(BusinessRuleViolationError):
+            JobService.enqueue('tests.nao_existe')
+
+    def test_claim_marks_running_and_skips_future_jobs(self):
+        ready = JobService.enqueue('tests.echo')
+        JobService.enqueue('tests.echo', run_at=timezone.now() + timedelta(hours=1))
+
+        claimed = JobService.claim('worker-1', limit=5)
+
+        assert [job.pk for job in claimed] == [ready.pk]
+        ready.refresh_from_db()
+        assert ready.status == Job.Status.RUNNING
+        assert ready.attempts == 1
+        assert ready.locked_by == 'worker-1'
+        assert JobService.claim('worker-2', limit=5) == []
+
+    def test_run_success_stores_result(self):
+        JobService.enqueue('tests.echo', {'value': 7})
+        job = JobService.run(JobService.claim('w')[0])
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.SUCCEEDED
+        assert job.result == {'value': 7}
+        assert job.progress == 100
+        assert calls == [7]
+
+    def test_failure_is_retried_with_backoff_then_fails(self, settings):
+        settings.JOB_RETRY_BACKOFF_SECONDS = 10
+        job = JobService.enqueue('tests.boom', max_attempts=2)
+
+        JobService.run(JobService.claim('w')[0])
+        job.refresh_from_db()
+        assert job.status == Job.Status.PENDING
+        assert 'RuntimeError: falhou' in job.error
+        assert job.run_at > timezone.now() + timedelta(seconds=5)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        JobService.run(JobService.claim('w')[0])
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == 2
+
+    def test_requeue_stale(self):
+        retry = JobService.enqueue('tests.echo')
+        exhausted = JobService.enqueue('tests.echo', max_attempts=1)
+        JobService.claim('w', limit=2)
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+        assert JobService.requeue_stale(timeout_seconds=60) == 1
+
+        retry.refresh_from_db()
+        exhausted.refresh_from_db()
+        assert retry.status == Job.Status.PENDING
+        assert exhausted.status == Job.Status.FAILED
+
+    def test_heartbeat_keeps_long_job_alive(self):
+        mine = JobService.enqueue('tests.echo')
+        JobService.claim('w', limit=1)
+        other = JobService.enqueue('tests.echo')
+        JobService.claim('x', limit=1)
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+        # Só renova as tarefas RUNNING reservadas pelo próprio worker
+        assert JobService.heartbeat('w', [mine.pk, other.pk]) == 1
+        assert JobService.requeue_stale(timeout_seconds=60) == 1
+
+        mine.refresh_from_db()
+        other.refresh_from_db()
+        assert mine.status == Job.Status.RUNNING
+        assert other.status == Job.Status.PENDING
+
+
+@pytest.mark.django_db
+class TestRunWorker:
+    def test_once_processes_ready_jobs(self):
+        JobService.enqueue('tests.echo', {'value': 1})
+        JobService.enqueue('tests.echo', {'value': 2})
+
+        call_command('run_worker', processes=0, once=True)
+
+        assert sorted(calls) == [1, 2]
+        assert Job.objects.filter(status=Job.Status.SUCCEEDED).count() == 2
+
+    def test_heartbeat_thread_beats_active_jobs(self):
+        from core.management.commands.run_worker import Heartbeat
+        job = JobService.enqueue('tests.echo')
+        JobService.claim('w', limit=1)
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        heartbeat = Heartbeat('w', interval=60)
+
+        heartbeat.add(job.pk)
+        heartbeat.beat()
+        assert JobService.requeue_stale(timeout_seconds=60) == 0
+
+        heartbeat.discard(job.pk)
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        heartbeat.beat()
+        assert JobService.requeue_stale(timeout_seconds=60) == 1
+
+    def test_replenishment_job(self, warehouse, product):
+        from stock.services import StockService
+        StockService.add_stock(product, warehouse, 5)
+        job = JobService.enqueue('stock.refresh_replenishment', {'full': True})
+
+        call_command('run_worker', processes=0, once=True)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.SUCCEEDED
+        assert job.result == {'updated': 1}
+
+
+@pytest.mark.django_db
+class TestJobViews:
+    def test_status_polls_until_finished(self, client):
+        job = JobService.enqueue('tests.echo')
+        url = reverse('job_status', args=[job.pk])
+
+        response = client.get(url)
+        assert 'every 2s' in response.content.decode()
+        assert 'HX-Trigger' not in response
+
+        JobService.run(JobService.claim('w')[0])
+        response = client.get(url)
+        assert 'every 2s' not in response.content.decode()
+        assert response['HX-Trigger'] == 'jobFinished'
+
+    def test_replenishment_refresh_enqueues(self, client):
+        response = client.post(reverse('stock:replenishment_refresh'))
+
+        assert response.status_code == 200
+        job = Job.objects.get()
+        assert job.name == 'stock.refresh_replenishment'
+        assert job.payload == {'full': True}
@@ -0,0 +1,73 @@
+import json
+import logging
+
+import pytest
+from django.urls import reverse
+
+from core.instrumentation import RequestMetrics, sql_signature
+
+
+class TestSqlSignature:
+    def test_in_lists_are_collapsed(self):
+        assert sql_signature('SELECT 1 WHERE id IN (%s, %s, %s)') == sql_signature(
+            'SELECT 1 WHERE id IN (%s)'
+        )
+
+    def test_whitespace_is_normalized(self):
+        assert sql_signature('SELECT  1\n FROM t') == 'SELECT 1 FROM t'
+
+
+class TestRequestMetrics:
+    def test_duplicated_queries_only_reports_repeats(self):
+        metrics = RequestMetrics(capture_sql=True)
+        metrics.signatures.update(['SELECT a', 'SELECT a', 'SELECT b'])
+        assert metrics.duplicated_queries() == [('SELECT a', 2)]
+
+
+@pytest.mark.django_db
+class TestRequestMetricsMiddleware:
+    @pytest.fixture(autouse=True)
+    def _enabled(self, settings):
+        settings.REQUEST_METRICS_ENABLED = True
+
+    def test_disabled_sends_no_server_timing(self, client, settings):
+        settings.REQUEST_METRICS_ENABLED = False
+        response = client.get(reverse('catalog:category_list'))
+        assert response.status_code == 200
+        assert 'Server-Timing' not in response
+        assert not hasattr(response.wsgi_request, 'metrics')
+
+    def test_server_timing_header(self, client, product):
+        response = client.get(reverse('catalog:product_list'))
+        assert response.status_code == 200
+
+        timing = response['Server-Timing']
+        assert 'db;dur=' in timing
+        assert 'render;dur=' in timing
+        assert 'view;dur=' in timing
+        assert 'total;dur=' in timing
+
+    def test_counts_queries(self, client, product):
+        response = client.get(reverse('catalog:product_list'))
+        metrics = response.wsgi_request.metrics
+        assert metrics.queries > 0
+        assert metrics.render_time > 0
+
+    def test_structured_log_line(self, client, caplog):
+        with caplog.at_level(logging.INFO, logger='bikeshop.requests'):
+            client.get(reverse('catalog:category_list'))
+
+        payload = json.loads(caplog.records[-1].getMessage())
+        assert payload['path'] == reverse('catalog:category_list')
+        assert payload['status'] == 200
+        assert 'queries' in payload
+
+    def test_slow_request_logs_duplicated_queries(self, client, settings, caplog, warehouse, product, product_secondary):
+        settings.SLOW_REQUEST_THRESHOLD_MS = 0.001
+        with caplog.at_level(logging.WARNING, logger='bikeshop.requests'):
+            client.get(reverse('sales:product_search'), {'warehouse': str(warehouse.id)})
+
+        warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+        assert warnings
+        payload = json.loads(warnings[-1].getMessage())
+        assert 'duplicated_queries' in payload
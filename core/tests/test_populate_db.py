@@ -0,0 +1,67 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+
+from catalog.models import Product
+from sales.models import Sale, SaleItem
+from stock.models import Stock, StockMovement
+from core.synthetic import SKU_PREFIX
+
+
+def _populate(**options):
+    call_command(
+        'populate_db', products=50, warehouses=3, clients=20, sales=200,
+        movements=300, days=60, batch_size=64, stdout=StringIO(),
+        **options
+    )
+
+
+@pytest.mark.django_db
+class TestPopulateDbSynthetic:
+    def test_without_options_creates_only_base_data(self):
+        call_command('populate_db', stdout=StringIO())
+        assert not Product.objects.filter(sku__startswith=SKU_PREFIX).exists()
+        assert not Sale.objects.exists()
+
+    def test_generates_requested_volumes(self):
+        _populate()
+        assert Product.objects.filter(sku__startswith=SKU_PREFIX).count() == 50
+        assert Sale.objects.count() == 200
+        assert SaleItem.objects.count() >= 200
+
+    def test_sale_totals_match_items(self):
+        _populate()
+        for sale in Sale.objects.prefetch_related('items')[:50]:
+            assert sale.total_amount == sum(item.total_price for item in sale.items.all())
+
+    def test_stock_balances_match_ledger(self):
+        _populate()
+        for stock in Stock.objects.all():
+            movements = StockMovement.objects.filter(product=stock.product, warehouse=stock.warehouse)
+            entries = movements.filter(movement_type='IN').aggregate(q=Sum('quantity'))['q'] or 0
+            exits = movements.filter(movement_type='OUT').aggregate(q=Sum('quantity'))['q'] or 0
+            assert stock.quantity == entries - exits
+            assert stock.quantity >= 0
+
+    def test_same_seed_is_deterministic(self):
+        _populate(seed=7)
+        first = sorted(Sale.objects.values_list('id', flat=True))
+        Sale.objects.all().delete()
+        StockMovement.objects.all().delete()
+        Stock.objects.all().delete()
+        Product.objects.filter(sku__startswith=SKU_PREFIX).delete()
+        from core.models import Client
+        from stock.models import Warehouse
+        Client.objects.all().delete()
+        Warehouse.objects.exclude(name='Loja Principal').delete()
+
+        _populate(seed=7)
+        assert sorted(Sale.objects.values_list('id', flat=True)) == first
+
+    def test_refuses_to_duplicate_synthetic_data(self):
+        _populate()
+        with pytest.raises(CommandError):
+            _populate()
@@ -0,0 +1,28 @@
+"""
+Orçamento de queries do dashboard.
+"""
+
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+
+from core.models import Client
+from sales.services import SalesService
+from stock.services import StockService
+
+
+@pytest.mark.django_db
+class TestDashboardQueryBudget:
+    def test_dashboard(self, client, product, product_secondary, warehouse, django_assert_num_queries):
+        StockService.add_stock(product, warehouse, 8)
+        StockService.add_stock(product_secondary, warehouse, 3)
+        buyer = Client.objects.create(name="Cliente Dashboard")
+        for _ in range(3):
+            SalesService.create_sale(buyer, warehouse, [
+                {'product': product, 'quantity': 1, 'unit_price': Decimal('80.00')}
+            ])
+
+        # total, contagens (vendas, produtos, baixo estoque), últimas vendas,
+        # alertas de estoque e série mensal do gráfico
+        with django_assert_num_queries(7):
+            client.get(reverse('dashboard'))
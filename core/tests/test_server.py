@@ -0,0 +1,72 @@
+import pytest
+from django.db import DatabaseError
+from django.urls import reverse
+
+from bikeshop.gunicorn_conf import available_cpus, check_shared_cache, worker_plan
+from core.benchmark import HttpLoadBenchmark
+
+
+class TestWorkerPlan:
+    def test_one_process_per_cpu_plus_one(self):
+        assert worker_plan(cpus=4, db_connections=100) == (5, 4)
+
+    def test_limited_by_database_connections(self):
+        assert worker_plan(cpus=8, db_connections=20) == (5, 4)
+        assert worker_plan(cpus=8, db_connections=2) == (1, 4)
+
+    def test_pool_size_bounds_connections_per_worker(self):
+        assert worker_plan(cpus=8, db_connections=20, pool_size=2, threads=8) == (9, 8)
+
+    def test_async_workers_are_bounded_by_the_pool(self):
+        # Sob ASGI as conexões por processo dependem só do pool
+        assert worker_plan(cpus=8, db_connections=40, pool_size=10, asynchronous=True) == (4, 4)
+        assert worker_plan(cpus=2, db_connections=40, pool_size=10, asynchronous=True) == (3, 4)
+
+    def test_explicit_values_win(self):
+        assert worker_plan(cpus=8, db_connections=4, workers=3, threads=2) == (3, 2)
+
+    def test_available_cpus(self):
+        assert available_cpus() >= 1
+
+
+class TestCheckSharedCache:
+    def test_locmem_with_several_workers_is_refused(self):
+        with pytest.raises(RuntimeError, match='CACHE_BACKEND'):
+            check_shared_cache(workers=3, cache_backend='locmem')
+
+    def test_single_worker_or_shared_backend_is_accepted(self):
+        check_shared_cache(workers=1, cache_backend='locmem')
+        check_shared_cache(workers=3, cache_backend='file')
+
+
+@pytest.mark.django_db
+class TestHealthz:
+    def test_ok(self, client):
+        response = client.get(reverse('healthz'))
+
+        assert response.status_code == 200
+        assert response.json() == {'status': 'ok', 'database': True}
+        assert 'no-cache' in response['Cache-Control']
+
+    def test_database_down(self, client, monkeypatch):
+        def broken(*args, **kwargs):
+            raise DatabaseError('connection refused')
+
+        monkeypatch.setattr('core.views.connection.cursor', broken)
+
+        response = client.get(reverse('healthz'))
+
+        assert response.status_code == 503
+        assert response.json()['database'] is False
+
+
+@pytest.mark.django_db(transaction=True)
+class TestHttpLoadBenchmark:
+    def test_reports_throughput_against_live_server(self, live_server):
+        report = HttpLoadBenchmark(
+            live_server.url, paths=[reverse('healthz')], concurrency=2, duration=0.3
+        ).run()
+
+        assert report['requests'] > 0
+        assert report['errors'] == 0
+        assert report['requests_per_s'] > 0
@@ -1,36 +1,67 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
 from django.db.models import Sum, Count, functions
 from django.utils import timezone
+from django.views.decorators.cache import never_cache
 from datetime import timedelta
 from decimal import Decimal
 
+from core.autocomplete import PAGE_SIZE, get_source
+from core.cache_keys import can_store, fragment_cache, fragment_key
+from core.db_router import replica_view
 
-def dashboard(request):
-    """Dashboard principal com resumo de vendas e estoque."""
+
+@replica_view
+async def dashboard(request):
+    """
+    Dashboard principal com resumo de vendas e estoque.
+
+    Assíncrona (ORM async): os querysets são materializados aqui, porque o
+    template não pode disparar queries preguiçosas em contexto async.
+
+    O contexto calculado fica no cache de fragmentos, com chave derivada
+    dos carimbos de última alteração dos modelos exibidos: qualquer venda,
+    saldo, produto ou cliente salvo gera uma chave nova. O que é lido da
+    réplica logo após uma alteração não é guardado (ver can_store).
+    """
     from sales.models import Sale
-    from stock.models import Stock
+    from stock.models import Stock, Warehouse
+    from stock.services import ReplenishmentService
     from catalog.models import Product
-    
+    from core.models import Client
+
+    tracked = (Sale, Stock, Warehouse, Product, Client)
+    dashboard_key = fragment_key('dashboard', *tracked)
+    context = await fragment_cache().aget(dashboard_key)
+    if context is not None:
+        return render(request, 'core/dashboard.html', context)
+
     # Estatísticas
-    total_vendas = Sale.objects.filter(status=Sale.Status.COMPLETED).aggregate(
+    total_vendas = (await Sale.objects.filter(status=Sale.Status.COMPLETED).aaggregate(
         total=Sum('total_amount')
-    )['total'] or Decimal('0.00')
+    ))['total'] or Decimal('0.00')
     
-    vendas_hoje = Sale.objects.filter(status=Sale.Status.COMPLETED).count()
+    vendas_hoje = await Sale.objects.filter(status=Sale.Status.COMPLETED).acount()
     
-    produtos_ativos = Product.objects.filter(active=True).count()
+    produtos_ativos = await Product.objects.filter(active=True).acount()
     
-    produtos_baixo_estoque = Stock.objects.filter(quantity__lt=5).count()
+    produtos_baixo_estoque = await ReplenishmentService.low_stock().acount()
     
     # Últimas vendas
-    ultimas_vendas = Sale.objects.filter(
-        status=Sale.Status.COMPLETED
-    ).select_related('client').order_by('-created_at')[:5]
+    ultimas_vendas = [
+        venda async for venda in Sale.objects.filter(
+            status=Sale.Status.COMPLETED
+        ).select_related('client').order_by('-created_at')[:5]
+    ]
     
     # Alertas de estoque
-    alertas_estoque = Stock.objects.filter(
-        quantity__lt=10
-    ).select_related('product', 'warehouse').order_by('quantity')[:5]
+    alertas_estoque = [
+        item async for item in ReplenishmentService.low_stock().select_related(
+            'product', 'warehouse'
+        ).order_by('quantity')[:5]
+    ]
     
     # Dados para o gráfico (últimos 6 meses)
     seis_meses_atras = timezone.now().replace(day=1) - timedelta(days=150)
@@ -43,6 +74,7 @@ def dashboard(request):
         total=Sum('total_amount')
     ).order_by('month')
 
+    vendas_mensais = [v async for v in vendas_mensais]
     chart_labels = [v['month'].strftime('%b/%Y') for v in vendas_mensais]
     chart_data = [float(v['total']) for v in vendas_mensais]
     
@@ -55,6 +87,77 @@ def dashboard(request):
         'alertas_estoque': alertas_estoque,
         'chart_labels': chart_labels,
         'chart_data': chart_data,
+        'dashboard_key': dashboard_key,
     }
-    
+    # Lido da réplica logo após uma alteração: usa, mas não guarda
+    if can_store(*tracked):
+        await fragment_cache().aset(dashboard_key, context, settings.DASHBOARD_CACHE_TIMEOUT)
+
     return render(request, 'core/dashboard.html', context)
+
+
+@never_cache
+def healthz(request):
+    """
+    Verificação de saúde para o balanceador / orquestrador.
+
+    200 quando o processo responde e o banco aceita uma consulta; 503
+    caso contrário (o worker sai do balanceamento até o banco voltar).
+    """
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError:
+        return JsonResponse({'status': 'erro', 'database': False}, status=503)
+    return JsonResponse({'status': 'ok', 'database': True})
+
+
+def job_status(request, pk):
+    """Progresso de uma tarefa em segundo plano (consultado via HTMX)."""
+    from core.models import Job
+
+    job = get_object_or_404(Job, pk=pk)
+    response = render(request, 'core/partials/job_status.html', {'job': job})
+    if job.is_finished:
+        # Avisa a página para recarregar o que a tarefa alterou
+        response['HX-Trigger'] = 'jobFinished'
+    return response
+
+
+async def autocomplete(request, source):
+    """
+    Busca remota para os campos de autocomplete (produtos, clientes).
+
+    Devolve uma página de resultados como HTML (padrão, HTMX) ou JSON
+    (?format=json). Pagina com LIMIT de uma linha a mais, sem COUNT.
+    """
+    try:
+        source_def = get_source(source)
+    except KeyError:
+        raise Http404('Fonte de busca desconhecida')
+
+    term = request.GET.get('q', '').strip()
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+
+    offset = (page - 1) * PAGE_SIZE
+    rows = [obj async for obj in source_def.search(term)[offset:offset + PAGE_SIZE + 1]]
+    has_more = len(rows) > PAGE_SIZE
+    results = [
+        {'id': str(obj.pk), 'label': source_def.label(obj), 'detail': source_def.detail(obj)}
+        for obj in rows[:PAGE_SIZE]
+    ]
+
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'results': results, 'page': page, 'has_more': has_more})
+
+    next_params = request.GET.copy()
+    next_params['page'] = page + 1
+    return render(request, 'core/partials/autocomplete_results.html', {
+        'results': results,
+        'page': page,
+        'has_more': has_more,
+        'next_url': f'{request.path}?{next_params.urlencode()}',
+    })
@@ -0,0 +1,48 @@
+"""
+Widgets de formulário compartilhados.
+"""
+
+from django import forms
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.urls import reverse
+
+from core.autocomplete import get_source
+
+
+class AutocompleteWidget(forms.Widget):
+    """
+    Campo de busca remota para ModelChoiceField (ver core.autocomplete).
+
+    Diferente de forms.Select, não percorre o queryset do campo: renderiza
+    um input oculto com o id e, se já houver valor, busca só esse registro
+    para exibir o rótulo.
+
+    O navegador ignora `required` em input oculto: a obrigatoriedade vai
+    para o campo de busca visível, inválido até que um item seja escolhido.
+    """
+
+    template_name = 'core/widgets/autocomplete.html'
+
+    def __init__(self, source: str, attrs=None):
+        super().__init__(attrs)
+        self.source = source
+
+    def _label(self, value) -> str:
+        choices = getattr(self, 'choices', None)
+        if value in (None, '') or choices is None:
+            return ''
+        try:
+            return choices.field.label_from_instance(choices.queryset.get(pk=value))
+        except (ObjectDoesNotExist, ValidationError, ValueError):
+            return ''
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        required = context['widget']['attrs'].pop('required', False)
+        context['widget'].update({
+            'required': bool(required or context['widget']['required']),
+            'url': reverse('autocomplete', args=[self.source]),
+            'label': self._label(value),
+            'placeholder': get_source(self.source).placeholder,
+        })
+        return context
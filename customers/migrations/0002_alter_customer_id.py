@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:40
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
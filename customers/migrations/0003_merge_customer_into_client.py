@@ -0,0 +1,111 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:55
+#
+# Unifica o cadastro: as linhas de customers.Customer passam para
+# core.Client (a tabela usada pelas vendas) e Customer vira um proxy.
+# Um Customer com o mesmo documento (ou, sem documento, o mesmo e-mail) de
+# um Client existente é mesclado nele, completando os campos vazios; os
+# demais são copiados com o mesmo id, mantendo os links das telas. Um
+# Customer com documento próprio nunca é mesclado por e-mail (seria outra
+# pessoa): é copiado, sem o e-mail se ele já pertencer a um Client.
+#
+# Roda antes de core.0006 (ver as dependências de lá), que cria o resumo
+# de compras de todos os clientes, inclusive os copiados aqui.
+
+from django.db import migrations
+
+from core.normalize import digits, email_key, text_key
+
+
+def _refresh_keys(client):
+    client.document_key = digits(client.document)
+    client.phone_key = digits(client.phone)
+    client.email_key = email_key(client.email)
+    client.name_key = text_key(client.name)
+
+
+def merge_customers(apps, schema_editor):
+    Client = apps.get_model('core', 'Client')
+    Customer = apps.get_model('customers', 'Customer')
+
+    for customer in Customer.objects.order_by('created_at').iterator():
+        document, email = digits(customer.document), email_key(customer.email)
+        match = None
+        if document:
+            match = Client.objects.filter(document_key=document).order_by('created_at').first()
+        elif email:
+            match = Client.objects.filter(email_key=email).order_by('created_at').first()
+
+        if match is None:
+            # O e-mail é único em Client: fica com quem já o tinha
+            email_taken = bool(email) and Client.objects.filter(email_key=email).exists()
+            client = Client(
+                id=customer.id,
+                name=customer.name,
+                email=None if email_taken else customer.email or None,
+                phone=customer.phone or '',
+                document=customer.document or '',
+                active=customer.active,
+            )
+            _refresh_keys(client)
+            client.save()
+            # auto_now_add/auto_now sobrescrevem as datas no insert
+            Client.objects.filter(pk=client.pk).update(
+                created_at=customer.created_at, updated_at=customer.updated_at
+            )
+            continue
+
+        if not match.phone and customer.phone:
+            match.phone = customer.phone
+        if not match.document and customer.document:
+            match.document = customer.document
+        if not match.email and email and not Client.objects.filter(email_key=email).exists():
+            match.email = customer.email
+        match.active = match.active or customer.active
+        _refresh_keys(match)
+        match.save()
+
+
+def split_customers(apps, schema_editor):
+    Client = apps.get_model('core', 'Client')
+    Customer = apps.get_model('customers', 'Customer')
+
+    Customer.objects.bulk_create(
+        Customer(
+            id=client.id,
+            name=client.name,
+            email=client.email,
+            phone=client.phone or None,
+            document=client.document or None,
+            active=client.active,
+        )
+        for client in Client.objects.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_client_search_keys'),
+        ('customers', '0002_alter_customer_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_customers, split_customers),
+        migrations.DeleteModel(
+            name='Customer',
+        ),
+        migrations.CreateModel(
+            name='Customer',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'Cliente',
+                'verbose_name_plural': 'Clientes',
+                'ordering': ['name'],
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('core.client',),
+        ),
+    ]
@@ -1,7 +1,13 @@
 import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
+from core.models import ClientSummary
 from customers.models import Customer
 from customers.forms import CustomerForm
+from customers.views import LIST_LIMIT, _sort
 
 @pytest.mark.django_db
 class TestCustomerViews:
@@ -69,3 +75,61 @@ class TestCustomerViews:
         assert response.status_code == 302
         
         assert not Customer.objects.filter(id=customer.id).exists()
+
+
+@pytest.mark.django_db
+class TestCustomerListSorting:
+    @pytest.fixture
+    def customers(self):
+        big = Customer.objects.create(name='Alice')
+        small = Customer.objects.create(name='Bruno')
+        none = Customer.objects.create(name='Carla')
+        ClientSummary.objects.filter(client=big).update(
+            purchase_count=3, total_spent=Decimal('900.00'), last_purchase_at=timezone.now() - timedelta(days=30)
+        )
+        ClientSummary.objects.filter(client=small).update(
+            purchase_count=1, total_spent=Decimal('50.00'), last_purchase_at=timezone.now()
+        )
+        return big, small, none
+
+    @pytest.mark.parametrize('sort, expected', [
+        ('-total', ['Alice', 'Bruno', 'Carla']),
+        ('total', ['Carla', 'Bruno', 'Alice']),
+        ('-ultima', ['Bruno', 'Alice', 'Carla']),
+        ('ultima', ['Carla', 'Alice', 'Bruno']),
+        ('-nome', ['Carla', 'Bruno', 'Alice']),
+        ('invalida', ['Alice', 'Bruno', 'Carla']),
+    ])
+    def test_sorts_by_summary_columns(self, client, customers, sort, expected):
+        response = client.get(reverse('customers:customer_list'), {'ordem': sort})
+
+        assert [c.name for c in response.context['customers']] == expected
+
+    def test_list_does_not_aggregate_sales(self, client, customers, django_assert_num_queries):
+        # só a página, já com o resumo (a versão do ETag vem do cache)
+        with django_assert_num_queries(1):
+            response = client.get(reverse('customers:customer_list'), {'ordem': '-total'})
+        assert 'R$ 900.00' in response.content.decode()
+
+    def test_summary_sort_matches_the_index(self, client, customers, django_assert_num_queries):
+        # Mesma ordem de client_summary_ltv_idx (total_spent DESC, client_id)
+        with django_assert_num_queries(1) as captured:
+            client.get(reverse('customers:customer_list'), {'ordem': '-total'})
+
+        sql = captured.captured_queries[0]['sql']
+        assert 'INNER JOIN "core_clientsummary"' in sql
+        assert (
+            'ORDER BY "core_clientsummary"."total_spent" DESC, '
+            '"core_clientsummary"."client_id" ASC'
+        ) in sql
+
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='plano de execução do PostgreSQL')
+    def test_summary_sort_reads_the_index(self, customers):
+        queryset = Customer.objects.filter(summary__isnull=False).select_related(
+            'summary'
+        ).order_by(*_sort('-total')[1])[:LIST_LIMIT]
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+
+        assert 'client_summary_ltv_idx' in plan
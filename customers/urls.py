@@ -5,6 +5,7 @@ app_name = 'customers'
 
 urlpatterns = [
     path('', views.customer_list, name='customer_list'),
+    path('busca/', views.customer_search, name='customer_search'),
     path('novo/', views.customer_create, name='customer_create'),
     path('<uuid:pk>/editar/', views.customer_edit, name='customer_edit'),
     path('<uuid:pk>/excluir/', views.customer_delete, name='customer_delete'),
@@ -1,17 +1,70 @@
+from django.db.models import F, ProtectedError
+from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
+
+from core.conditional import conditional_get, model_version
+from core.models import ClientSummary
+from core.services import ClientService
 from .models import Customer
 from .forms import CustomerForm
 
+
+# Colunas ordenáveis da lista: parâmetro ?ordem= -> (campo, desempate)
+# (prefixo '-' = decrescente). As colunas de compras vêm de ClientSummary,
+# cada uma com um índice (coluna DESC, client_id) na mesma ordem.
+SORT_FIELDS = {
+    'nome': ('name', 'pk'),
+    'total': ('summary__total_spent', 'summary__client_id'),
+    'compras': ('summary__purchase_count', 'summary__client_id'),
+    'ultima': ('summary__last_purchase_at', 'summary__client_id'),
+}
+# Colunas que aceitam NULL (cliente sem compra)
+NULLABLE_SORTS = {'ultima'}
+DEFAULT_SORT = 'nome'
+LIST_LIMIT = 100
+SEARCH_LIMIT = 20
+
+
+def _customer_list_versions(request):
+    return [model_version(Customer, ClientSummary)]
+
+
+def _sort(value: str) -> tuple[str, list]:
+    """
+    Valida ?ordem= e devolve (ordem, expressões do order_by).
+
+    A ordem crescente é o índice lido de trás para frente: o desempate
+    também inverte. Sem compra (última compra NULL) conta como o menor
+    valor, como no índice: fim da ordem decrescente, início da crescente.
+    """
+    key = value.lstrip('-')
+    if key not in SORT_FIELDS:
+        value, key = DEFAULT_SORT, DEFAULT_SORT
+    field, tiebreak = SORT_FIELDS[key]
+    nulls = key in NULLABLE_SORTS
+    if value.startswith('-'):
+        return value, [F(field).desc(nulls_last=nulls or None), F(tiebreak).asc()]
+    return value, [F(field).asc(nulls_first=nulls or None), F(tiebreak).desc()]
+
+
+@conditional_get(_customer_list_versions)
 def customer_list(request):
-    customers = Customer.objects.all()
     search = request.GET.get('q', '')
-    if search:
-        customers = customers.filter(name__icontains=search)
-    
+    sort, order_by = _sort(request.GET.get('ordem', DEFAULT_SORT))
+
+    # Todo cliente tem resumo (Client.save, importação em lote): a junção
+    # é INNER e a ordenação pelas colunas de compras lê o índice do resumo
+    customers = ClientService.search(search, Customer.objects.all()).filter(
+        summary__isnull=False
+    ).select_related('summary').order_by(*order_by)
+    customers = list(customers[:LIST_LIMIT + 1])
+
     context = {
-        'customers': customers,
-        'search': search
+        'customers': customers[:LIST_LIMIT],
+        'truncated': len(customers) > LIST_LIMIT,
+        'search': search,
+        'sort': sort,
     }
     
     if request.headers.get('HX-Request'):
@@ -19,6 +72,37 @@ def customer_list(request):
         
     return render(request, 'customers/customer_list.html', context)
 
+def customer_search(request):
+    """
+    Busca combinada de clientes para o balcão (JSON): CPF/CNPJ, telefone,
+    e-mail ou nome, com máscara ou acento, ordenada por relevância.
+    """
+    term = request.GET.get('q', '').strip()
+    try:
+        limit = min(max(int(request.GET.get('limit', SEARCH_LIMIT)), 1), 50)
+    except ValueError:
+        limit = SEARCH_LIMIT
+
+    results = []
+    if term:
+        clients = ClientService.ranked(term, Customer.objects.select_related('summary'))[:limit]
+        for customer in clients:
+            summary = getattr(customer, 'summary', None)
+            results.append({
+                'id': str(customer.pk),
+                'name': customer.name,
+                'document': customer.document,
+                'phone': customer.phone,
+                'email': customer.email or '',
+                'active': customer.active,
+                'score': round(customer.score, 3),
+                'purchase_count': summary.purchase_count if summary else 0,
+                'last_purchase_at': summary.last_purchase_at if summary else None,
+                'url': reverse('customers:customer_edit', args=[customer.pk]),
+            })
+    return JsonResponse({'query': term, 'results': results})
+
+
 def customer_create(request):
     if request.method == 'POST':
         form = CustomerForm(request.POST)
@@ -38,11 +122,20 @@ def customer_edit(request, pk):
             return redirect('customers:customer_list')
     else:
         form = CustomerForm(instance=customer)
-    return render(request, 'customers/customer_form.html', {'form': form, 'customer': customer})
+    # Mesmo cadastro das vendas: o histórico sai direto de Sale.client
+    recent_sales = customer.sales.select_related('warehouse').order_by('-created_at')[:10]
+    return render(request, 'customers/customer_form.html', {
+        'form': form, 'customer': customer, 'recent_sales': recent_sales,
+    })
 
 def customer_delete(request, pk):
     customer = get_object_or_404(Customer, pk=pk)
     if request.method == 'POST':
-        customer.delete()
+        try:
+            customer.delete()
+        except ProtectedError:
+            # Cliente com vendas não pode sumir do histórico: apenas inativa
+            customer.active = False
+            customer.save(update_fields=['active', 'updated_at'])
         return redirect('customers:customer_list')
     return redirect('customers:customer_list')
@@ -0,0 +1,276 @@
+"""
+Benchmark do checkout do PDV com vários terminais simultâneos.
+
+Cada terminal é uma thread com seu próprio django.test.Client (e sua
+própria conexão com o banco) repetindo o fluxo real do caixa:
+
+    busca -> adicionar ao carrinho (N itens) -> finalizar venda
+
+Falhas na finalização são classificadas (deadlock, lock, falta de
+estoque, outros) e a venda é reenviada com a mesma chave de
+idempotência, que garante que um reenvio nunca baixa estoque em dobro.
+
+Usado pelo comando `manage.py bench_checkout` e pelos testes.
+"""
+
+import random
+import threading
+import uuid
+from decimal import Decimal
+from time import perf_counter, sleep
+
+from django.db import connection, connections
+from django.test import Client as HttpClient
+from django.urls import reverse
+
+from catalog.models import Category, Product
+from core.models import Client
+from stock.models import Warehouse
+from stock.services import StockService
+
+
+BENCH_PREFIX = 'BENCH-'
+
+STEPS = ('search', 'cart_add', 'sale_complete', 'checkout')
+
+
+def percentile(values, pct: float) -> float:
+    """Percentil pelo método nearest-rank (0 para lista vazia)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def classify_failure(status_code: int, body: str) -> str:
+    """Classifica a falha de uma finalização de venda."""
+    text = body.lower()
+    if 'deadlock' in text:
+        return 'deadlock'
+    if 'locked' in text or 'could not serialize' in text or 'lock timeout' in text:
+        return 'lock'
+    if 'estoque insuficiente' in text:
+        return 'stockout'
+    return f'http_{status_code}'
+
+
+class CheckoutBenchmark:
+    """
+    Simula `terminals` caixas fazendo `sales_per_terminal` vendas cada.
+
+    Args:
+        terminals: Quantidade de terminais (threads) simultâneos
+        sales_per_terminal: Vendas que cada terminal tenta concluir
+        skus: Tamanho do conjunto de produtos disputado pelos terminais;
+            valores pequenos concentram a concorrência nos mesmos saldos
+        lines: Itens por venda
+        retries: Reenvios da finalização após uma falha
+        seed: Semente para a escolha dos produtos
+    """
+
+    def __init__(
+        self,
+        terminals: int = 4,
+        sales_per_terminal: int = 25,
+        skus: int = 20,
+        lines: int = 3,
+        retries: int = 3,
+        seed: int = 42,
+    ):
+        self.terminals = terminals
+        self.sales_per_terminal = sales_per_terminal
+        self.skus = skus
+        self.lines = min(lines, skus)
+        self.retries = retries
+        self.seed = seed
+
+        self.products = []
+        self.warehouse = None
+        self.client = None
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.timings = {step: [] for step in STEPS}
+        self.failures = {}
+        self.completed = 0
+        self.retried = 0
+        self.gave_up = 0
+        self.checkout_queries = []
+
+    # ------------------------------------------------------------------
+    # Preparação
+    # ------------------------------------------------------------------
+
+    def setup(self) -> None:
+        """Cria (ou reaproveita) depósito, cliente e produtos do benchmark com saldo suficiente."""
+        category, _ = Category.objects.get_or_create(
+            name='Benchmark', defaults={'type': Category.Type.PRODUCT}
+        )
+        self.warehouse, _ = Warehouse.objects.get_or_create(
+            name='Benchmark PDV', defaults={'location': 'Benchmark'}
+        )
+        self.client, _ = Client.objects.get_or_create(
+            email='benchmark@pdv.invalid', defaults={'name': 'Cliente Benchmark'}
+        )
+
+        self.products = []
+        for i in range(self.skus):
+            product, _ = Product.objects.get_or_create(
+                sku=f'{BENCH_PREFIX}{i:05d}',
+                defaults={
+                    'name': f'Produto Benchmark {i}',
+                    'category': category,
+                    'cost': Decimal('10.00'),
+                    'price': Decimal('25.00'),
+                },
+            )
+            self.products.append(product)
+
+        # Cada venda baixa 1 unidade por item; garante que o saldo nunca acabe
+        needed = self.terminals * self.sales_per_terminal * (self.retries + 1) * self.lines
+        for product in self.products:
+            if StockService.get_balance(product, self.warehouse) < needed:
+                StockService.adjust_stock(product, self.warehouse, needed, reason='Carga do benchmark')
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def _count_queries(self, counter):
+        def wrapper(execute, sql, params, many, context):
+            counter[0] += 1
+            return execute(sql, params, many, context)
+        return connection.execute_wrapper(wrapper)
+
+    def _timed(self, step: str, func):
+        start = perf_counter()
+        response = func()
+        elapsed = perf_counter() - start
+        with self._lock:
+            self.timings[step].append(elapsed)
+        return response
+
+    def _terminal(self, index: int) -> None:
+        rng = random.Random(self.seed + index)
+        http = HttpClient(SERVER_NAME='localhost', raise_request_exception=False)
+        warehouse_id = str(self.warehouse.id)
+        try:
+            for _ in range(self.sales_per_terminal):
+                checkout_start = perf_counter()
+                products = rng.sample(self.products, self.lines)
+
+                self._timed('search', lambda: http.get(
+                    reverse('sales:product_search'),
+                    {'q': products[0].sku, 'warehouse': warehouse_id},
+                ))
+                for product in products:
+                    response = self._timed('cart_add', lambda: http.post(
+                        reverse('sales:cart_add'),
+                        {'product_id': str(product.id), 'quantity': 1},
+                    ))
+                    if response.status_code != 200:
+                        kind = classify_failure(response.status_code, response.content.decode(errors='replace'))
+                        with self._lock:
+                            key = f'cart_add:{kind}'
+                            self.failures[key] = self.failures.get(key, 0) + 1
+
+                data = {
+                    'client_id': str(self.client.id),
+                    'warehouse_id': warehouse_id,
+                    'idempotency_key': uuid.uuid4().hex,
+                }
+                for attempt in range(self.retries + 1):
+                    counter = [0]
+                    with self._count_queries(counter):
+                        response = self._timed('sale_complete', lambda: http.post(
+                            reverse('sales:sale_complete'), data
+                        ))
+                    if response.status_code == 200:
+                        with self._lock:
+                            self.completed += 1
+                            self.checkout_queries.append(counter[0])
+                            self.timings['checkout'].append(perf_counter() - checkout_start)
+                        break
+
+                    kind = classify_failure(response.status_code, response.content.decode(errors='replace'))
+                    with self._lock:
+                        self.failures[kind] = self.failures.get(kind, 0) + 1
+                        if attempt < self.retries:
+                            self.retried += 1
+                        else:
+                            self.gave_up += 1
+                    sleep(0.01 * (2 ** attempt) * rng.random())
+                else:
+                    http.post(reverse('sales:cart_clear'))
+        finally:
+            connections.close_all()
+
+    def run(self) -> dict:
+        """Executa o benchmark e retorna o relatório (ver report())."""
+        self._reset_counters()
+        threads = [
+            threading.Thread(target=self._terminal, args=(i,), name=f'terminal-{i}')
+            for i in range(self.terminals)
+        ]
+        start = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.report(perf_counter() - start)
+
+    def report(self, elapsed: float) -> dict:
+        latencies = {
+            step: {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 50) * 1000, 2),
+                'p95_ms': round(percentile(values, 95) * 1000, 2),
+                'p99_ms': round(percentile(values, 99) * 1000, 2),
+            }
+            for step, values in self.timings.items()
+        }
+        queries = self.checkout_queries
+        return {
+            'config': {
+                'terminals': self.terminals,
+                'sales_per_terminal': self.sales_per_terminal,
+                'skus': self.skus,
+                'lines': self.lines,
+                'retries': self.retries,
+                'database': connection.vendor,
+            },
+            'elapsed_s': round(elapsed, 3),
+            'completed_sales': self.completed,
+            'throughput_sales_per_s': round(self.completed / elapsed, 2) if elapsed else 0.0,
+            'latency': latencies,
+            'failures': dict(self.failures),
+            'retries': self.retried,
+            'gave_up': self.gave_up,
+            'queries_per_sale': round(sum(queries) / len(queries), 1) if queries else 0.0,
+        }
+
+
+def compare_reports(current: dict, baseline: dict) -> list:
+    """
+    Compara dois relatórios e retorna linhas (métrica, baseline, atual, variação %).
+
+    Variação positiva em latência/queries significa piora; em throughput, melhora.
+    """
+    rows = []
+
+    def add(name, old, new):
+        change = ((new - old) / old * 100) if old else 0.0
+        rows.append((name, old, new, round(change, 1)))
+
+    add('throughput_sales_per_s', baseline['throughput_sales_per_s'], current['throughput_sales_per_s'])
+    add('queries_per_sale', baseline['queries_per_sale'], current['queries_per_sale'])
+    for step in STEPS:
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            add(
+                f'{step}.{key}',
+                baseline['latency'][step][key],
+                current['latency'][step][key],
+            )
+    return rows
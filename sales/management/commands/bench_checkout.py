@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sales.benchmark import CheckoutBenchmark, STEPS, compare_reports
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o checkout do PDV (busca -> carrinho -> finalizar) com vários '
+        'terminais simultâneos e compara com um baseline salvo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--terminals', type=int, default=4, help='Terminais simultâneos (threads)')
+        parser.add_argument('--sales', type=int, default=25, help='Vendas por terminal')
+        parser.add_argument(
+            '--skus', type=int, default=20,
+            help='Produtos disputados pelos terminais (menor = mais contenção)'
+        )
+        parser.add_argument('--lines', type=int, default=3, help='Itens por venda')
+        parser.add_argument('--retries', type=int, default=3, help='Reenvios após falha na finalização')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--save-baseline', metavar='ARQUIVO', help='Salva o resultado como baseline (JSON)')
+        parser.add_argument('--compare', metavar='ARQUIVO', help='Compara com um baseline salvo (JSON)')
+        parser.add_argument('--json', action='store_true', help='Imprime o relatório completo em JSON')
+
+    def handle(self, *args, **options):
+        if options['terminals'] < 1 or options['sales'] < 1:
+            raise CommandError('--terminals e --sales devem ser maiores que zero.')
+
+        baseline = None
+        if options['compare']:
+            path = Path(options['compare'])
+            if not path.exists():
+                raise CommandError(f'Baseline não encontrado: {path}')
+            baseline = json.loads(path.read_text())
+
+        bench = CheckoutBenchmark(
+            terminals=options['terminals'],
+            sales_per_terminal=options['sales'],
+            skus=options['skus'],
+            lines=options['lines'],
+            retries=options['retries'],
+            seed=options['seed'],
+        )
+        self.stdout.write('Preparando dados do benchmark...')
+        bench.setup()
+        self.stdout.write(
+            f'Executando: {bench.terminals} terminais x {bench.sales_per_terminal} vendas '
+            f'({bench.lines} itens, {bench.skus} SKUs)...'
+        )
+        report = bench.run()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report)
+
+        if baseline:
+            self.stdout.write('\nComparação com o baseline:')
+            for name, old, new, change in compare_reports(report, baseline):
+                self.stdout.write(f'  {name:<28} {old:>10} -> {new:>10}  ({change:+.1f}%)')
+
+        if options['save_baseline']:
+            path = Path(options['save_baseline'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f'Baseline salvo em {path}'))
+
+    def print_report(self, report):
+        self.stdout.write(self.style.SUCCESS(
+            f'{report["completed_sales"]} vendas em {report["elapsed_s"]}s '
+            f'= {report["throughput_sales_per_s"]} vendas/s '
+            f'({report["queries_per_sale"]} queries por finalização)'
+        ))
+        self.stdout.write(f'{"etapa":<14} {"n":>6} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}')
+        for step in STEPS:
+            data = report['latency'][step]
+            self.stdout.write(
+                f'{step:<14} {data["count"]:>6} {data["p50_ms"]:>9} {data["p95_ms"]:>9} {data["p99_ms"]:>9}'
+            )
+        self.stdout.write(
+            f'Falhas: {report["failures"] or "nenhuma"} | '
+            f'reenvios: {report["retries"]} | desistências: {report["gave_up"]}'
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sale',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, help_text='Identifica a requisição de checkout que originou a venda', max_length=64, null=True, unique=True, verbose_name='Chave de Idempotência'),
+        ),
+    ]
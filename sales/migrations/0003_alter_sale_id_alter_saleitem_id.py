@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:40
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0002_sale_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sale',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='saleitem',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -36,6 +36,15 @@ class Sale(ModelBase):
         verbose_name="Status"
     )
     notes = models.TextField(blank=True, verbose_name="Observações")
+    idempotency_key = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Chave de Idempotência",
+        help_text="Identifica a requisição de checkout que originou a venda"
+    )
 
     class Meta:
         verbose_name = "Venda"
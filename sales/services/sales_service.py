@@ -2,13 +2,19 @@
 SalesService - Serviço para gestão de vendas e integração com estoque.
 """
 
+from datetime import timedelta
 from decimal import Decimal
 from typing import List, Dict
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Max, Q, Sum
+from django.utils import timezone
 from sales.models import Sale, SaleItem
 from stock.services import StockService
 from stock.models import StockMovement
+from core.cache_keys import touch_model
+from core.exceptions import IdempotencyConflictError, InvalidStatusTransitionError
 from core.models import Client
+from core.services import ClientSummaryService
 from stock.models import Warehouse
 from catalog.models import Product
 
@@ -23,7 +29,8 @@ class SalesService:
         client: Client,
         warehouse: Warehouse,
         items_data: List[Dict],
-        notes: str = ""
+        notes: str = "",
+        idempotency_key: str | None = None,
     ) -> Sale:
         """
         Cria uma venda e realiza a baixa de estoque para cada item.
@@ -33,50 +40,164 @@ class SalesService:
             {'product': product_obj, 'quantity': 10, 'unit_price': Decimal('50.00')},
             ...
         ]
+
+        Se idempotency_key for informada e já existir uma venda com a
+        mesma chave, essa venda é retornada sem criar itens nem baixar
+        estoque novamente (duplo clique, reenvio do proxy, etc.).
         """
-        # 1. Criar o cabeçalho da venda
-        sale = Sale.objects.create(
-            client=client,
-            warehouse=warehouse,
-            notes=notes,
-            status=Sale.Status.COMPLETED
-        )
+        if idempotency_key:
+            existing = SalesService.find_by_idempotency_key(idempotency_key)
+            if existing is not None:
+                return existing
 
+        # 1. Calcular os totais de cada item antes de qualquer escrita,
+        # para que o cabeçalho já nasça com o valor total correto.
+        lines = []
         total_sale_amount = Decimal('0.00')
-
-        # 2. Processar itens e baixar estoque
         for item in items_data:
-            product = item['product']
-            quantity = item['quantity']
-            unit_price = item['unit_price']
-
-            # Calcular preço total do item
-            item_total = unit_price * quantity
+            item_total = item['unit_price'] * item['quantity']
             total_sale_amount += item_total
+            lines.append((item, item_total))
+
+        # 2. Criar o cabeçalho da venda (um único INSERT, já com o total)
+        # O índice único da chave resolve a corrida entre duas requisições
+        # simultâneas: a segunda falha no INSERT e devolve a venda da primeira.
+        try:
+            with transaction.atomic():
+                sale = Sale.objects.create(
+                    client=client,
+                    warehouse=warehouse,
+                    notes=notes,
+                    status=Sale.Status.COMPLETED,
+                    total_amount=total_sale_amount,
+                    idempotency_key=idempotency_key or None,
+                )
+        except IntegrityError:
+            if not idempotency_key:
+                raise
+            try:
+                return Sale.objects.get(idempotency_key=idempotency_key)
+            except Sale.DoesNotExist:
+                # A outra requisição ainda não confirmou ou foi desfeita
+                raise IdempotencyConflictError(idempotency_key)
 
-            # Criar o item da venda
-            SaleItem.objects.create(
+        # 3. Criar todos os itens em lote.
+        # bulk_create não chama SaleItem.save(), por isso total_price
+        # é preenchido explicitamente com o valor calculado acima.
+        SaleItem.objects.bulk_create([
+            SaleItem(
                 sale=sale,
-                product=product,
-                quantity=quantity,
-                unit_price=unit_price,
-                total_price=item_total
+                product=item['product'],
+                quantity=item['quantity'],
+                unit_price=item['unit_price'],
+                total_price=item_total,
             )
+            for item, item_total in lines
+        ])
+        touch_model(SaleItem)
 
-            # Baixar estoque via StockService
-            # Se não houver estoque, o StockService levantará InsufficientStockError
-            # e a transação atômica fará o rollback de toda a venda.
+        # 4. Baixar estoque via StockService
+        # Se não houver estoque, o StockService levantará InsufficientStockError
+        # e a transação atômica fará o rollback de toda a venda.
+        for item, _ in lines:
             StockService.remove_stock(
-                product=product,
+                product=item['product'],
                 warehouse=warehouse,
-                quantity=quantity,
+                quantity=item['quantity'],
                 reference_type=StockMovement.ReferenceType.SALE,
                 reference_id=sale.id,
                 reason=f"Venda {sale.id}"
             )
 
-        # 3. Atualizar o total da venda
-        sale.total_amount = total_sale_amount
-        sale.save()
+        # 5. Resumo do cliente (LTV) atualizado na mesma transação
+        ClientSummaryService.record_sale(sale)
 
         return sale
+
+    @staticmethod
+    @transaction.atomic
+    def cancel_sale(sale: Sale, reason: str = "") -> Sale:
+        """
+        Cancela uma venda concluída: devolve os itens ao estoque do depósito
+        de origem e recalcula o resumo de compras do cliente.
+
+        Raises:
+            InvalidStatusTransitionError: Se a venda já estiver cancelada
+        """
+        sale = Sale.objects.select_for_update().get(pk=sale.pk)
+        if sale.status != Sale.Status.COMPLETED:
+            raise InvalidStatusTransitionError(
+                'Venda', sale.status, Sale.Status.CANCELLED, allowed=[Sale.Status.COMPLETED]
+            )
+
+        sale.status = Sale.Status.CANCELLED
+        if reason:
+            sale.notes = f"{sale.notes}\nCancelamento: {reason}".strip()
+        sale.save(update_fields=['status', 'notes', 'updated_at'])
+
+        for item in sale.items.select_related('product'):
+            StockService.add_stock(
+                product=item.product,
+                warehouse=sale.warehouse,
+                quantity=item.quantity,
+                reference_type=StockMovement.ReferenceType.SALE,
+                reference_id=sale.id,
+                reason=f"Cancelamento da venda {sale.id}",
+            )
+
+        # A venda cancelada pode ter sido a primeira/última: recalcula só este cliente
+        ClientSummaryService.refresh([sale.client_id])
+        return sale
+
+    @staticmethod
+    def find_by_idempotency_key(idempotency_key: str) -> Sale | None:
+        """
+        Retorna a venda criada com a chave de idempotência informada.
+
+        Args:
+            idempotency_key: Chave enviada pelo cliente no checkout
+
+        Returns:
+            Sale correspondente, ou None se a chave ainda não foi usada
+        """
+        if not idempotency_key:
+            return None
+        return Sale.objects.filter(idempotency_key=idempotency_key).first()
+
+    @staticmethod
+    def get_product_summary(product: Product, period_days: int = 30) -> Dict:
+        """
+        Resume as vendas concluídas de um produto com uma única query agregada.
+
+        Args:
+            product: Produto
+            period_days: Janela (em dias) das métricas de período
+
+        Returns:
+            Dicionário com units_sold, revenue, period_units_sold,
+            period_revenue, realized_margin e last_sale_at
+
+        A margem realizada usa o custo atual do produto, já que o item
+        de venda não guarda o custo da época.
+        """
+        since = timezone.now() - timedelta(days=period_days)
+        in_period = Q(sale__created_at__gte=since)
+
+        summary = SaleItem.objects.filter(
+            product=product,
+            sale__status=Sale.Status.COMPLETED,
+        ).aggregate(
+            units_sold=Sum('quantity'),
+            revenue=Sum('total_price'),
+            period_units_sold=Sum('quantity', filter=in_period),
+            period_revenue=Sum('total_price', filter=in_period),
+            last_sale_at=Max('sale__created_at'),
+        )
+
+        summary['units_sold'] = summary['units_sold'] or 0
+        summary['revenue'] = summary['revenue'] or Decimal('0.00')
+        summary['period_units_sold'] = summary['period_units_sold'] or 0
+        summary['period_revenue'] = summary['period_revenue'] or Decimal('0.00')
+        summary['realized_margin'] = summary['revenue'] - product.cost * summary['units_sold']
+        summary['period_days'] = period_days
+        return summary
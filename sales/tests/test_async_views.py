@@ -0,0 +1,66 @@
+"""
+Views async do PDV executadas pelo caminho ASGI (AsyncClient).
+
+Os testes síncronos de test_pdv_views.py cobrem as mesmas views pelo
+caminho WSGI; aqui garantimos que elas não disparam queries síncronas
+em contexto async (SynchronousOnlyOperation) e que a sessão persiste.
+"""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from stock.services import StockService
+
+
+@pytest.fixture
+def async_http():
+    return AsyncClient()
+
+
+@pytest.mark.django_db
+class TestAsgiViews:
+    def test_product_search(self, async_http, warehouse, product, settings):
+        settings.REQUEST_METRICS_ENABLED = True
+        StockService.add_stock(product, warehouse, 3)
+
+        response = async_to_sync(async_http.get)(
+            reverse('sales:product_search'), {'q': product.sku, 'warehouse': str(warehouse.id)}
+        )
+
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert product.name in content
+        assert 'Estoque: 3' in content
+        # Middleware de métricas também enxerga as queries do ORM async
+        assert 'desc="2 queries"' in response['Server-Timing']
+
+    def test_cart_flow_keeps_session(self, async_http, product):
+        @async_to_sync
+        async def flow():
+            await async_http.post(reverse('sales:cart_add'), {'product_id': str(product.id), 'quantity': 1})
+            await async_http.post(reverse('sales:cart_add'), {'product_id': str(product.id), 'quantity': 2})
+            await async_http.post(reverse('sales:cart_update'), {'product_id': str(product.id), 'quantity': 5})
+            return await async_http.post(reverse('sales:cart_remove'), {'product_id': 'outro'})
+
+        response = flow()
+
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert 'value="5"' in content
+        assert 'R$ 400.00' in content
+
+    def test_cart_add_unknown_product(self, async_http):
+        response = async_to_sync(async_http.post)(
+            reverse('sales:cart_add'), {'product_id': '00000000-0000-0000-0000-000000000000'}
+        )
+        assert response.status_code == 404
+
+    def test_dashboard(self, async_http, warehouse, product):
+        StockService.add_stock(product, warehouse, 1)
+
+        response = async_to_sync(async_http.get)(reverse('dashboard'))
+
+        assert response.status_code == 200
+        assert product.name in response.content.decode()
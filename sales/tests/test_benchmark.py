@@ -0,0 +1,68 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Sum
+
+from sales.benchmark import CheckoutBenchmark, classify_failure, compare_reports, percentile
+from sales.models import Sale, SaleItem
+from stock.services import StockService
+
+
+class TestBenchmarkHelpers:
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 95) == 0.0
+
+    def test_classify_failure(self):
+        assert classify_failure(400, 'Erro: deadlock detected') == 'deadlock'
+        assert classify_failure(500, 'database is locked') == 'lock'
+        assert classify_failure(400, "Erro: Estoque insuficiente para 'X'") == 'stockout'
+        assert classify_failure(404, 'Not Found') == 'http_404'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCheckoutBenchmark:
+    def test_single_terminal_completes_every_sale(self):
+        bench = CheckoutBenchmark(terminals=1, sales_per_terminal=3, skus=5, lines=2)
+        bench.setup()
+        before = sum(StockService.get_balance(p, bench.warehouse) for p in bench.products)
+
+        report = bench.run()
+
+        assert report['completed_sales'] == 3
+        assert report['failures'] == {}
+        assert report['latency']['checkout']['count'] == 3
+        assert report['queries_per_sale'] > 0
+        assert Sale.objects.count() == 3
+        after = sum(StockService.get_balance(p, bench.warehouse) for p in bench.products)
+        assert before - after == 3 * 2
+
+    def test_concurrent_terminals_never_double_sell(self):
+        bench = CheckoutBenchmark(terminals=3, sales_per_terminal=2, skus=3, lines=1)
+        bench.setup()
+        before = sum(StockService.get_balance(p, bench.warehouse) for p in bench.products)
+
+        report = bench.run()
+
+        # O estoque baixado é exatamente o que foi vendido (nada em dobro)
+        after = sum(StockService.get_balance(p, bench.warehouse) for p in bench.products)
+        sold = SaleItem.objects.aggregate(units=Sum('quantity'))['units'] or 0
+        assert Sale.objects.count() == report['completed_sales']
+        assert before - after == sold
+
+    def test_command_saves_and_compares_baseline(self, tmp_path):
+        baseline = tmp_path / 'baseline.json'
+        call_command('bench_checkout', terminals=1, sales=2, skus=3, lines=1,
+                     save_baseline=str(baseline), stdout=StringIO())
+        saved = json.loads(baseline.read_text())
+        assert saved['completed_sales'] == 2
+
+        out = StringIO()
+        call_command('bench_checkout', terminals=1, sales=2, skus=3, lines=1,
+                     compare=str(baseline), stdout=out)
+        assert 'throughput_sales_per_s' in out.getvalue()
+        assert len(compare_reports(saved, saved)) > 0
@@ -115,3 +115,100 @@ class TestSaleCompleteValidation:
         })
         assert response.status_code == 400
         assert 'Selecione cliente' in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestSaleCompleteIdempotency:
+    def test_pdv_renders_checkout_key(self, client):
+        """A tela do PDV envia uma chave de idempotência no formulário."""
+        response = client.get(reverse('sales:pdv'))
+        assert response.status_code == 200
+        assert response.context['checkout_key']
+        assert 'name="idempotency_key"' in response.content.decode()
+
+    def test_double_submit_creates_single_sale(self, client, client_db, product, warehouse):
+        """Duplo envio com a mesma chave devolve a mesma venda."""
+        from sales.models import Sale
+        from stock.services import StockService
+        StockService.add_stock(product, warehouse, 10)
+
+        client.post(reverse('sales:cart_add'), {
+            'product_id': str(product.id),
+            'quantity': 2,
+        })
+
+        data = {
+            'client_id': str(client_db.id),
+            'warehouse_id': str(warehouse.id),
+            'idempotency_key': 'pdv-key-1',
+        }
+        first = client.post(reverse('sales:sale_complete'), data)
+        second = client.post(reverse('sales:sale_complete'), data)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert Sale.objects.count() == 1
+        assert first.context['sale'].pk == second.context['sale'].pk
+        assert StockService.get_balance(product, warehouse) == 8
+
+    def test_idempotency_key_header_is_accepted(self, client, client_db, product, warehouse):
+        """A chave também pode vir no header Idempotency-Key."""
+        from sales.models import Sale
+        from stock.services import StockService
+        StockService.add_stock(product, warehouse, 10)
+
+        client.post(reverse('sales:cart_add'), {
+            'product_id': str(product.id),
+            'quantity': 1,
+        })
+
+        data = {
+            'client_id': str(client_db.id),
+            'warehouse_id': str(warehouse.id),
+        }
+        client.post(reverse('sales:sale_complete'), data, headers={'Idempotency-Key': 'hdr-1'})
+        client.post(reverse('sales:sale_complete'), data, headers={'Idempotency-Key': 'hdr-1'})
+
+        assert Sale.objects.get().idempotency_key == 'hdr-1'
+
+    def test_idempotency_key_too_long_is_rejected(self, client, client_db, product, warehouse):
+        """Chave maior que a coluna devolve 400 em vez de estourar no banco."""
+        from sales.models import Sale
+        from stock.services import StockService
+        StockService.add_stock(product, warehouse, 10)
+        client.post(reverse('sales:cart_add'), {
+            'product_id': str(product.id),
+            'quantity': 1,
+        })
+
+        data = {
+            'client_id': str(client_db.id),
+            'warehouse_id': str(warehouse.id),
+        }
+        response = client.post(reverse('sales:sale_complete'), data, headers={'Idempotency-Key': 'k' * 65})
+
+        assert response.status_code == 400
+        assert not Sale.objects.exists()
+
+    def test_idempotency_conflict_returns_409(self, client, client_db, product, warehouse, monkeypatch):
+        """Conflito de chave em andamento devolve 409 para o cliente reenviar."""
+        from core.exceptions import IdempotencyConflictError
+        from sales.services import SalesService
+        from stock.services import StockService
+        StockService.add_stock(product, warehouse, 10)
+        client.post(reverse('sales:cart_add'), {
+            'product_id': str(product.id),
+            'quantity': 1,
+        })
+
+        def conflict(*args, **kwargs):
+            raise IdempotencyConflictError('pdv-key-2')
+
+        monkeypatch.setattr(SalesService, 'create_sale', conflict)
+        response = client.post(reverse('sales:sale_complete'), {
+            'client_id': str(client_db.id),
+            'warehouse_id': str(warehouse.id),
+            'idempotency_key': 'pdv-key-2',
+        })
+
+        assert response.status_code == 409
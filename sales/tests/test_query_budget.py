@@ -0,0 +1,86 @@
+"""
+Orçamento de queries do PDV e do SalesService.
+
+Os números são fixados de propósito: se uma mudança adicionar queries
+(ex.: um N+1 em um loop), o teste falha e o aumento precisa ser
+justificado e o número atualizado aqui.
+"""
+
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+
+from catalog.models import Product
+from core.models import Client
+from sales.services import SalesService
+from stock.services import StockService
+
+
+@pytest.fixture
+def client_db(db):
+    return Client.objects.create(name="Cliente Orçamento", document="11122233344")
+
+
+@pytest.fixture
+def make_products(db, category):
+    """Cria N produtos (opcionalmente com estoque em um depósito)."""
+    def _make(count, warehouse=None, stock=100):
+        products = Product.objects.bulk_create([
+            Product(
+                sku=f"QB-{i:04d}",
+                name=f"Produto Orçamento {i}",
+                category=category,
+                cost=Decimal("10.00"),
+                price=Decimal("20.00"),
+            )
+            for i in range(count)
+        ])
+        if warehouse is not None:
+            for product in products:
+                StockService.add_stock(product, warehouse, stock)
+        return products
+    return _make
+
+
+@pytest.mark.django_db
+class TestPdvQueryBudget:
+    def test_product_search(self, client, warehouse, make_products, django_assert_num_queries):
+        make_products(10, warehouse)
+        # produtos + saldos (uma query para todos os produtos)
+        with django_assert_num_queries(2):
+            client.get(reverse('sales:product_search'), {'q': 'Orçamento', 'warehouse': str(warehouse.id)})
+
+    def test_cart_add(self, client, make_products, django_assert_num_queries):
+        product, = make_products(1)
+        # sessão (leitura) + produto + gravação da sessão (3)
+        with django_assert_num_queries(5):
+            client.post(reverse('sales:cart_add'), {'product_id': str(product.id), 'quantity': 1})
+
+    def test_sale_complete(self, client, client_db, warehouse, make_products, django_assert_num_queries):
+        products = make_products(3, warehouse)
+        for product in products:
+            client.post(reverse('sales:cart_add'), {'product_id': str(product.id), 'quantity': 1})
+
+        # 17 fixas (sessão, cliente, depósito, produtos em lote, venda,
+        # itens em lote, resumo, LTV do cliente) + 6 por item do carrinho
+        with django_assert_num_queries(17 + 6 * len(products)):
+            client.post(reverse('sales:sale_complete'), {
+                'client_id': str(client_db.id),
+                'warehouse_id': str(warehouse.id),
+                'idempotency_key': 'budget-1',
+            })
+
+
+@pytest.mark.django_db
+class TestSalesServiceQueryBudget:
+    # 7 fixas (idempotência, cabeçalho, itens em lote, savepoints, resumo
+    # do cliente) + 6 por item (StockService.remove_stock e o signal de saldo)
+    @pytest.mark.parametrize('lines, expected', [(1, 13), (10, 67), (100, 607)])
+    def test_create_sale(self, client_db, warehouse, make_products, django_assert_num_queries, lines, expected):
+        products = make_products(lines, warehouse)
+        items_data = [
+            {'product': product, 'quantity': 1, 'unit_price': product.price}
+            for product in products
+        ]
+        with django_assert_num_queries(expected):
+            SalesService.create_sale(client_db, warehouse, items_data)
@@ -3,7 +3,8 @@ from decimal import Decimal
 from sales.services import SalesService
 from sales.models import Sale
 from stock.services import StockService
-from core.exceptions import InsufficientStockError
+from django.db import IntegrityError
+from core.exceptions import IdempotencyConflictError, InsufficientStockError, InvalidStatusTransitionError
 from core.models import Client
 
 @pytest.fixture
@@ -66,3 +67,136 @@ class TestSalesService:
         assert sale.total_amount == Decimal('200.00') # (2*50) + (5*20)
         assert StockService.get_balance(product, warehouse) == 8
         assert StockService.get_balance(product_secondary, warehouse) == 15
+
+    def test_create_sale_items_have_total_price(self, client, warehouse, product, product_secondary):
+        """Itens criados em lote devem ter total_price calculado."""
+        StockService.add_stock(product, warehouse, 10)
+        StockService.add_stock(product_secondary, warehouse, 10)
+
+        items_data = [
+            {'product': product, 'quantity': 3, 'unit_price': Decimal('12.50')},
+            {'product': product_secondary, 'quantity': 2, 'unit_price': Decimal('7.00')}
+        ]
+
+        sale = SalesService.create_sale(client, warehouse, items_data)
+
+        totals = {item.product_id: item.total_price for item in sale.items.all()}
+        assert totals[product.id] == Decimal('37.50')
+        assert totals[product_secondary.id] == Decimal('14.00')
+        sale.refresh_from_db()
+        assert sale.total_amount == Decimal('51.50')
+
+    def test_create_sale_with_same_idempotency_key_returns_original(self, client, warehouse, product):
+        """Reenvio com a mesma chave deve devolver a venda original sem nova baixa."""
+        StockService.add_stock(product, warehouse, 10)
+
+        items_data = [
+            {'product': product, 'quantity': 2, 'unit_price': Decimal('80.00')}
+        ]
+
+        first = SalesService.create_sale(client, warehouse, items_data, idempotency_key='abc-123')
+        second = SalesService.create_sale(client, warehouse, items_data, idempotency_key='abc-123')
+
+        assert first.pk == second.pk
+        assert Sale.objects.count() == 1
+        assert StockService.get_balance(product, warehouse) == 8
+
+    def test_create_sale_conflict_when_winner_is_not_visible(self, client, warehouse, product, monkeypatch):
+        """Se a chave colide mas a venda vencedora não é legível, sinaliza conflito."""
+        monkeypatch.setattr(SalesService, 'find_by_idempotency_key', staticmethod(lambda key: None))
+
+        def collide(**kwargs):
+            raise IntegrityError('duplicate key value violates unique constraint')
+
+        monkeypatch.setattr(Sale.objects, 'create', collide)
+        items_data = [
+            {'product': product, 'quantity': 1, 'unit_price': Decimal('80.00')}
+        ]
+
+        with pytest.raises(IdempotencyConflictError):
+            SalesService.create_sale(client, warehouse, items_data, idempotency_key='race-1')
+
+    def test_create_sale_without_idempotency_key_is_not_deduplicated(self, client, warehouse, product):
+        """Sem chave, cada chamada cria uma venda nova."""
+        StockService.add_stock(product, warehouse, 10)
+
+        items_data = [
+            {'product': product, 'quantity': 1, 'unit_price': Decimal('80.00')}
+        ]
+
+        SalesService.create_sale(client, warehouse, items_data)
+        SalesService.create_sale(client, warehouse, items_data)
+
+        assert Sale.objects.count() == 2
+        assert StockService.get_balance(product, warehouse) == 8
+
+
+@pytest.mark.django_db
+class TestProductSummary:
+    def test_summary_covers_full_history(self, client, warehouse, product):
+        """Os totais consideram todas as vendas, não só as últimas 10."""
+        StockService.add_stock(product, warehouse, 100)
+        for _ in range(12):
+            SalesService.create_sale(client, warehouse, [
+                {'product': product, 'quantity': 2, 'unit_price': Decimal('80.00')}
+            ])
+
+        summary = SalesService.get_product_summary(product)
+
+        assert summary['units_sold'] == 24
+        assert summary['revenue'] == Decimal('1920.00')
+        assert summary['period_units_sold'] == 24
+        # custo do produto = 50.00
+        assert summary['realized_margin'] == Decimal('1920.00') - Decimal('50.00') * 24
+        assert summary['last_sale_at'] is not None
+
+    def test_summary_ignores_cancelled_and_old_sales(self, client, warehouse, product):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        StockService.add_stock(product, warehouse, 100)
+        items = [{'product': product, 'quantity': 1, 'unit_price': Decimal('80.00')}]
+        old = SalesService.create_sale(client, warehouse, items)
+        Sale.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=90))
+        cancelled = SalesService.create_sale(client, warehouse, items)
+        Sale.objects.filter(pk=cancelled.pk).update(status=Sale.Status.CANCELLED)
+        SalesService.create_sale(client, warehouse, items)
+
+        summary = SalesService.get_product_summary(product, period_days=30)
+
+        assert summary['units_sold'] == 2
+        assert summary['period_units_sold'] == 1
+        assert summary['period_revenue'] == Decimal('80.00')
+
+    def test_summary_without_sales(self, product):
+        summary = SalesService.get_product_summary(product)
+        assert summary['units_sold'] == 0
+        assert summary['revenue'] == Decimal('0.00')
+        assert summary['last_sale_at'] is None
+
+
+@pytest.mark.django_db
+class TestCancelSale:
+    def test_cancel_returns_stock(self, client, warehouse, product):
+        StockService.add_stock(product, warehouse, 10)
+        sale = SalesService.create_sale(client, warehouse, [
+            {'product': product, 'quantity': 3, 'unit_price': Decimal('100.00')}
+        ])
+
+        SalesService.cancel_sale(sale, reason='Desistência')
+
+        sale.refresh_from_db()
+        assert sale.status == Sale.Status.CANCELLED
+        assert 'Desistência' in sale.notes
+        assert StockService.get_balance(product, warehouse) == 10
+
+    def test_cancel_twice_raises(self, client, warehouse, product):
+        StockService.add_stock(product, warehouse, 10)
+        sale = SalesService.create_sale(client, warehouse, [
+            {'product': product, 'quantity': 1, 'unit_price': Decimal('100.00')}
+        ])
+        SalesService.cancel_sale(sale)
+
+        with pytest.raises(InvalidStatusTransitionError):
+            SalesService.cancel_sale(sale)
+        assert StockService.get_balance(product, warehouse) == 10
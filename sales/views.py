@@ -1,10 +1,13 @@
-from django.shortcuts import render, get_object_or_404
-from django.http import HttpResponse, JsonResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, render
+from django.http import Http404, HttpResponse, JsonResponse
 from decimal import Decimal
+import uuid
 
 from catalog.models import Product
 from stock.models import Warehouse
+from core.exceptions import IdempotencyConflictError
 from core.models import Client
+from .models import Sale
 from .services import SalesService
 from stock.services import StockService
 
@@ -16,24 +19,41 @@ def _cart_context(request):
     return cart, cart_total
 
 
+def _checkout_key(request):
+    """Helper: retorna a chave de idempotência enviada no checkout."""
+    return request.POST.get('idempotency_key') or request.headers.get('Idempotency-Key')
+
+
+def _render_sale_success(request, sale):
+    """Helper: renderiza o resumo da venda com uma nova chave para a próxima."""
+    return render(request, 'sales/partials/sale_success.html', {
+        'sale': sale,
+        'next_checkout_key': uuid.uuid4().hex,
+    })
+
+
 def pdv(request):
     """Tela principal do PDV."""
     warehouses = Warehouse.objects.all()
-    clients = Client.objects.all()
 
     cart, cart_total = _cart_context(request)
 
     context = {
         'warehouses': warehouses,
-        'clients': clients,
         'cart': cart,
         'cart_total': cart_total,
+        'checkout_key': uuid.uuid4().hex,
     }
     return render(request, 'sales/pdv.html', context)
 
 
-def product_search(request):
-    """Busca produtos para adicionar ao carrinho (HTMX)."""
+async def product_search(request):
+    """
+    Busca produtos para adicionar ao carrinho (HTMX).
+
+    Assíncrona: é chamada a cada tecla digitada no PDV, então não deve
+    prender um worker enquanto espera o banco.
+    """
     query = request.GET.get('q', '')
     warehouse_id = request.GET.get('warehouse')
 
@@ -42,31 +62,30 @@ def product_search(request):
     if query:
         products = products.filter(name__icontains=query) | products.filter(sku__icontains=query)
 
-    products = products[:10]
-
-    # Adicionar info de estoque
-    results = []
-    for product in products:
-        stock = 0
-        if warehouse_id:
-            stock = StockService.get_balance(product, Warehouse.objects.get(id=warehouse_id))
-        results.append({
-            'product': product,
-            'stock': stock,
-        })
+    products = [product async for product in products[:10]]
+
+    # Adicionar info de estoque (uma única query para todos os produtos)
+    balances = {}
+    if warehouse_id and products:
+        balances = await StockService.aget_balances(products, warehouse_id)
+
+    results = [
+        {'product': product, 'stock': balances.get(product.id, 0)}
+        for product in products
+    ]
 
     return render(request, 'sales/partials/product_search_results.html', {'results': results})
 
 
-def cart_add(request):
-    """Adiciona item ao carrinho (HTMX)."""
+async def cart_add(request):
+    """Adiciona item ao carrinho (HTMX, assíncrona)."""
     if request.method == 'POST':
         product_id = request.POST.get('product_id')
         quantity = int(request.POST.get('quantity', 1))
 
-        product = get_object_or_404(Product, pk=product_id)
+        product = await aget_object_or_404(Product, pk=product_id)
 
-        cart = request.session.get('cart', [])
+        cart = await request.session.aget('cart', [])
 
         # Verifica se já existe no carrinho
         for item in cart:
@@ -84,8 +103,7 @@ def cart_add(request):
                 'total': str(product.price * quantity),
             })
 
-        request.session['cart'] = cart
-        request.session.modified = True
+        await request.session.aset('cart', cart)
 
         cart_total = sum(Decimal(item['total']) for item in cart)
 
@@ -97,16 +115,15 @@ def cart_add(request):
     return HttpResponse(status=400)
 
 
-def cart_remove(request):
-    """Remove um item do carrinho por product_id (HTMX)."""
+async def cart_remove(request):
+    """Remove um item do carrinho por product_id (HTMX, assíncrona)."""
     if request.method == 'POST':
         product_id = request.POST.get('product_id')
-        cart = request.session.get('cart', [])
+        cart = await request.session.aget('cart', [])
 
         cart = [item for item in cart if item['product_id'] != str(product_id)]
 
-        request.session['cart'] = cart
-        request.session.modified = True
+        await request.session.aset('cart', cart)
 
         cart_total = sum(Decimal(item['total']) for item in cart)
 
@@ -118,8 +135,8 @@ def cart_remove(request):
     return HttpResponse(status=400)
 
 
-def cart_update(request):
-    """Atualiza a quantidade de um item no carrinho (HTMX)."""
+async def cart_update(request):
+    """Atualiza a quantidade de um item no carrinho (HTMX, assíncrona)."""
     if request.method == 'POST':
         product_id = request.POST.get('product_id')
         try:
@@ -130,7 +147,7 @@ def cart_update(request):
         if quantity <= 0:
             return HttpResponse('Quantidade deve ser maior que zero', status=400)
 
-        cart = request.session.get('cart', [])
+        cart = await request.session.aget('cart', [])
 
         for item in cart:
             if item['product_id'] == str(product_id):
@@ -138,8 +155,7 @@ def cart_update(request):
                 item['total'] = str(Decimal(item['unit_price']) * quantity)
                 break
 
-        request.session['cart'] = cart
-        request.session.modified = True
+        await request.session.aset('cart', cart)
 
         cart_total = sum(Decimal(item['total']) for item in cart)
 
@@ -151,11 +167,10 @@ def cart_update(request):
     return HttpResponse(status=400)
 
 
-def cart_clear(request):
-    """Limpa todos os itens do carrinho (HTMX)."""
+async def cart_clear(request):
+    """Limpa todos os itens do carrinho (HTMX, assíncrona)."""
     if request.method == 'POST':
-        request.session['cart'] = []
-        request.session.modified = True
+        await request.session.aset('cart', [])
 
         return render(request, 'sales/partials/cart_items.html', {
             'cart': [],
@@ -166,8 +181,21 @@ def cart_clear(request):
 
 
 def sale_complete(request):
-    """Finaliza a venda."""
+    """
+    Finaliza a venda.
+
+    Aceita uma chave de idempotência (campo idempotency_key ou header
+    Idempotency-Key). Um reenvio com a mesma chave devolve a venda já
+    registrada, sem criar outra nem baixar o estoque de novo.
+    """
     if request.method == 'POST':
+        idempotency_key = _checkout_key(request)
+        if idempotency_key and len(idempotency_key) > Sale._meta.get_field('idempotency_key').max_length:
+            return HttpResponse('Chave de idempotência inválida', status=400)
+        existing = SalesService.find_by_idempotency_key(idempotency_key)
+        if existing is not None:
+            return _render_sale_success(request, existing)
+
         cart = request.session.get('cart', [])
 
         if not cart:
@@ -182,10 +210,13 @@ def sale_complete(request):
         client = get_object_or_404(Client, pk=client_id)
         warehouse = get_object_or_404(Warehouse, pk=warehouse_id)
 
-        # Montar items_data
+        # Montar items_data (produtos do carrinho carregados de uma vez)
+        products = Product.objects.in_bulk([item['product_id'] for item in cart])
         items_data = []
         for item in cart:
-            product = Product.objects.get(pk=item['product_id'])
+            product = products.get(uuid.UUID(item['product_id']))
+            if product is None:
+                raise Http404('Produto não encontrado')
             items_data.append({
                 'product': product,
                 'quantity': item['quantity'],
@@ -193,13 +224,17 @@ def sale_complete(request):
             })
 
         try:
-            sale = SalesService.create_sale(client, warehouse, items_data)
+            sale = SalesService.create_sale(
+                client, warehouse, items_data, idempotency_key=idempotency_key
+            )
 
             # Limpar carrinho
             request.session['cart'] = []
             request.session.modified = True
 
-            return render(request, 'sales/partials/sale_success.html', {'sale': sale})
+            return _render_sale_success(request, sale)
+        except IdempotencyConflictError as e:
+            return HttpResponse(f'Erro: {str(e)}', status=409)
         except Exception as e:
             return HttpResponse(f'Erro: {str(e)}', status=400)
 
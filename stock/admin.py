@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Warehouse, Stock, StockMovement
+from .models import ReportSnapshot, Warehouse, Stock, StockMovement, StockMovementArchive
 
 @admin.register(Warehouse)
 class WarehouseAdmin(admin.ModelAdmin):
@@ -22,4 +22,33 @@ class StockMovementAdmin(admin.ModelAdmin):
     # Regra de Segurança: Movimentações não devem ser editadas, apenas criadas.
     # Se errou, faz uma movimentação de ajuste inversa.
     def has_change_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(StockMovementArchive)
+class StockMovementArchiveAdmin(admin.ModelAdmin):
+    list_display = ('month', 'rows', 'sha256', 'created_at')
+    exclude = ('payload',)
+    readonly_fields = ('month', 'rows', 'sha256')
+
+    # Arquivos são gerados apenas pelo comando archive_movements
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ReportSnapshot)
+class ReportSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'key', 'period', 'updated_at')
+    list_filter = ('kind',)
+    exclude = ('rows',)
+    readonly_fields = ('kind', 'key', 'period')
+
+    # Gravados apenas pela tarefa stock.build_reports
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,226 @@
+"""
+Eventos de alteração de saldo de estoque (Server-Sent Events).
+
+Cada alteração de saldo (signal de StockMovement) publica, após o commit,
+apenas a linha alterada: id do saldo, produto, depósito, quantidade,
+ponto de pedido e nível. A tela de estoque assina o stream SSE e corrige
+só a linha correspondente, sem recarregar a tabela.
+
+Backends (setting STOCK_EVENTS_BACKEND):
+    - 'postgres': NOTIFY no canal `stock_changes`; cada processo mantém
+      uma única conexão em LISTEN (thread) que repassa aos assinantes.
+      Todos os workers/servidores recebem os eventos.
+    - 'local': entrega em memória, só para assinantes do mesmo processo
+      (desenvolvimento, SQLite).
+    - 'auto' (padrão): 'postgres' se o banco for PostgreSQL, senão 'local'.
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import select
+import threading
+from time import monotonic, sleep
+
+from django.conf import settings
+from django.db import connection, transaction
+
+
+logger = logging.getLogger('bikeshop.events')
+
+CHANNEL = 'stock_changes'
+
+
+def stock_payload(stock) -> dict:
+    """Dados enviados ao navegador para corrigir uma linha da tabela."""
+    if stock.is_critical:
+        level = 'critical'
+    elif stock.is_low:
+        level = 'low'
+    else:
+        level = 'ok'
+    return {
+        'id': str(stock.id),
+        'product': str(stock.product_id),
+        'warehouse': str(stock.warehouse_id),
+        'quantity': stock.quantity,
+        'reorder_point': stock.reorder_point,
+        'level': level,
+    }
+
+
+def publish_stock_change(stock) -> None:
+    """Publica a alteração de saldo quando a transação atual for confirmada."""
+    payload = json.dumps(stock_payload(stock))
+    transaction.on_commit(lambda: get_broker().publish(payload))
+
+
+class QueueSubscriber:
+    """Assinante síncrono (stream servido por WSGI)."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def put(self, payload: str) -> None:
+        self.queue.put(payload)
+
+
+class AsyncQueueSubscriber:
+    """Assinante async (stream servido por ASGI); recebe de qualquer thread."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    def put(self, payload: str) -> None:
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, payload)
+
+
+class LocalBroker:
+    """Distribui eventos para os assinantes do próprio processo."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscriber) -> None:
+        with self._lock:
+            self._subscribers.add(subscriber)
+
+    def unsubscribe(self, subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def dispatch(self, payload: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.put(payload)
+
+    def publish(self, payload: str) -> None:
+        self.dispatch(payload)
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Publica com NOTIFY e recebe com LISTEN.
+
+    A conexão de LISTEN é dedicada (fora das conexões do Django) e única
+    por processo, independentemente do número de navegadores conectados.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def publish(self, payload: str) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+
+    def subscribe(self, subscriber) -> None:
+        super().subscribe(subscriber)
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name='stock-events-listener', daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                # Conexão direta: com DB_POOL ela ficaria presa ao pool
+                conn = connection.Database.connect(**connection.get_connection_params())
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                try:
+                    while True:
+                        ready, _, _ = select.select([conn], [], [], 5)
+                        if ready:
+                            for payload in self._drain(conn):
+                                self.dispatch(payload)
+                finally:
+                    conn.close()
+            except Exception:
+                logger.exception('Conexão LISTEN perdida; reconectando')
+                sleep(1)
+
+    @staticmethod
+    def _drain(conn):
+        if hasattr(conn, 'poll'):  # psycopg2
+            conn.poll()
+            while conn.notifies:
+                yield conn.notifies.pop(0).payload
+        else:  # psycopg 3
+            for notify in conn.notifies(timeout=0):
+                yield notify.payload
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> LocalBroker:
+    """Retorna o broker do processo, conforme STOCK_EVENTS_BACKEND."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            backend = settings.STOCK_EVENTS_BACKEND
+            if backend == 'auto':
+                backend = 'postgres' if connection.vendor == 'postgresql' else 'local'
+            _broker = PostgresBroker() if backend == 'postgres' else LocalBroker()
+        return _broker
+
+
+def _message(payload: str) -> str:
+    return f'event: stock\ndata: {payload}\n\n'
+
+
+def event_stream(keepalive: float | None = None, max_seconds: float | None = None):
+    """
+    Stream SSE síncrono (um thread por conexão; usado sob WSGI).
+
+    Encerra após `max_seconds` (STOCK_EVENTS_MAX_SECONDS) para devolver a
+    thread ao servidor; o navegador reconecta sozinho após o `retry`.
+    """
+    keepalive = keepalive or settings.STOCK_EVENTS_KEEPALIVE_SECONDS
+    if max_seconds is None:
+        max_seconds = settings.STOCK_EVENTS_MAX_SECONDS
+    deadline = monotonic() + max_seconds if max_seconds else None
+    broker = get_broker()
+    subscriber = QueueSubscriber()
+    broker.subscribe(subscriber)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            timeout = keepalive
+            if deadline is not None:
+                timeout = min(timeout, deadline - monotonic())
+                if timeout <= 0:
+                    return
+            try:
+                yield _message(subscriber.queue.get(timeout=timeout))
+            except queue.Empty:
+                # Comentário SSE: mantém a conexão viva em proxies
+                yield ': keepalive\n\n'
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+async def aevent_stream(keepalive: float | None = None):
+    """Stream SSE async (sem thread por conexão; usado sob ASGI)."""
+    keepalive = keepalive or settings.STOCK_EVENTS_KEEPALIVE_SECONDS
+    broker = get_broker()
+    subscriber = AsyncQueueSubscriber()
+    broker.subscribe(subscriber)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            try:
+                yield _message(await asyncio.wait_for(subscriber.queue.get(), keepalive))
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+    finally:
+        broker.unsubscribe(subscriber)
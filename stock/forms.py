@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 
 from .models import Warehouse, Stock
 from catalog.models import Product
+from core.widgets import AutocompleteWidget
 
 class StockAdjustmentForm(forms.Form):
     """
@@ -17,11 +18,12 @@ class StockAdjustmentForm(forms.Form):
         empty_label="Selecione o Depósito"
     )
     
+    # Busca remota: o catálogo inteiro não é renderizado; a validação
+    # resolve apenas o id enviado
     product = forms.ModelChoiceField(
-        queryset=Product.objects.all().order_by('name'),
+        queryset=Product.objects.all(),
         label="Produto",
-        widget=forms.Select(attrs={'class': 'form-control select2'}), # select2 para busca se possível
-        empty_label="Selecione o Produto"
+        widget=AutocompleteWidget('produtos', attrs={'class': 'form-control'}),
     )
     
     new_quantity = forms.IntegerField(
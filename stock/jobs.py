@@ -0,0 +1,35 @@
+"""
+Tarefas em segundo plano do estoque (executadas pelo `manage.py run_worker`).
+"""
+
+from core.jobs import task
+from stock.services import ReplenishmentService, ReportService
+
+
+@task('stock.refresh_replenishment')
+def refresh_replenishment(job, full=False):
+    """Recalcula giro e ponto de pedido (ver ReplenishmentService.refresh)."""
+    job.progress(0, 'Calculando giro de vendas')
+    updated = ReplenishmentService.refresh(full=full)
+    return {'updated': updated}
+
+
+@task('stock.build_reports')
+def build_reports(job, periods=None):
+    """Grava valorização e curva ABC dos períodos (ver ReportService e manage.py build_reports)."""
+    periods = periods or [None]
+    steps = len(ReportService.VALUATION_GROUPS) + len(periods)
+    done = 0
+
+    for group_by in ReportService.VALUATION_GROUPS:
+        job.progress(done * 100 // steps, f'Valorização por {group_by}')
+        ReportService.valuation(group_by, refresh=True)
+        done += 1
+
+    for period in periods:
+        start, end = ReportService.month_range(period)
+        job.progress(done * 100 // steps, f'Curva ABC {start:%Y-%m}')
+        ReportService.abc_classification(start, end, refresh=True)
+        done += 1
+
+    return {'reports': steps}
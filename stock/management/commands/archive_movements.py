@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from stock.services import MovementPartitionService
+
+
+class Command(BaseCommand):
+    help = (
+        'Arquiva as movimentações de estoque mais antigas que N anos: cada '
+        'mês vira um CSV compactado (gzip) e sai da tabela quente.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--years', type=int, default=settings.STOCK_MOVEMENT_ARCHIVE_YEARS,
+            help='Arquiva meses anteriores a este número de anos'
+        )
+        parser.add_argument(
+            '--to', dest='destination', choices=MovementPartitionService.ARCHIVE_DESTINATIONS,
+            default='table', help='table (StockMovementArchive) ou file'
+        )
+        parser.add_argument('--dir', help='Diretório dos arquivos (padrão: STOCK_MOVEMENT_ARCHIVE_DIR)')
+        parser.add_argument('--database', default='default', help='Alias do banco')
+        parser.add_argument('--dry-run', action='store_true', help='Só lista os meses')
+
+    def handle(self, *args, **options):
+        if options['years'] < 1:
+            raise CommandError('--years deve ser maior que zero.')
+
+        using = options['database']
+        months = MovementPartitionService.archivable_months(options['years'], using)
+        if not months:
+            self.stdout.write('Nenhum mês a arquivar.')
+            return
+
+        if options['dry_run']:
+            for month in months:
+                self.stdout.write(f'{month:%m/%Y}')
+            return
+
+        total = 0
+        for month in months:
+            try:
+                result = MovementPartitionService.archive_month(
+                    month, options['destination'], options['dir'], using
+                )
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            total += result['rows']
+            self.stdout.write(f'{month:%m/%Y}: {result["rows"]} movimentações -> {result["location"]}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(months)} meses arquivados ({total} movimentações).'
+        ))
@@ -0,0 +1,38 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from stock.services import ReportService
+
+
+class Command(BaseCommand):
+    help = (
+        'Pré-calcula os relatórios de fechamento (valorização de estoque e '
+        'curva ABC) por mês, fora do ciclo das requisições. Agende diariamente: '
+        'a última execução de cada mês fica como a valorização de fechamento.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period', action='append', default=[],
+            help='Mês da curva ABC no formato AAAA-MM (pode repetir; padrão: mês corrente)'
+        )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+
+        for group_by in ReportService.VALUATION_GROUPS:
+            rows = ReportService.valuation(group_by, refresh=True)
+            self.stdout.write(f'Valorização por {group_by}: {len(rows)} grupos')
+
+        for period in options['period'] or [None]:
+            try:
+                period_start, period_end = ReportService.month_range(period)
+            except ValueError:
+                raise CommandError(f'Período inválido: {period} (use AAAA-MM)')
+            rows = ReportService.abc_classification(period_start, period_end, refresh=True)
+            self.stdout.write(f'Curva ABC {period_start:%Y-%m}: {len(rows)} produtos')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Relatórios gerados em {perf_counter() - start:.2f}s'
+        ))
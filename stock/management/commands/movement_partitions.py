@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from stock.services import MovementPartitionService
+
+
+class Command(BaseCommand):
+    help = (
+        'Cria as partições mensais de movimentações de estoque dos próximos '
+        'meses (PostgreSQL). Rodar mensalmente, antes da virada do mês.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=3, help='Meses à frente do corrente')
+        parser.add_argument('--database', default='default', help='Alias do banco')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if not MovementPartitionService.is_partitioned(using):
+            self.stdout.write(self.style.WARNING(
+                'Tabela de movimentações não particionada (requer PostgreSQL); nada a fazer.'
+            ))
+            return
+
+        created = MovementPartitionService.ensure_partitions(options['ahead'], using=using)
+        for name in created:
+            self.stdout.write(f'Criada: {name}')
+
+        partitions = MovementPartitionService.partitions(using)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(created)} partições criadas; {len(partitions)} mensais, '
+            f'de {min(partitions):%m/%Y} a {max(partitions):%m/%Y}.'
+        ))
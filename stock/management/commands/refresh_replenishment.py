@@ -0,0 +1,26 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from stock.services import ReplenishmentService
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula giro de vendas, ponto de pedido e quantidade sugerida de '
+        'compra por produto/depósito (incremental por padrão).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Recalcula todos os saldos em vez de apenas os afetados desde o último cálculo'
+        )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        updated = ReplenishmentService.refresh(full=options['full'])
+        mode = 'completo' if options['full'] else 'incremental'
+        self.stdout.write(self.style.SUCCESS(
+            f'Reposição ({mode}): {updated} saldos atualizados em {perf_counter() - start:.2f}s'
+        ))
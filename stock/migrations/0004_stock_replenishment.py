@@ -0,0 +1,38 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_product'),
+        ('stock', '0003_stockmovement_new_quantity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stock',
+            name='daily_velocity',
+            field=models.DecimalField(decimal_places=3, default=0, help_text='Unidades vendidas por dia (média das janelas de vendas)', max_digits=10, verbose_name='Giro Diário'),
+        ),
+        migrations.AddField(
+            model_name='stock',
+            name='reorder_point',
+            field=models.IntegerField(default=10, help_text='Abaixo deste saldo o item é considerado com estoque baixo', verbose_name='Ponto de Pedido'),
+        ),
+        migrations.AddField(
+            model_name='stock',
+            name='reorder_quantity',
+            field=models.IntegerField(default=0, verbose_name='Quantidade Sugerida de Compra'),
+        ),
+        migrations.AddField(
+            model_name='stock',
+            name='replenishment_updated_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Reposição Calculada em'),
+        ),
+        migrations.AddIndex(
+            model_name='stock',
+            index=models.Index(condition=models.Q(('quantity__lt', models.F('reorder_point'))), fields=['warehouse', 'quantity'], name='stock_below_reorder_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:40
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stock', '0004_stock_replenishment'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stock',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='warehouse',
+            name='id',
+            field=models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:20
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_alter_brand_id_alter_category_id_alter_product_id'),
+        ('stock', '0005_alter_stock_id_alter_stockmovement_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovementArchive',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('month', models.DateField(unique=True, verbose_name='Mês')),
+                ('rows', models.PositiveIntegerField(verbose_name='Movimentações')),
+                ('payload', models.BinaryField(verbose_name='CSV Compactado (gzip)')),
+                ('sha256', models.CharField(max_length=64, verbose_name='SHA-256 do Conteúdo')),
+            ],
+            options={
+                'verbose_name': 'Arquivo de Movimentações',
+                'verbose_name_plural': 'Arquivos de Movimentações',
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['product', '-created_at'], name='movement_product_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,126 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:25
+#
+# Particionamento declarativo (RANGE por mês de created_at) da tabela de
+# movimentações. Só roda no PostgreSQL; nos demais bancos é um no-op e a
+# tabela continua comum (ver stock.services.MovementPartitionService).
+#
+# A tabela é recriada como particionada e os dados são copiados:
+#   - a PK passa a ser (id, created_at), exigência do PostgreSQL para
+#     chaves únicas em tabelas particionadas (o Django continua usando id);
+#   - índices e FKs são recriados com os mesmos nomes;
+#   - partições mensais cobrem do mês mais antigo até 3 meses à frente,
+#     mais a partição DEFAULT para qualquer data fora das faixas.
+#
+# Indisponibilidade: o RENAME toma um lock ACCESS EXCLUSIVE que só é
+# liberado no commit da migração. Até lá, toda leitura e escrita em
+# movimentações (vendas, ajustes, histórico) fica bloqueada; o tempo cresce
+# com o tamanho da tabela (cópia + recriação dos índices). Rode em janela
+# de manutenção, com a aplicação e o run_worker parados. O limite de tempo
+# por comando é desligado só nesta transação (SET LOCAL).
+
+import re
+from datetime import datetime
+
+from django.db import migrations
+from django.utils import timezone
+
+
+TABLE = 'stock_stockmovement'
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def _bound(month):
+    return timezone.make_aware(datetime(month.year, month.month, 1))
+
+
+def _retarget(definition, old):
+    # Em tabela particionada o pg_indexes mostra "ON ONLY"; sem ONLY o
+    # índice é criado também em todas as partições
+    definition = definition.replace(' ON ONLY ', ' ON ')
+    return re.sub(rf' ON (public\.)?{old} ', f' ON {TABLE} ', definition)
+
+
+def _definitions(cursor, table):
+    """Índices (exceto a PK) e FKs de `table`, para recriar na tabela nova."""
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'p')",
+        [table, table],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    return indexes, cursor.fetchall()
+
+
+def _swap(schema_editor, partitioned):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    old = f'{TABLE}_old'
+    with schema_editor.connection.cursor() as cursor:
+        # A cópia pode passar de qualquer statement_timeout configurado
+        cursor.execute('SET LOCAL statement_timeout = 0')
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {old}')
+        indexes, foreign_keys = _definitions(cursor, old)
+
+        if partitioned:
+            cursor.execute(
+                f'CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+                f'PARTITION BY RANGE (created_at)'
+            )
+            cursor.execute(f'SELECT MIN(created_at) FROM {old}')
+            oldest = cursor.fetchone()[0]
+            current = timezone.localdate().replace(day=1)
+            month = timezone.localtime(oldest).date().replace(day=1) if oldest else current
+            while month <= _add_months(current, MONTHS_AHEAD):
+                cursor.execute(
+                    f'CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} '
+                    f'FOR VALUES FROM (%s) TO (%s)',
+                    [_bound(month), _bound(_add_months(month, 1))],
+                )
+                month = _add_months(month, 1)
+            cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+            primary_key = '(id, created_at)'
+        else:
+            cursor.execute(
+                f'CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+            )
+            primary_key = '(id)'
+
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {old}')
+        # DROP libera os nomes dos índices (e remove as partições, na volta)
+        cursor.execute(f'DROP TABLE {old} CASCADE')
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY {primary_key}')
+        for name, definition in indexes:
+            cursor.execute(_retarget(definition, old))
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+
+
+def partition(apps, schema_editor):
+    _swap(schema_editor, partitioned=True)
+
+
+def unpartition(apps, schema_editor):
+    _swap(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stock', '0006_stockmovementarchive_movement_product_recent_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
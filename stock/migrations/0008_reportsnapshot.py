@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-19 20:30
+
+import core.ids
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stock', '0007_partition_stockmovement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.new_id, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('kind', models.CharField(choices=[('valuation', 'Valorização de Estoque'), ('abc', 'Curva ABC')], max_length=20, verbose_name='Relatório')),
+                ('key', models.CharField(blank=True, max_length=50, verbose_name='Agrupamento')),
+                ('period', models.DateField(verbose_name='Mês')),
+                ('rows', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Linhas')),
+            ],
+            options={
+                'verbose_name': 'Fechamento de Relatório',
+                'verbose_name_plural': 'Fechamentos de Relatórios',
+                'ordering': ['-period', 'kind', 'key'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'key', 'period'), name='report_snapshot_unique')],
+            },
+        ),
+    ]
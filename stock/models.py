@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from core.models import ModelBase
 from catalog.models import Product
@@ -29,16 +30,56 @@ class Stock(ModelBase):
     )
     quantity = models.IntegerField(default=0, verbose_name="Quantidade")
 
+    # Reposição: calculados pelo ReplenishmentService a partir das vendas
+    daily_velocity = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        default=0,
+        verbose_name="Giro Diário",
+        help_text="Unidades vendidas por dia (média das janelas de vendas)"
+    )
+    reorder_point = models.IntegerField(
+        default=10,
+        verbose_name="Ponto de Pedido",
+        help_text="Abaixo deste saldo o item é considerado com estoque baixo"
+    )
+    reorder_quantity = models.IntegerField(
+        default=0,
+        verbose_name="Quantidade Sugerida de Compra"
+    )
+    replenishment_updated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Reposição Calculada em"
+    )
+
     class Meta:
         verbose_name = "Estoque"
         verbose_name_plural = "Estoques"
         # Garante que não haja duplicidade de produto no mesmo depósito
         unique_together = [['product', 'warehouse']] 
         ordering = ['product__name']
+        indexes = [
+            # Índice parcial: telas de baixo estoque leem apenas estas linhas
+            models.Index(
+                fields=['warehouse', 'quantity'],
+                condition=models.Q(quantity__lt=models.F('reorder_point')),
+                name='stock_below_reorder_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.product} em {self.warehouse}: {self.quantity}"
 
+    @property
+    def is_low(self) -> bool:
+        return self.quantity < self.reorder_point
+
+    @property
+    def is_critical(self) -> bool:
+        """Abaixo da metade do ponto de pedido."""
+        return self.quantity * 2 < self.reorder_point
+
 class StockMovement(ModelBase):
     class MovementType(models.TextChoices):
         IN = 'IN', 'Entrada'
@@ -97,6 +138,62 @@ class StockMovement(ModelBase):
         verbose_name = "Movimentação de Estoque"
         verbose_name_plural = "Movimentações de Estoque"
         ordering = ['-created_at']
+        indexes = [
+            # Histórico recente por produto; no PostgreSQL a tabela é
+            # particionada por mês de created_at (migração 0007)
+            models.Index(fields=['product', '-created_at'], name='movement_product_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_movement_type_display()} - {self.product.sku} ({self.quantity})"
+
+
+class StockMovementArchive(ModelBase):
+    """
+    Movimentações de um mês retiradas da tabela quente (arquivamento).
+
+    O conteúdo é o CSV do mês compactado com gzip (uma linha por
+    movimentação, colunas de StockMovement). Os saldos em Stock não
+    dependem do histórico, então arquivar não altera o estoque.
+    """
+    month = models.DateField(unique=True, verbose_name="Mês")
+    rows = models.PositiveIntegerField(verbose_name="Movimentações")
+    payload = models.BinaryField(verbose_name="CSV Compactado (gzip)")
+    sha256 = models.CharField(max_length=64, verbose_name="SHA-256 do Conteúdo")
+
+    class Meta:
+        verbose_name = "Arquivo de Movimentações"
+        verbose_name_plural = "Arquivos de Movimentações"
+        ordering = ['-month']
+
+    def __str__(self):
+        return f"Movimentações de {self.month:%m/%Y} ({self.rows})"
+
+class ReportSnapshot(ModelBase):
+    """
+    Resultado de um relatório de fechamento (ReportService) por período.
+
+    Gravado pela tarefa stock.build_reports e lido pelas views, que não
+    calculam na requisição. Fica no banco, e não no cache, para ser visto
+    por todos os processos (web e worker) e para que o fechamento de um
+    mês continue disponível depois que o mês acaba.
+    """
+    class Kind(models.TextChoices):
+        VALUATION = 'valuation', 'Valorização de Estoque'
+        ABC = 'abc', 'Curva ABC'
+
+    kind = models.CharField(max_length=20, choices=Kind.choices, verbose_name="Relatório")
+    key = models.CharField(max_length=50, blank=True, verbose_name="Agrupamento")
+    period = models.DateField(verbose_name="Mês")
+    rows = models.JSONField(default=list, encoder=DjangoJSONEncoder, verbose_name="Linhas")
+
+    class Meta:
+        verbose_name = "Fechamento de Relatório"
+        verbose_name_plural = "Fechamentos de Relatórios"
+        ordering = ['-period', 'kind', 'key']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'key', 'period'], name='report_snapshot_unique'),
+        ]
 
     def __str__(self):
-        return f"{self.get_movement_type_display()} - {self.product.sku} ({self.quantity})"
\ No newline at end of file
+        return f"{self.get_kind_display()} {self.key} {self.period:%m/%Y}".replace('  ', ' ')
@@ -1,3 +1,6 @@
 from .stock_service import StockService
+from .replenishment_service import ReplenishmentService
+from .report_service import ReportService
+from .partition_service import MovementPartitionService
 
-__all__ = ["StockService"]
+__all__ = ["StockService", "ReplenishmentService", "ReportService", "MovementPartitionService"]
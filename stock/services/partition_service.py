@@ -0,0 +1,334 @@
+"""
+MovementPartitionService - Partições mensais e arquivamento de StockMovement.
+
+No PostgreSQL a tabela de movimentações é particionada por mês de
+created_at (migração stock 0007): cada mês fica numa partição
+`stock_stockmovement_pAAAAMM`, e uma partição DEFAULT recebe datas fora
+das faixas criadas. Consultas com limite inferior em created_at (ver
+`hot_since`) leem só as partições recentes.
+
+Manutenção (`manage.py movement_partitions`): cria as partições dos
+próximos meses antes de serem necessárias, movendo para elas linhas que
+tenham caído na DEFAULT.
+
+Arquivamento (`manage.py archive_movements`): meses mais antigos que N
+anos saem da tabela quente e viram um CSV compactado (gzip), gravado em
+StockMovementArchive ou em arquivo. O CSV é compactado direto para um
+arquivo temporário (o hash é calculado no caminho); em arquivo, ele só
+ganha o nome final após o commit. Com partição, o mês é removido com
+DETACH + DROP (sem DELETE e sem inchaço); nos demais bancos, com DELETE.
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import os
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core.cache_keys import touch_model
+from stock.models import StockMovement, StockMovementArchive
+
+
+class _HashingWriter:
+    """Repassa as escritas a um arquivo binário calculando o SHA-256 e o tamanho."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class MovementPartitionService:
+    """
+    Serviço de particionamento e arquivamento do razão de movimentações.
+    """
+
+    TABLE = StockMovement._meta.db_table
+    DEFAULT_PARTITION = f'{TABLE}_default'
+    ARCHIVE_DESTINATIONS = ('table', 'file')
+
+    @staticmethod
+    def add_months(month: date, count: int) -> date:
+        index = month.year * 12 + month.month - 1 + count
+        return date(index // 12, index % 12 + 1, 1)
+
+    @staticmethod
+    def month_bounds(month: date) -> tuple[datetime, datetime]:
+        """Início e fim (exclusivo) do mês no fuso do projeto."""
+        start = timezone.make_aware(datetime(month.year, month.month, 1))
+        end_month = MovementPartitionService.add_months(month, 1)
+        return start, timezone.make_aware(datetime(end_month.year, end_month.month, 1))
+
+    @staticmethod
+    def partition_name(month: date) -> str:
+        return f'{MovementPartitionService.TABLE}_p{month:%Y%m}'
+
+    @staticmethod
+    def hot_since(months: int | None = None) -> datetime:
+        """
+        Limite inferior das consultas de histórico recente.
+
+        Alinhado ao início de mês, para que o filtro `created_at >=` leia
+        exatamente as `months` partições mais novas.
+        """
+        months = months or settings.STOCK_MOVEMENT_HOT_MONTHS
+        current = timezone.localdate().replace(day=1)
+        start, _ = MovementPartitionService.month_bounds(
+            MovementPartitionService.add_months(current, 1 - months)
+        )
+        return start
+
+    @staticmethod
+    def is_partitioned(using: str = 'default') -> bool:
+        connection = connections[using]
+        if connection.vendor != 'postgresql':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass',
+                [MovementPartitionService.TABLE],
+            )
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def partitions(using: str = 'default') -> dict[date, str]:
+        """Partições mensais existentes: {mês: nome da tabela}."""
+        if not MovementPartitionService.is_partitioned(using):
+            return {}
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+                'WHERE i.inhparent = %s::regclass',
+                [MovementPartitionService.TABLE],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+        prefix = f'{MovementPartitionService.TABLE}_p'
+        return {
+            datetime.strptime(name[len(prefix):], '%Y%m').date(): name
+            for name in names if name.startswith(prefix)
+        }
+
+    @staticmethod
+    def months_to_cover(months_ahead: int = 3, since: date | None = None) -> set[date]:
+        """Meses, de `since` (ou do corrente) até `months_ahead` à frente."""
+        current = timezone.localdate().replace(day=1)
+        month = since.replace(day=1) if since else current
+        months = set()
+        while month <= MovementPartitionService.add_months(current, months_ahead):
+            months.add(month)
+            month = MovementPartitionService.add_months(month, 1)
+        return months
+
+    @staticmethod
+    def ensure_partitions(
+        months_ahead: int = 3, since: date | None = None, using: str = 'default'
+    ) -> list[str]:
+        """
+        Cria as partições do mês corrente até `months_ahead` meses à frente,
+        dos meses desde `since` (carga de histórico) e dos meses que já
+        tenham linhas na partição DEFAULT.
+
+        A partição nova é criada fora da tabela, recebe as linhas do mês que
+        estavam na DEFAULT e só então é anexada (ATTACH falharia com linhas
+        do mês ainda na DEFAULT).
+
+        Returns:
+            Nomes das partições criadas
+        """
+        if not MovementPartitionService.is_partitioned(using):
+            return []
+
+        table = MovementPartitionService.TABLE
+        default = MovementPartitionService.DEFAULT_PARTITION
+        existing = MovementPartitionService.partitions(using)
+        wanted = MovementPartitionService.months_to_cover(months_ahead, since)
+
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE %s)::date FROM {default}",
+                [timezone.get_current_timezone_name()],
+            )
+            wanted.update(row[0] for row in cursor.fetchall())
+
+        created = []
+        for month in sorted(wanted - set(existing)):
+            name = MovementPartitionService.partition_name(month)
+            start, end = MovementPartitionService.month_bounds(month)
+            with transaction.atomic(using=using), connections[using].cursor() as cursor:
+                cursor.execute(
+                    f'CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+                )
+                cursor.execute(
+                    f'WITH moved AS (DELETE FROM {default} '
+                    f'WHERE created_at >= %s AND created_at < %s RETURNING *) '
+                    f'INSERT INTO {name} SELECT * FROM moved',
+                    [start, end],
+                )
+                cursor.execute(
+                    f'ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)',
+                    [start, end],
+                )
+            created.append(name)
+        return created
+
+    @staticmethod
+    def archivable_months(older_than_years: int, using: str = 'default') -> list[date]:
+        """Meses com movimentações anteriores ao corte de `older_than_years` anos."""
+        cutoff = MovementPartitionService.add_months(
+            timezone.localdate().replace(day=1), -12 * older_than_years
+        )
+        start, _ = MovementPartitionService.month_bounds(cutoff)
+        return list(
+            StockMovement.objects.using(using)
+            .filter(created_at__lt=start)
+            .dates('created_at', 'month')
+        )
+
+    @staticmethod
+    def _write_csv(stream, start: datetime, end: datetime, using: str) -> int:
+        """Grava as movimentações do intervalo em CSV no `stream` binário."""
+        columns = [field.attname for field in StockMovement._meta.concrete_fields]
+        rows = (
+            StockMovement.objects.using(using)
+            .filter(created_at__gte=start, created_at__lt=end)
+            .order_by('created_at')
+            .values_list(*columns)
+            .iterator(chunk_size=5000)
+        )
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        writer = csv.writer(text)
+        writer.writerow(columns)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        text.flush()
+        text.detach()
+        return count
+
+    @staticmethod
+    def _drop_month(month: date, start: datetime, end: datetime, using: str) -> None:
+        partition = MovementPartitionService.partitions(using).get(month)
+        with connections[using].cursor() as cursor:
+            if partition:
+                cursor.execute(
+                    f'ALTER TABLE {MovementPartitionService.TABLE} DETACH PARTITION {partition}'
+                )
+                cursor.execute(f'DROP TABLE {partition}')
+            else:
+                cursor.execute(
+                    f'DELETE FROM {MovementPartitionService.TABLE} '
+                    f'WHERE created_at >= %s AND created_at < %s',
+                    [start, end],
+                )
+
+    @staticmethod
+    def archive_month(
+        month: date,
+        destination: str = 'table',
+        directory: Path | str | None = None,
+        using: str = 'default',
+    ) -> dict:
+        """
+        Arquiva um mês: exporta o CSV compactado e remove as linhas da
+        tabela quente, na mesma transação (um erro mantém o mês intacto).
+
+        Em arquivo, o CSV vai para um temporário no mesmo diretório,
+        renomeado após o commit. Na tabela, o mês compactado não pode
+        passar de STOCK_MOVEMENT_ARCHIVE_MAX_BYTES (ValueError).
+
+        Returns:
+            {'month', 'rows', 'sha256', 'location'}
+        """
+        if destination not in MovementPartitionService.ARCHIVE_DESTINATIONS:
+            raise ValueError(f'Destino de arquivamento inválido: {destination}')
+
+        start, end = MovementPartitionService.month_bounds(month)
+        path = None
+        if destination == 'file':
+            path = Path(directory or settings.STOCK_MOVEMENT_ARCHIVE_DIR)
+            path.mkdir(parents=True, exist_ok=True)
+            path = path / f'stock_movements_{month:%Y_%m}.csv.gz'
+            if path.exists():
+                raise ValueError(f'Arquivo já existe: {path}')
+
+        if path:
+            output = tempfile.NamedTemporaryFile(
+                dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp', delete=False
+            )
+        else:
+            output = tempfile.TemporaryFile()
+        hashed = _HashingWriter(output)
+        try:
+            with transaction.atomic(using=using):
+                with gzip.GzipFile(fileobj=hashed, mode='wb', mtime=0) as stream:
+                    count = MovementPartitionService._write_csv(stream, start, end, using)
+                digest = hashed.sha256.hexdigest()
+
+                if path:
+                    # Em disco antes de remover as linhas do banco
+                    output.flush()
+                    os.fsync(output.fileno())
+                    location = str(path)
+                else:
+                    if hashed.size > settings.STOCK_MOVEMENT_ARCHIVE_MAX_BYTES:
+                        raise ValueError(
+                            f'Mês {month:%Y-%m} compactado tem {hashed.size} bytes, acima de '
+                            'STOCK_MOVEMENT_ARCHIVE_MAX_BYTES: arquive em arquivo'
+                        )
+                    output.seek(0)
+                    StockMovementArchive.objects.using(using).create(
+                        month=month, rows=count, payload=output.read(), sha256=digest
+                    )
+                    location = StockMovementArchive._meta.db_table
+
+                MovementPartitionService._drop_month(month, start, end, using)
+        except Exception:
+            if path:
+                Path(output.name).unlink(missing_ok=True)
+            raise
+        finally:
+            output.close()
+
+        if path:
+            # Nome final só após o commit. Se a troca falhar, o temporário
+            # fica no diretório: as linhas já saíram do banco.
+            transaction.on_commit(lambda: os.replace(output.name, path), using=using)
+
+        touch_model(StockMovement)
+        return {'month': month, 'rows': count, 'sha256': digest, 'location': location}
+
+    @staticmethod
+    def archive(
+        older_than_years: int | None = None,
+        destination: str = 'table',
+        directory: Path | str | None = None,
+        using: str = 'default',
+    ) -> list[dict]:
+        """Arquiva todos os meses mais antigos que `older_than_years` anos."""
+        years = older_than_years or settings.STOCK_MOVEMENT_ARCHIVE_YEARS
+        return [
+            MovementPartitionService.archive_month(month, destination, directory, using)
+            for month in MovementPartitionService.archivable_months(years, using)
+        ]
+
+    @staticmethod
+    def read_archive(archive: StockMovementArchive) -> list[dict]:
+        """Linhas de um mês arquivado (auditoria)."""
+        content = gzip.decompress(bytes(archive.payload)).decode('utf-8')
+        return list(csv.DictReader(io.StringIO(content)))
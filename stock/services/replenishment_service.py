@@ -0,0 +1,175 @@
+"""
+ReplenishmentService - Giro de vendas e ponto de pedido por produto/depósito.
+
+Os parâmetros calculados ficam gravados na própria tabela Stock
+(daily_velocity, reorder_point, reorder_quantity), de modo que as telas
+de baixo estoque fazem apenas `quantity < reorder_point` sobre um
+índice parcial, sem agregar vendas na requisição.
+"""
+
+import math
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import F, Max, Q, Sum
+from django.utils import timezone
+
+from core.cache_keys import touch_model
+from stock.models import Stock
+
+
+class ReplenishmentService:
+    """
+    Serviço para cálculo de reposição de estoque.
+
+    O recálculo pode ser completo ou incremental. No modo incremental,
+    apenas os pares produto/depósito cujas janelas de vendas mudaram
+    desde o último cálculo são revisitados: vendas novas ou alteradas
+    (ex.: canceladas) e vendas que saíram da janela de análise.
+    """
+
+    BATCH_SIZE = 2000
+
+    @staticmethod
+    def _params() -> dict:
+        return {
+            'lookback': getattr(settings, 'REPLENISHMENT_LOOKBACK_DAYS', 90),
+            'short_window': getattr(settings, 'REPLENISHMENT_SHORT_WINDOW_DAYS', 28),
+            'lead_time': getattr(settings, 'REPLENISHMENT_LEAD_TIME_DAYS', 7),
+            'safety': getattr(settings, 'REPLENISHMENT_SAFETY_DAYS', 7),
+            'review': getattr(settings, 'REPLENISHMENT_REVIEW_DAYS', 30),
+            'min_reorder_point': getattr(settings, 'REPLENISHMENT_MIN_REORDER_POINT', 10),
+        }
+
+    @staticmethod
+    def compute(long_units: int, short_units: int, params: dict) -> tuple:
+        """
+        Calcula (giro diário, ponto de pedido, quantidade sugerida).
+
+        O giro é o maior entre a média da janela longa e a da curta:
+        reage rápido a um aumento de demanda e decai devagar.
+        """
+        velocity = max(
+            Decimal(long_units) / params['lookback'],
+            Decimal(short_units) / params['short_window'],
+        )
+        reorder_point = max(
+            params['min_reorder_point'],
+            math.ceil(velocity * (params['lead_time'] + params['safety'])),
+        )
+        reorder_quantity = math.ceil(velocity * params['review'])
+        return velocity.quantize(Decimal('0.001')), reorder_point, reorder_quantity
+
+    @staticmethod
+    def last_refresh() -> datetime | None:
+        """Momento do último recálculo (marca d'água do modo incremental)."""
+        return Stock.objects.aggregate(last=Max('replenishment_updated_at'))['last']
+
+    @staticmethod
+    def _sales_units(since: datetime, short_since: datetime, product_ids=None) -> dict:
+        """Unidades vendidas por (produto, depósito) nas janelas longa e curta."""
+        from sales.models import Sale, SaleItem
+
+        items = SaleItem.objects.filter(
+            sale__status=Sale.Status.COMPLETED,
+            sale__created_at__gte=since,
+        )
+        if product_ids is not None:
+            items = items.filter(product_id__in=product_ids)
+
+        rows = items.values('product_id', 'sale__warehouse_id').annotate(
+            long_units=Sum('quantity'),
+            short_units=Sum('quantity', filter=Q(sale__created_at__gte=short_since)),
+        )
+        return {
+            (row['product_id'], row['sale__warehouse_id']): (row['long_units'], row['short_units'] or 0)
+            for row in rows
+        }
+
+    @staticmethod
+    def _changed_pairs(watermark: datetime, now: datetime, params: dict) -> set:
+        """
+        Pares produto/depósito cujo cálculo pode ter mudado desde watermark.
+
+        - vendas criadas ou alteradas depois do último cálculo;
+        - vendas que saíram da janela longa ou da curta nesse intervalo.
+        """
+        from sales.models import SaleItem
+
+        changed = Q(sale__created_at__gte=watermark) | Q(sale__updated_at__gte=watermark)
+        for days in (params['lookback'], params['short_window']):
+            window = timedelta(days=days)
+            changed |= Q(
+                sale__created_at__gte=watermark - window,
+                sale__created_at__lt=now - window,
+            )
+        return set(
+            SaleItem.objects.filter(changed)
+            .values_list('product_id', 'sale__warehouse_id')
+            .distinct()
+        )
+
+    @staticmethod
+    def refresh(full: bool = False) -> int:
+        """
+        Recalcula giro, ponto de pedido e quantidade sugerida.
+
+        Args:
+            full: Recalcula todos os saldos, ignorando a marca d'água
+
+        Returns:
+            Quantidade de registros de Stock atualizados
+        """
+        params = ReplenishmentService._params()
+        now = timezone.now()
+        since = now - timedelta(days=params['lookback'])
+        short_since = now - timedelta(days=params['short_window'])
+
+        watermark = None if full else ReplenishmentService.last_refresh()
+        stocks = Stock.objects.only('id', 'product_id', 'warehouse_id').order_by('pk')
+
+        if watermark is None:
+            units = ReplenishmentService._sales_units(since, short_since)
+        else:
+            pairs = ReplenishmentService._changed_pairs(watermark, now, params)
+            if not pairs:
+                return 0
+            product_ids = {product_id for product_id, _ in pairs}
+            units = ReplenishmentService._sales_units(since, short_since, product_ids)
+            stocks = stocks.filter(product_id__in=product_ids)
+
+        updated = 0
+        batch = []
+        for stock in stocks.iterator(chunk_size=ReplenishmentService.BATCH_SIZE):
+            key = (stock.product_id, stock.warehouse_id)
+            if watermark is not None and key not in pairs:
+                continue
+            long_units, short_units = units.get(key, (0, 0))
+            stock.daily_velocity, stock.reorder_point, stock.reorder_quantity = (
+                ReplenishmentService.compute(long_units, short_units, params)
+            )
+            stock.replenishment_updated_at = now
+            batch.append(stock)
+            if len(batch) >= ReplenishmentService.BATCH_SIZE:
+                updated += ReplenishmentService._save(batch)
+                batch = []
+        updated += ReplenishmentService._save(batch)
+        return updated
+
+    @staticmethod
+    def _save(batch) -> int:
+        if not batch:
+            return 0
+        Stock.objects.bulk_update(
+            batch,
+            ['daily_velocity', 'reorder_point', 'reorder_quantity', 'replenishment_updated_at'],
+        )
+        # bulk_update não dispara signals: invalida os fragmentos de estoque
+        touch_model(Stock)
+        return len(batch)
+
+    @staticmethod
+    def low_stock():
+        """Saldos abaixo do ponto de pedido (usa o índice parcial)."""
+        return Stock.objects.filter(quantity__lt=F('reorder_point'))
@@ -0,0 +1,250 @@
+"""
+ReportService - Relatórios de fechamento: valorização de estoque e curva ABC.
+
+Toda a agregação acontece no banco (GROUP BY e funções de janela); o
+Python só formata o resultado. Os resultados são gravados por período em
+ReportSnapshot pela tarefa stock.build_reports (worker ou
+`manage.py build_reports`); as views só leem o que foi gravado, então o
+cálculo nunca roda dentro da requisição e todos os processos veem o
+mesmo fechamento. As consultas rodam na réplica de leitura, quando
+configurada (core.db_router), para não disputar o primário com o PDV.
+
+Períodos:
+    - valorização: foto do estoque atual, gravada no mês corrente. Cada
+      execução substitui a foto do mês em aberto; quando o mês vira, a
+      última foto fica como a valorização de fechamento daquele mês;
+    - curva ABC: receita das vendas do mês informado.
+
+O mês corrente é recalculado quando a foto passa de REPORT_CACHE_TIMEOUT
+segundos; meses fechados não expiram.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+from django.utils import timezone
+
+from core.db_router import use_replica
+from stock.models import ReportSnapshot, Stock
+
+
+class ReportService:
+    """
+    Serviço de relatórios de estoque.
+    """
+
+    VALUATION_GROUPS = {
+        'warehouse': 'warehouse__name',
+        'category': 'product__category__name',
+        'brand': 'product__brand__name',
+    }
+
+    # Limites da curva ABC (participação acumulada na receita)
+    ABC_LIMITS = (('A', Decimal('0.80')), ('B', Decimal('0.95')))
+
+    # Campos decimais das linhas (o JSON grava Decimal como texto)
+    DECIMAL_FIELDS = {
+        ReportSnapshot.Kind.VALUATION: ('value', 'share'),
+        ReportSnapshot.Kind.ABC: ('revenue', 'cumulative_share'),
+    }
+
+    @staticmethod
+    def stored(kind: str, key: str, start: datetime) -> tuple[list | None, bool]:
+        """
+        Linhas gravadas de um relatório/período, sem calcular nada.
+
+        Returns:
+            (linhas ou None se nunca calculado, se ainda estão válidas)
+        """
+        snapshot = ReportSnapshot.objects.filter(kind=kind, key=key, period=start.date()).first()
+        if snapshot is None:
+            return None, False
+        rows = snapshot.rows
+        for row in rows:
+            for field in ReportService.DECIMAL_FIELDS[kind]:
+                row[field] = Decimal(row[field])
+        closed = ReportService.is_closed(start)
+        age = (timezone.now() - snapshot.updated_at).total_seconds()
+        return rows, closed or age < settings.REPORT_CACHE_TIMEOUT
+
+    @staticmethod
+    def _store(kind: str, key: str, start: datetime, rows: list) -> None:
+        ReportSnapshot.objects.update_or_create(
+            kind=kind, key=key, period=start.date(), defaults={'rows': rows}
+        )
+
+    @staticmethod
+    def is_closed(start: datetime) -> bool:
+        """O mês que começa em `start` já terminou."""
+        return start < ReportService.month_range()[0]
+
+    @staticmethod
+    def month_range(period: str | date | None = None) -> tuple:
+        """
+        Converte 'AAAA-MM' no intervalo [início, fim) do mês.
+
+        Raises:
+            ValueError: Se o período não estiver no formato AAAA-MM
+        """
+        now = timezone.localtime()
+        if isinstance(period, date):
+            period = f'{period:%Y-%m}'
+        if period:
+            start = datetime.strptime(period, '%Y-%m').replace(tzinfo=now.tzinfo)
+        else:
+            start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if start.month == 12:
+            end = start.replace(year=start.year + 1, month=1)
+        else:
+            end = start.replace(month=start.month + 1)
+        return start, end
+
+    @staticmethod
+    def valuation(group_by: str = 'warehouse', refresh: bool = False) -> list:
+        """
+        Valorização do estoque atual (quantidade x custo) agrupada, gravada
+        como a valorização do mês corrente.
+
+        Args:
+            group_by: 'warehouse', 'category' ou 'brand'
+            refresh: Recalcula mesmo que a foto do mês ainda esteja válida
+
+        Returns:
+            Lista de dicts com group, units, value e share (participação)
+
+        Raises:
+            ValueError: Se group_by for inválido
+        """
+        if group_by not in ReportService.VALUATION_GROUPS:
+            raise ValueError(f"Agrupamento inválido: {group_by}")
+
+        start, _ = ReportService.month_range()
+        if not refresh:
+            rows, fresh = ReportService.stored(ReportSnapshot.Kind.VALUATION, group_by, start)
+            if fresh:
+                return rows
+
+        field = ReportService.VALUATION_GROUPS[group_by]
+        value = ExpressionWrapper(
+            F('quantity') * F('product__cost'),
+            output_field=DecimalField(max_digits=16, decimal_places=2),
+        )
+        grouped = (
+            Stock.objects.filter(quantity__gt=0)
+            .values(field)
+            .annotate(units=Sum('quantity'), value=Sum(value))
+            .order_by('-value')
+        )
+
+        with use_replica():
+            rows = [
+                {
+                    'group': row[field] or '(sem)',
+                    'units': row['units'],
+                    'value': Decimal(row['value']).quantize(Decimal('0.01')),
+                }
+                for row in grouped
+            ]
+        total = sum(row['value'] for row in rows)
+        for row in rows:
+            row['share'] = (row['value'] / total).quantize(Decimal('0.0001')) if total else Decimal('0')
+
+        ReportService._store(ReportSnapshot.Kind.VALUATION, group_by, start, rows)
+        return rows
+
+    @staticmethod
+    def abc_classification(start: datetime, end: datetime, refresh: bool = False) -> list:
+        """
+        Curva ABC do período, gravada por mês (ver `iter_abc`).
+
+        Returns:
+            Lista de dicts ordenada por receita: sku, name, units, revenue,
+            cumulative_share e abc_class
+        """
+        if not refresh:
+            rows, fresh = ReportService.stored(ReportSnapshot.Kind.ABC, '', start)
+            if fresh:
+                return rows
+
+        rows = list(ReportService.iter_abc(start, end))
+        ReportService._store(ReportSnapshot.Kind.ABC, '', start, rows)
+        return rows
+
+    @staticmethod
+    def iter_abc(start: datetime, end: datetime):
+        """
+        Curva ABC dos produtos pela receita de vendas concluídas no período.
+
+        A receita por produto é agregada uma única vez (CTE) e a
+        participação acumulada sai de uma função de janela, então o custo
+        não cresce com o número de vendas além do próprio GROUP BY. As
+        linhas saem do cursor em blocos, conforme são consumidas.
+        """
+        from catalog.models import Product
+        from sales.models import Sale, SaleItem
+
+        sql = f"""
+            WITH revenue AS (
+                SELECT si.product_id,
+                       SUM(si.quantity) AS units,
+                       SUM(si.total_price) AS revenue
+                  FROM {SaleItem._meta.db_table} si
+                  JOIN {Sale._meta.db_table} s ON s.id = si.sale_id
+                 WHERE s.status = %s
+                   AND s.created_at >= %s
+                   AND s.created_at < %s
+                 GROUP BY si.product_id
+            )
+            SELECT p.sku,
+                   p.name,
+                   r.units,
+                   r.revenue,
+                   SUM(r.revenue) OVER (
+                       ORDER BY r.revenue DESC, p.sku
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                   ) AS preceding,
+                   SUM(r.revenue) OVER () AS total
+              FROM revenue r
+              JOIN {Product._meta.db_table} p ON p.id = r.product_id
+             ORDER BY r.revenue DESC, p.sku
+        """
+
+        with use_replica():
+            alias = router.db_for_read(SaleItem)
+        with connections[alias].cursor() as cursor:
+            cursor.execute(sql, [Sale.Status.COMPLETED, start, end])
+            while chunk := cursor.fetchmany(2000):
+                for sku, name, units, revenue, preceding, total in chunk:
+                    revenue = ReportService._decimal(revenue)
+                    preceding = ReportService._decimal(preceding)
+                    total = ReportService._decimal(total)
+                    cumulative = ((preceding + revenue) / total) if total else Decimal('0')
+                    yield {
+                        'sku': sku,
+                        'name': name,
+                        'units': units,
+                        'revenue': revenue,
+                        'cumulative_share': cumulative.quantize(Decimal('0.0001')),
+                        'abc_class': ReportService._abc_class(preceding, total),
+                    }
+
+    @staticmethod
+    def _abc_class(preceding: Decimal, total: Decimal) -> str:
+        """Classe pela participação acumulada *antes* do item (o 1º é sempre A)."""
+        if not total:
+            return 'C'
+        share = preceding / total
+        for abc_class, limit in ReportService.ABC_LIMITS:
+            if share < limit:
+                return abc_class
+        return 'C'
+
+    @staticmethod
+    def _decimal(value) -> Decimal:
+        # SQLite devolve float para SUM de decimais; Postgres devolve Decimal
+        if value is None:
+            return Decimal('0.00')
+        return Decimal(str(value)).quantize(Decimal('0.01'))
@@ -177,6 +177,35 @@ class StockService:
         except Stock.DoesNotExist:
             return 0
 
+    @staticmethod
+    def get_balances(products, warehouse) -> dict:
+        """
+        Retorna o saldo de vários produtos em um depósito com uma única query.
+
+        Args:
+            products: Iterável (ou queryset) de produtos
+            warehouse: Depósito (instância ou id)
+
+        Returns:
+            Dicionário {product_id: quantidade}; produtos sem registro
+            de estoque não aparecem (saldo 0)
+        """
+        return dict(
+            Stock.objects.filter(
+                warehouse=warehouse, product__in=products
+            ).values_list('product_id', 'quantity')
+        )
+
+    @staticmethod
+    async def aget_balances(products, warehouse) -> dict:
+        """Versão assíncrona de get_balances (para views async)."""
+        return {
+            product_id: quantity
+            async for product_id, quantity in Stock.objects.filter(
+                warehouse=warehouse, product__in=products
+            ).values_list('product_id', 'quantity')
+        }
+
     @staticmethod
     def check_availability(
         product: Product, warehouse: Warehouse, quantity: int
@@ -2,6 +2,7 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from core.exceptions import InsufficientStockError
+from .events import publish_stock_change
 from .models import StockMovement, Stock
 
 
@@ -13,6 +14,9 @@ def update_stock_balance(sender, instance, created, **kwargs):
     - IN: Incrementa o saldo
     - OUT: Decrementa o saldo (valida disponibilidade)
     - ADJUST: Define saldo exato (incrementa ou decrementa conforme diferença)
+
+    Após o commit, a linha alterada é publicada para as telas conectadas
+    ao stream SSE (stock.events).
     """
     if not created:
         # Se for apenas uma edição de registro já existente, não alteramos o saldo 
@@ -50,4 +54,5 @@ def update_stock_balance(sender, instance, created, **kwargs):
             # Isso evita comportamentos imprevisíveis.
             pass
 
-    stock.save()
\ No newline at end of file
+    stock.save()
+    publish_stock_change(stock)
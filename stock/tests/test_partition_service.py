@@ -0,0 +1,129 @@
+import gzip
+import hashlib
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from stock.models import Stock, StockMovement, StockMovementArchive
+from stock.services import MovementPartitionService, StockService
+
+
+def _age(movement, days):
+    """Retroage a movimentação (created_at é auto_now_add)."""
+    StockMovement.objects.filter(pk=movement.pk).update(
+        created_at=timezone.now() - timedelta(days=days)
+    )
+
+
+@pytest.fixture
+def old_and_recent(product, warehouse):
+    old = StockService.add_stock(product, warehouse, 5, reason='Antiga')
+    _age(old, 365 * 3)
+    recent = StockService.add_stock(product, warehouse, 2, reason='Recente')
+    return old, recent
+
+
+class TestMonths:
+    def test_add_months_crosses_years(self):
+        assert MovementPartitionService.add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+        assert MovementPartitionService.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_hot_since_is_aligned_to_month_start(self):
+        since = timezone.localtime(MovementPartitionService.hot_since(3))
+        current = timezone.localdate().replace(day=1)
+
+        assert since.date() == MovementPartitionService.add_months(current, -2)
+        assert (since.hour, since.minute) == (0, 0)
+
+    def test_months_to_cover(self):
+        current = timezone.localdate().replace(day=1)
+        since = MovementPartitionService.add_months(current, -24) + timedelta(days=9)
+
+        assert len(MovementPartitionService.months_to_cover(3)) == 4
+        months = MovementPartitionService.months_to_cover(3, since=since)
+        assert min(months) == since.replace(day=1)
+        assert max(months) == MovementPartitionService.add_months(current, 3)
+        assert len(months) == 28
+
+    def test_partition_name(self):
+        assert MovementPartitionService.partition_name(date(2026, 3, 1)) == 'stock_stockmovement_p202603'
+
+
+@pytest.mark.django_db
+class TestHotHistory:
+    def test_history_reads_only_recent_months(self, client, old_and_recent):
+        old, recent = old_and_recent
+
+        movements = list(client.get(reverse('stock:stock_history')).context['movements'])
+        wide = list(client.get(reverse('stock:stock_history'), {'meses': 48}).context['movements'])
+
+        assert movements == [recent]
+        assert set(wide) == {old, recent}
+
+    def test_maintenance_is_noop_without_postgres(self):
+        assert MovementPartitionService.is_partitioned() is False
+        assert MovementPartitionService.ensure_partitions() == []
+
+
+@pytest.mark.django_db
+class TestArchive:
+    def test_archives_old_months_to_table(self, old_and_recent, product, warehouse):
+        old, recent = old_and_recent
+
+        results = MovementPartitionService.archive(older_than_years=2)
+
+        assert [r['rows'] for r in results] == [1]
+        assert list(StockMovement.objects.all()) == [recent]
+        archive = StockMovementArchive.objects.get()
+        rows = MovementPartitionService.read_archive(archive)
+        assert [row['id'] for row in rows] == [str(old.pk)]
+        assert rows[0]['reason'] == 'Antiga'
+        # Saldos não dependem do histórico
+        assert Stock.objects.get(product=product, warehouse=warehouse).quantity == 7
+
+    def test_archives_to_compressed_file(self, old_and_recent, tmp_path, django_capture_on_commit_callbacks):
+        old, _ = old_and_recent
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            [result] = MovementPartitionService.archive(2, destination='file', directory=tmp_path)
+        # Até o commit o mês fica num temporário no mesmo diretório
+        assert [p.name.endswith('.tmp') for p in tmp_path.iterdir()] == [True]
+        for callback in callbacks:
+            callback()
+        assert [p.name for p in tmp_path.iterdir()] == [Path(result['location']).name]
+
+        content = gzip.decompress(open(result['location'], 'rb').read()).decode()
+        assert str(old.pk) in content
+        assert not StockMovementArchive.objects.exists()
+        assert not StockMovement.objects.filter(pk=old.pk).exists()
+
+    def test_file_hash_matches_content(self, old_and_recent, tmp_path, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            [result] = MovementPartitionService.archive(2, destination='file', directory=tmp_path)
+
+        assert hashlib.sha256(Path(result['location']).read_bytes()).hexdigest() == result['sha256']
+
+    def test_table_destination_enforces_size_limit(self, old_and_recent, settings):
+        settings.STOCK_MOVEMENT_ARCHIVE_MAX_BYTES = 10
+
+        with pytest.raises(ValueError, match='STOCK_MOVEMENT_ARCHIVE_MAX_BYTES'):
+            MovementPartitionService.archive(older_than_years=2)
+
+        assert StockMovement.objects.count() == 2
+        assert not StockMovementArchive.objects.exists()
+
+    def test_nothing_recent_is_archived(self, product, warehouse):
+        StockService.add_stock(product, warehouse, 1)
+
+        assert MovementPartitionService.archive(older_than_years=1) == []
+        assert StockMovement.objects.count() == 1
+
+    def test_command_dry_run_keeps_rows(self, old_and_recent):
+        call_command('archive_movements', '--years', '2', '--dry-run')
+
+        assert StockMovement.objects.count() == 2
+        assert not StockMovementArchive.objects.exists()
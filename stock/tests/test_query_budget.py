@@ -0,0 +1,73 @@
+"""
+Orçamento de queries do estoque (views e StockService).
+
+Se um destes testes falhar, alguma mudança adicionou queries; confira
+se não é um N+1 antes de atualizar o número.
+"""
+
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+
+from catalog.models import Product
+from stock.services import StockService
+
+
+@pytest.fixture
+def stocked_products(db, category, warehouse, warehouse_secondary):
+    """Cinco produtos com saldo em dois depósitos."""
+    products = Product.objects.bulk_create([
+        Product(
+            sku=f"SQB-{i:03d}",
+            name=f"Produto Estoque {i}",
+            category=category,
+            cost=Decimal("10.00"),
+            price=Decimal("20.00"),
+        )
+        for i in range(5)
+    ])
+    for product in products:
+        StockService.add_stock(product, warehouse, 20)
+        StockService.add_stock(product, warehouse_secondary, 3)
+    return products
+
+
+@pytest.mark.django_db
+class TestStockViewsQueryBudget:
+    def test_stock_list(self, client, stocked_products, django_assert_num_queries):
+        # saldos (com produto e depósito via JOIN) + depósitos do filtro
+        with django_assert_num_queries(2):
+            client.get(reverse('stock:stock_list'))
+
+    def test_stock_list_htmx(self, client, stocked_products, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            client.get(reverse('stock:stock_list'), headers={'HX-Request': 'true'})
+
+
+@pytest.mark.django_db
+class TestStockServiceQueryBudget:
+    def test_add_stock(self, product, warehouse, django_assert_num_queries):
+        StockService.add_stock(product, warehouse, 10)
+        # savepoint, INSERT do movimento, signal (SELECT + UPDATE do saldo), release
+        with django_assert_num_queries(5):
+            StockService.add_stock(product, warehouse, 5)
+
+    def test_remove_stock(self, product, warehouse, django_assert_num_queries):
+        StockService.add_stock(product, warehouse, 10)
+        # add_stock + verificação de saldo antes do movimento
+        with django_assert_num_queries(6):
+            StockService.remove_stock(product, warehouse, 5)
+
+    def test_adjust_stock(self, product, warehouse, django_assert_num_queries):
+        StockService.add_stock(product, warehouse, 10)
+        with django_assert_num_queries(6):
+            StockService.adjust_stock(product, warehouse, 3)
+
+    def test_get_balance(self, product, warehouse, django_assert_num_queries):
+        StockService.add_stock(product, warehouse, 10)
+        with django_assert_num_queries(1):
+            StockService.get_balance(product, warehouse)
+
+    def test_get_balances(self, stocked_products, warehouse, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            StockService.get_balances(stocked_products, warehouse)
@@ -0,0 +1,118 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+
+from core.models import Client
+from sales.models import Sale
+from sales.services import SalesService
+from stock.models import Stock
+from stock.services import ReplenishmentService, StockService
+
+
+@pytest.fixture
+def buyer(db):
+    return Client.objects.create(name="Cliente Reposição")
+
+
+def _sell(buyer, warehouse, product, quantity, days_ago=0):
+    sale = SalesService.create_sale(buyer, warehouse, [
+        {'product': product, 'quantity': quantity, 'unit_price': Decimal('80.00')}
+    ])
+    if days_ago:
+        Sale.objects.filter(pk=sale.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+    return sale
+
+
+@pytest.mark.django_db
+class TestReplenishmentCompute:
+    PARAMS = {
+        'lookback': 90, 'short_window': 28, 'lead_time': 7,
+        'safety': 7, 'review': 30, 'min_reorder_point': 10,
+    }
+
+    def test_no_sales_uses_minimum_reorder_point(self):
+        velocity, reorder_point, reorder_quantity = ReplenishmentService.compute(0, 0, self.PARAMS)
+        assert velocity == Decimal('0.000')
+        assert reorder_point == 10
+        assert reorder_quantity == 0
+
+    def test_short_window_reacts_to_rising_demand(self):
+        # 90 unidades em 90 dias (1/dia), mas 56 nos últimos 28 dias (2/dia)
+        velocity, reorder_point, reorder_quantity = ReplenishmentService.compute(90, 56, self.PARAMS)
+        assert velocity == Decimal('2.000')
+        assert reorder_point == 28  # 2/dia * (7 + 7)
+        assert reorder_quantity == 60  # 2/dia * 30
+
+
+@pytest.mark.django_db
+class TestReplenishmentRefresh:
+    def test_full_refresh_sets_reorder_point_from_sales(self, settings, buyer, warehouse, product):
+        settings.REPLENISHMENT_MIN_REORDER_POINT = 1
+        StockService.add_stock(product, warehouse, 500)
+        _sell(buyer, warehouse, product, 280)  # 10/dia na janela curta
+
+        assert ReplenishmentService.refresh(full=True) == 1
+
+        stock = Stock.objects.get(product=product, warehouse=warehouse)
+        assert stock.daily_velocity == Decimal('10.000')
+        assert stock.reorder_point == 140
+        assert stock.reorder_quantity == 300
+        assert stock.replenishment_updated_at is not None
+
+    def test_cancelled_and_old_sales_are_ignored(self, settings, buyer, warehouse, product):
+        settings.REPLENISHMENT_MIN_REORDER_POINT = 1
+        StockService.add_stock(product, warehouse, 500)
+        cancelled = _sell(buyer, warehouse, product, 100)
+        Sale.objects.filter(pk=cancelled.pk).update(status=Sale.Status.CANCELLED)
+        _sell(buyer, warehouse, product, 100, days_ago=120)
+
+        ReplenishmentService.refresh(full=True)
+
+        stock = Stock.objects.get(product=product, warehouse=warehouse)
+        assert stock.daily_velocity == 0
+        assert stock.reorder_point == 1
+
+    def test_incremental_refresh_only_touches_changed_pairs(self, buyer, warehouse, product, product_secondary):
+        StockService.add_stock(product, warehouse, 500)
+        StockService.add_stock(product_secondary, warehouse, 500)
+        assert ReplenishmentService.refresh() == 2  # primeira execução é completa
+
+        _sell(buyer, warehouse, product, 280)
+        assert ReplenishmentService.refresh() == 1
+
+        stock = Stock.objects.get(product=product, warehouse=warehouse)
+        assert stock.reorder_point == 140
+        assert ReplenishmentService.refresh() == 0
+
+    def test_incremental_refresh_picks_up_cancellations(self, buyer, warehouse, product):
+        StockService.add_stock(product, warehouse, 500)
+        sale = _sell(buyer, warehouse, product, 280)
+        ReplenishmentService.refresh()
+        assert Stock.objects.get(product=product).reorder_point == 140
+
+        sale.status = Sale.Status.CANCELLED
+        sale.save()
+        assert ReplenishmentService.refresh() == 1
+        assert Stock.objects.get(product=product).reorder_point == 10
+
+
+@pytest.mark.django_db
+class TestLowStockScreens:
+    def test_low_stock_filter_uses_reorder_point(self, client, warehouse, product, product_secondary):
+        StockService.add_stock(product, warehouse, 30)
+        StockService.add_stock(product_secondary, warehouse, 30)
+        Stock.objects.filter(product=product).update(reorder_point=50)
+
+        response = client.get('/estoque/', {'low_stock': '1'})
+
+        stocks = list(response.context['stocks'])
+        assert [s.product for s in stocks] == [product]
+
+    def test_dashboard_counts_stock_below_reorder_point(self, client, warehouse, product, product_secondary):
+        StockService.add_stock(product, warehouse, 3)
+        StockService.add_stock(product_secondary, warehouse, 30)
+
+        response = client.get('/')
+
+        assert response.context['produtos_baixo_estoque'] == 1
@@ -0,0 +1,169 @@
+import pytest
+from io import StringIO
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.urls import reverse
+
+from catalog.models import Product
+from core.models import Client, Job
+from sales.models import Sale
+from sales.services import SalesService
+from stock.models import ReportSnapshot
+from stock.services import ReportService, StockService
+
+
+@pytest.fixture
+def buyer(db):
+    return Client.objects.create(name="Cliente Relatório")
+
+
+def _sell(buyer, warehouse, product, quantity, unit_price):
+    return SalesService.create_sale(buyer, warehouse, [
+        {'product': product, 'quantity': quantity, 'unit_price': Decimal(unit_price)}
+    ])
+
+
+@pytest.mark.django_db
+class TestValuation:
+    def test_groups_by_warehouse(self, warehouse, warehouse_secondary, product, product_secondary):
+        StockService.add_stock(product, warehouse, 10)  # 10 x 50 = 500
+        StockService.add_stock(product_secondary, warehouse, 4)  # 4 x 15 = 60
+        StockService.add_stock(product, warehouse_secondary, 2)  # 2 x 50 = 100
+
+        rows = ReportService.valuation('warehouse')
+
+        assert [(r['group'], r['units'], r['value']) for r in rows] == [
+            (warehouse.name, 14, Decimal('560.00')),
+            (warehouse_secondary.name, 2, Decimal('100.00')),
+        ]
+        assert sum(r['share'] for r in rows) == Decimal('1.0000')
+
+    def test_groups_by_category(self, warehouse, product, category):
+        StockService.add_stock(product, warehouse, 3)
+        rows = ReportService.valuation('category')
+        assert rows == [{'group': category.name, 'units': 3, 'value': Decimal('150.00'), 'share': Decimal('1.0000')}]
+
+    def test_invalid_group(self):
+        with pytest.raises(ValueError):
+            ReportService.valuation('supplier')
+
+    def test_snapshots_are_kept_per_period(self, warehouse, product):
+        StockService.add_stock(product, warehouse, 1)
+        current, _ = ReportService.month_range()
+        previous, _ = ReportService.month_range((current - timedelta(days=1)).date())
+        ReportSnapshot.objects.create(
+            kind=ReportSnapshot.Kind.VALUATION, key='warehouse', period=previous.date(),
+            rows=[{'group': 'Fechado', 'units': 9, 'value': '90.00', 'share': '1.0000'}],
+        )
+
+        ReportService.valuation(refresh=True)
+
+        closed, fresh = ReportService.stored(ReportSnapshot.Kind.VALUATION, 'warehouse', previous)
+        assert fresh is True
+        assert closed == [{'group': 'Fechado', 'units': 9, 'value': Decimal('90.00'), 'share': Decimal('1.0000')}]
+        assert ReportService.stored(ReportSnapshot.Kind.VALUATION, 'warehouse', current)[0][0]['units'] == 1
+
+    def test_result_is_cached_until_refresh(self, warehouse, product):
+        StockService.add_stock(product, warehouse, 1)
+        assert ReportService.valuation()[0]['units'] == 1
+
+        StockService.add_stock(product, warehouse, 1)
+        assert ReportService.valuation()[0]['units'] == 1
+        assert ReportService.valuation(refresh=True)[0]['units'] == 2
+
+
+@pytest.mark.django_db
+class TestAbcClassification:
+    def test_classes_by_cumulative_revenue(self, buyer, warehouse, category):
+        # Receitas: 700, 200, 60, 40 -> acumulado antes do item: 0%, 70%, 90%, 96%
+        # (o item que cruza o limite de 80% ainda é A)
+        revenues = [('P-1', 700), ('P-2', 200), ('P-3', 60), ('P-4', 40)]
+        for sku, revenue in revenues:
+            product = Product.objects.create(
+                sku=sku, name=sku, category=category, cost=Decimal('1.00'), price=Decimal('1.00')
+            )
+            StockService.add_stock(product, warehouse, 1)
+            _sell(buyer, warehouse, product, 1, revenue)
+
+        start, end = ReportService.month_range()
+        rows = ReportService.abc_classification(start, end)
+
+        assert [(r['sku'], r['abc_class']) for r in rows] == [
+            ('P-1', 'A'), ('P-2', 'A'), ('P-3', 'B'), ('P-4', 'C'),
+        ]
+        assert rows[0]['revenue'] == Decimal('700.00')
+        assert rows[-1]['cumulative_share'] == Decimal('1.0000')
+
+    def test_ignores_cancelled_sales_and_other_periods(self, buyer, warehouse, product):
+        StockService.add_stock(product, warehouse, 10)
+        sale = _sell(buyer, warehouse, product, 1, '80.00')
+        Sale.objects.filter(pk=sale.pk).update(status=Sale.Status.CANCELLED)
+
+        start, end = ReportService.month_range()
+        assert ReportService.abc_classification(start, end) == []
+
+        _sell(buyer, warehouse, product, 1, '80.00')
+        previous = ReportService.month_range((start - timedelta(days=1)).strftime('%Y-%m'))
+        assert ReportService.abc_classification(*previous) == []
+        assert len(ReportService.abc_classification(start, end, refresh=True)) == 1
+
+    def test_month_range(self):
+        start, end = ReportService.month_range('2025-12')
+        assert (start.year, start.month, start.day) == (2025, 12, 1)
+        assert (end.year, end.month, end.day) == (2026, 1, 1)
+
+        with pytest.raises(ValueError):
+            ReportService.month_range('12/2025')
+
+
+@pytest.mark.django_db
+class TestReportViews:
+    def test_missing_report_is_scheduled_once(self, client):
+        first = client.get(reverse('stock:abc_report'))
+        second = client.get(reverse('stock:abc_report'))
+
+        assert first.status_code == second.status_code == 202
+        assert first['Retry-After'] == '5'
+        assert Job.objects.filter(name='stock.build_reports').count() == 1
+
+    def test_valuation_csv(self, client, warehouse, product):
+        StockService.add_stock(product, warehouse, 2)
+        call_command('build_reports', stdout=StringIO())
+
+        response = client.get(reverse('stock:valuation_report'), {'group': 'brand'})
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines == ['grupo,unidades,valor,participacao', '(sem),2,100.00,1.0000']
+
+    def test_closed_valuation_without_snapshot(self, client):
+        response = client.get(reverse('stock:valuation_report'), {'period': '2020-01'})
+
+        assert response.status_code == 404
+        assert not Job.objects.exists()
+
+    def test_abc_csv(self, client, buyer, warehouse, product):
+        StockService.add_stock(product, warehouse, 2)
+        _sell(buyer, warehouse, product, 2, '80.00')
+        call_command('build_reports', stdout=StringIO())
+
+        response = client.get(reverse('stock:abc_report'))
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[1] == f'{product.sku},{product.name},2,160.00,1.0000,A'
+
+    def test_abc_rows_are_streamed_from_the_cursor(self, buyer, warehouse, product):
+        StockService.add_stock(product, warehouse, 2)
+        _sell(buyer, warehouse, product, 2, '80.00')
+        start, end = ReportService.month_range()
+
+        rows = ReportService.iter_abc(start, end)
+
+        assert not isinstance(rows, list)
+        assert next(rows)['sku'] == product.sku
+
+    def test_invalid_parameters(self, client):
+        assert client.get(reverse('stock:valuation_report'), {'group': 'x'}).status_code == 400
+        assert client.get(reverse('stock:abc_report'), {'period': '2025'}).status_code == 400
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+
+from stock import events
+from stock.models import Stock
+from stock.services import StockService
+
+
+@pytest.fixture(autouse=True)
+def local_broker(settings):
+    settings.STOCK_EVENTS_BACKEND = 'local'
+    events._broker = None
+    yield events.get_broker()
+    events._broker = None
+
+
+@pytest.mark.django_db
+class TestStockEventPublishing:
+    def test_movement_publishes_changed_row_after_commit(
+        self, local_broker, warehouse, product, django_capture_on_commit_callbacks
+    ):
+        subscriber = events.QueueSubscriber()
+        local_broker.subscribe(subscriber)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            StockService.add_stock(product, warehouse, 12)
+
+        stock = Stock.objects.get(product=product, warehouse=warehouse)
+        data = json.loads(subscriber.queue.get_nowait())
+        assert data == {
+            'id': str(stock.id),
+            'product': str(product.id),
+            'warehouse': str(warehouse.id),
+            'quantity': 12,
+            'reorder_point': stock.reorder_point,
+            'level': 'ok',
+        }
+
+    def test_nothing_published_without_commit(self, local_broker, warehouse, product):
+        subscriber = events.QueueSubscriber()
+        local_broker.subscribe(subscriber)
+
+        StockService.add_stock(product, warehouse, 1)
+
+        assert subscriber.queue.empty()
+
+    def test_levels(self, warehouse, product):
+        stock = Stock(product=product, warehouse=warehouse, quantity=4, reorder_point=10)
+        assert events.stock_payload(stock)['level'] == 'critical'
+        stock.quantity = 7
+        assert events.stock_payload(stock)['level'] == 'low'
+        stock.quantity = 10
+        assert events.stock_payload(stock)['level'] == 'ok'
+
+
+@pytest.mark.django_db
+class TestStockEventStream:
+    def test_sync_stream(self, client, local_broker, settings):
+        settings.STOCK_EVENTS_KEEPALIVE_SECONDS = 0.01
+        response = client.get(reverse('stock:stock_events'))
+        assert response['Content-Type'] == 'text/event-stream'
+
+        stream = iter(response.streaming_content)
+        assert next(stream) == b'retry: 3000\n\n'
+        assert next(stream) == b': keepalive\n\n'
+
+        local_broker.publish('{"id": "1"}')
+        assert next(stream) == b'event: stock\ndata: {"id": "1"}\n\n'
+
+        response.close()
+        assert not local_broker._subscribers
+
+    def test_sync_stream_ends_after_max_seconds(self, local_broker):
+        stream = events.event_stream(keepalive=5, max_seconds=0.05)
+
+        # O gerador termina sozinho: o navegador reconecta após o retry
+        assert list(stream) == ['retry: 3000\n\n', ': keepalive\n\n']
+        assert not local_broker._subscribers
+
+    def test_async_stream(self, local_broker):
+        @async_to_sync
+        async def consume():
+            stream = events.aevent_stream(keepalive=5)
+            first = await stream.__anext__()
+            local_broker.publish('{"id": "2"}')
+            second = await stream.__anext__()
+            await stream.aclose()
+            return first, second
+
+        assert consume() == ('retry: 3000\n\n', 'event: stock\ndata: {"id": "2"}\n\n')
+        assert not local_broker._subscribers
+
+    def test_movement_view_no_longer_triggers_full_reload(self, client, warehouse, product):
+        response = client.post(
+            reverse('stock:stock_movement'),
+            {'product_id': product.id, 'warehouse_id': warehouse.id, 'quantity': 3, 'movement_type': 'IN'},
+            HTTP_HX_REQUEST='true',
+        )
+        assert response.status_code == 204
+        assert 'HX-Trigger' not in response
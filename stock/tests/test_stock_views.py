@@ -0,0 +1,26 @@
+import pytest
+from django.urls import reverse
+
+from stock.models import StockMovement
+
+
+@pytest.mark.django_db
+class TestStockMovementView:
+    @pytest.mark.parametrize('product_id', ['', 'não-é-uuid'])
+    def test_invalid_product_is_rejected(self, client, warehouse, product_id):
+        response = client.post(reverse('stock:stock_movement'), {
+            'product_id': product_id, 'warehouse_id': str(warehouse.id),
+            'quantity': 3, 'movement_type': 'IN',
+        }, HTTP_HX_REQUEST='true')
+
+        assert response.status_code == 400
+        assert 'Selecione produto' in response.content.decode()
+        assert not StockMovement.objects.exists()
+
+    def test_missing_quantity_is_rejected(self, client, product, warehouse):
+        response = client.post(reverse('stock:stock_movement'), {
+            'product_id': str(product.id), 'warehouse_id': str(warehouse.id), 'movement_type': 'IN',
+        })
+
+        assert response.status_code == 400
+        assert 'quantidade' in response.content.decode()
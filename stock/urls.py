@@ -5,9 +5,13 @@ app_name = 'stock'
 
 urlpatterns = [
     path('', views.stock_list, name='stock_list'),
+    path('eventos/', views.stock_events, name='stock_events'),
     # Novas funcionalidades
     path('ajuste-estoque/', views.stock_adjust, name='stock_adjust'),
     path('movimentar/', views.stock_movement, name='stock_movement'),
     
     path('historico/', views.stock_history, name='stock_history'),
+    path('reposicao/recalcular/', views.replenishment_refresh, name='replenishment_refresh'),
+    path('relatorios/valorizacao.csv', views.valuation_report, name='valuation_report'),
+    path('relatorios/curva-abc.csv', views.abc_report, name='abc_report'),
 ]
@@ -1,11 +1,25 @@
+import csv
+import uuid
+
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
 
-from .models import Stock, Warehouse
-from .services import StockService
+from .events import aevent_stream, event_stream
+from .models import ReportSnapshot, Stock, Warehouse
+from .services import MovementPartitionService, ReplenishmentService, ReportService, StockService
 from catalog.models import Product
+from core.conditional import conditional_get, model_version
+from core.db_router import replica_view
+from core.services import JobService
+
+
+def _stock_list_versions(request):
+    return [model_version(Stock, Product, Warehouse)]
 
 
+@conditional_get(_stock_list_versions)
 def stock_list(request):
     """Lista todo o estoque."""
     stocks = Stock.objects.select_related('product', 'warehouse').order_by('product__name')
@@ -20,10 +34,10 @@ def stock_list(request):
     for wh in warehouses:
         wh.is_selected = str(wh.id) == warehouse_filter
     
-    # Filtro por baixo estoque
+    # Filtro por baixo estoque (abaixo do ponto de pedido calculado)
     low_stock = request.GET.get('low_stock')
     if low_stock:
-        stocks = stocks.filter(quantity__lt=10)
+        stocks = stocks & ReplenishmentService.low_stock()
     
     context = {
         'stocks': stocks,
@@ -38,18 +52,42 @@ def stock_list(request):
     return render(request, 'stock/stock_list_v2.html', context)
 
 
+def stock_events(request):
+    """
+    Stream SSE com as linhas de saldo alteradas (ver stock.events).
+
+    Sob ASGI o stream é async e não ocupa uma thread por navegador; sob
+    WSGI ele é encerrado após STOCK_EVENTS_MAX_SECONDS e o navegador
+    reconecta.
+    """
+    stream = aevent_stream() if isinstance(request, ASGIRequest) else event_stream()
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Desativa o buffer do nginx para o evento chegar na hora
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 def stock_movement(request):
-    print(f"DEBUG: Entrou em stock_movement. Path: {request.path}")
     """Registra movimentação de estoque."""
-    products = Product.objects.filter(active=True)
     warehouses = Warehouse.objects.all()
     
     if request.method == 'POST':
-        print(f"DEBUG POST KEYS: {request.POST.keys()}")
-        product = get_object_or_404(Product, pk=request.POST['product_id'])
-        warehouse = get_object_or_404(Warehouse, pk=request.POST['warehouse_id'])
-        quantity = int(request.POST['quantity'])
-        movement_type = request.POST['movement_type']
+        # O id do produto vem de um input oculto (autocomplete), que o
+        # navegador não valida: campo vazio ou adulterado vira 400, não 500
+        try:
+            product_id = uuid.UUID(request.POST.get('product_id', ''))
+            warehouse_id = uuid.UUID(request.POST.get('warehouse_id', ''))
+        except ValueError:
+            return HttpResponse('Selecione produto e depósito', status=400)
+        try:
+            quantity = int(request.POST.get('quantity', ''))
+        except ValueError:
+            return HttpResponse('Informe a quantidade', status=400)
+
+        product = get_object_or_404(Product, pk=product_id)
+        warehouse = get_object_or_404(Warehouse, pk=warehouse_id)
+        movement_type = request.POST.get('movement_type')
         reason = request.POST.get('reason', '')
         
         try:
@@ -58,21 +96,20 @@ def stock_movement(request):
             else:
                 StockService.remove_stock(product, warehouse, quantity, reason=reason)
             
+            # A tela de estoque recebe a linha alterada pelo stream SSE
             if request.headers.get('HX-Request'):
-                return HttpResponse(status=204, headers={'HX-Trigger': 'stockListChanged'})
+                return HttpResponse(status=204)
             # Redirecionamento para chamadas normais (não-HTMX)
             return redirect('stock:stock_list')
         except Exception as e:
             return HttpResponse(f'Erro: {str(e)}', status=400)
     
     return render(request, 'stock/stock_movement.html', {
-        'products': products,
         'warehouses': warehouses,
     })
 
 
 def stock_adjust(request):
-    print(f"DEBUG: Entrou em stock_adjust. Path: {request.path}")
     """Realiza ajuste manual de estoque para quantidade exata."""
     from .forms import StockAdjustmentForm
     
@@ -92,7 +129,7 @@ def stock_adjust(request):
                     reason=reason
                 )
                 if request.headers.get('HX-Request'):
-                    return HttpResponse(status=204, headers={'HX-Trigger': 'stockListChanged'})
+                    return HttpResponse(status=204)
                 return redirect('stock:stock_list')
             except Exception as e:
                 # Retorna erro para o frontend (pode ser melhorado com mensagens)
@@ -103,11 +140,25 @@ def stock_adjust(request):
     return render(request, 'stock/stock_adjust.html', {'form': form})
 
 
+@replica_view
 def stock_history(request):
-    """Lista histórico de movimentações de estoque."""
+    """
+    Lista histórico de movimentações de estoque.
+
+    Só os meses recentes (?meses=N, padrão STOCK_MOVEMENT_HOT_MONTHS): com a
+    tabela particionada, o limite em created_at restringe a leitura às
+    partições quentes.
+    """
     from .models import StockMovement
-    
-    movements = StockMovement.objects.select_related('product', 'warehouse').order_by('-created_at')
+
+    try:
+        months = max(1, int(request.GET.get('meses', '')))
+    except ValueError:
+        months = settings.STOCK_MOVEMENT_HOT_MONTHS
+
+    movements = StockMovement.objects.select_related('product', 'warehouse').filter(
+        created_at__gte=MovementPartitionService.hot_since(months)
+    ).order_by('-created_at')
     
     # Filtros simples
     product_id = request.GET.get('product')
@@ -125,6 +176,115 @@ def stock_history(request):
         'movements': movements,
         'selected_product': product_id,
         'selected_type': movement_type,
+        'months': months,
     }
     
     return render(request, 'stock/stock_history.html', context)
+
+
+def replenishment_refresh(request):
+    """Agenda o recálculo do ponto de pedido no worker (HTMX)."""
+    if request.method != 'POST':
+        return HttpResponse(status=405)
+
+    job = JobService.enqueue('stock.refresh_replenishment', {'full': True})
+    return render(request, 'core/partials/job_status.html', {
+        'job': job,
+        'title': 'Recálculo do ponto de pedido',
+    })
+
+
+class _Echo:
+    """Pseudo-buffer para o csv.writer: devolve a linha em vez de guardá-la."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_response(filename, header, rows):
+    writer = csv.writer(_Echo())
+    lines = (writer.writerow(row) for row in [header, *rows])
+    response = StreamingHttpResponse(lines, content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _report_pending(request, period_start):
+    """
+    Relatório ainda não calculado: agenda o cálculo no worker e responde
+    202 com o progresso (HTMX consulta até terminar; Retry-After para os
+    demais clientes).
+    """
+    job = JobService.enqueue_once('stock.build_reports', {'periods': [f'{period_start:%Y-%m}']})
+    response = render(request, 'core/partials/job_status.html', {
+        'job': job,
+        'title': f'Relatórios de {period_start:%m/%Y}',
+    }, status=202)
+    response['Retry-After'] = '5'
+    return response
+
+
+def _stored_report(request, kind, key, period_start):
+    """
+    Linhas gravadas do relatório, ou a resposta 202 se ainda não existem.
+
+    Linhas vencidas (mês corrente) são servidas enquanto o recálculo roda.
+    """
+    rows, fresh = ReportService.stored(kind, key, period_start)
+    if rows is None:
+        return None, _report_pending(request, period_start)
+    if not fresh:
+        JobService.enqueue_once('stock.build_reports', {'periods': [f'{period_start:%Y-%m}']})
+    return rows, None
+
+
+@replica_view
+def valuation_report(request):
+    """
+    Valorização do estoque (quantidade x custo) em CSV, por depósito,
+    categoria ou marca; ?period=AAAA-MM lê o fechamento de um mês passado.
+    """
+    group_by = request.GET.get('group', 'warehouse')
+    if group_by not in ReportService.VALUATION_GROUPS:
+        return HttpResponseBadRequest(f"Agrupamento inválido: {group_by}")
+    try:
+        start, _ = ReportService.month_range(request.GET.get('period'))
+    except ValueError:
+        return HttpResponseBadRequest('Período inválido (use AAAA-MM)')
+
+    if ReportService.is_closed(start):
+        # O estoque de um mês fechado não é recalculável: só a foto gravada
+        rows, _ = ReportService.stored(ReportSnapshot.Kind.VALUATION, group_by, start)
+        if rows is None:
+            raise Http404(f'Sem valorização gravada para {start:%m/%Y}')
+    else:
+        rows, pending = _stored_report(request, ReportSnapshot.Kind.VALUATION, group_by, start)
+        if pending:
+            return pending
+
+    return _csv_response(
+        f'valorizacao_{group_by}_{start:%Y-%m}.csv',
+        ['grupo', 'unidades', 'valor', 'participacao'],
+        ([row['group'], row['units'], row['value'], row['share']] for row in rows),
+    )
+
+
+@replica_view
+def abc_report(request):
+    """Curva ABC por receita do mês (?period=AAAA-MM) em CSV."""
+    try:
+        start, end = ReportService.month_range(request.GET.get('period'))
+    except ValueError:
+        return HttpResponseBadRequest('Período inválido (use AAAA-MM)')
+
+    rows, pending = _stored_report(request, ReportSnapshot.Kind.ABC, '', start)
+    if pending:
+        return pending
+    return _csv_response(
+        f'curva_abc_{start:%Y-%m}.csv',
+        ['sku', 'produto', 'unidades', 'receita', 'acumulado', 'classe'],
+        (
+            [row['sku'], row['name'], row['units'], row['revenue'], row['cumulative_share'], row['abc_class']]
+            for row in rows
+        ),
+    )